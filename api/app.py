@@ -1,25 +1,52 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import StreamingResponse, FileResponse
+from fastapi.responses import StreamingResponse, FileResponse, Response
 from pydantic import BaseModel
 import json
 import os
 import time
+import sys
 import sqlite3
+import collections
+from email.utils import parsedate_to_datetime
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 # --- Configuration ---
 # Adjust paths relative to this file or use env vars
 BASE_DIR = Path(__file__).resolve().parent.parent # omnisky-miner root
-OMNISKY_DATA = BASE_DIR / "OMNISKY_DATA"
+sys.path.append(str(BASE_DIR)) # Shared stdlib-only helpers from modules/
+import config
+from modules import event_log, event_hub, async_db, evidence_paths, telemetry_rollup
+
+def _resolve(path):
+    """config paths are relative to the daemon's cwd (the repo root), not to ours."""
+    p = Path(path)
+    return p if p.is_absolute() else BASE_DIR / p
+
+OMNISKY_DATA = _resolve(config.OMNISKY_ROOT)
 OBS_DIR = OMNISKY_DATA / "OBS"
-DB_PATH = OMNISKY_DATA / "omniskyminer.db"
+DB_PATH = _resolve(config.DB_PATH) # Same file the daemon writes
 
 STATUS_FILE = OBS_DIR / "daemon_state.json"
+PIPELINE_STATUS_FILE = OBS_DIR / "status.json" # Written by the pipeline (Observability.update_status)
+METRICS_FILE = OBS_DIR / "metrics.prom" # Written by the daemon (modules/metrics.py)
 CONTROL_FILE = OBS_DIR / "control.json"
 EVENT_LOG_FILE = OBS_DIR / "event_log.jsonl"
+EVIDENCE_MAX_AGE_SEC = 300 # Browser reuse window; after that a conditional GET (304) revalidates
+
+# Read-only connections on dedicated threads; handlers await them instead of opening the DB per request
+db = async_db.ReadPool(DB_PATH)
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    db.close()
+
+app = FastAPI(title="OmniSky Command Center API", version="1.0", lifespan=lifespan)
 
-app = FastAPI(title="OmniSky Command Center API", version="1.0")
+# Live push channel: one log/status follower per API process, fanned out to all SSE clients
+hub = event_hub.EventHub(EVENT_LOG_FILE, {"daemon": STATUS_FILE, "pipeline": PIPELINE_STATUS_FILE})
 
 # --- Models ---
 class PauseRequest(BaseModel):
@@ -56,6 +83,7 @@ def get_status():
         "pause_reason": status.get("pause_reason"),
         "desired_state": control.get("desired_state", "RUNNING"),
         "metrics": status.get("metrics", {}),
+        "throttle": status.get("throttle"),
         "stall_seconds": round(stall_seconds, 1),
         "updated_at": status.get("updated_at")
     }
@@ -84,56 +112,189 @@ def resume_daemon():
     return {"status": "OK", "message": "Resume request sent"}
 
 # --- Data Endpoints ---
+def _encode_cursor(row):
+    return f"{row['timestamp']}|{row['type']}|{row['event_id']}"
+
+def _decode_cursor(cursor):
+    try:
+        ts, typ, eid = cursor.rsplit("|", 2)
+        return ts, typ, int(eid)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Malformed cursor")
+
 @app.get("/events")
-def get_events(
-    type: str = Query(None),
-    min_score: float = Query(0),
-    limit: int = Query(50),
-    offset: int = Query(0)
+async def get_events(
+    type: str = Query(None, description="RADIO or IMAGE"),
+    label: str = Query(None),
+    min_score: float = Query(None, description="On ml_score when set, else the detector score"),
+    limit: int = Query(50, ge=1, le=1000),
+    cursor: str = Query(None, description="next_cursor from the previous page")
 ):
-    """Query events from database."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    
-    # Union query for both radio and image
-    q = """
-        SELECT 'RADIO' as type, id, label, ml_score, ml_label, created_at FROM events_radio
-        UNION ALL
-        SELECT 'IMAGE' as type, id, label, ml_score, ml_label, created_at FROM events_image
-        ORDER BY created_at DESC
-        LIMIT ? OFFSET ?
     """
+    Newest events first from events_all (trigger-maintained, covering indexes).
+    Keyset pagination: each page seeks past the cursor, so page 1000 costs the same as page 1.
+    """
+    params = []
+    if type: params.append(type.upper())
+    if label: params.append(label)
+    if min_score is not None: params.append(min_score)
+    if cursor: params.extend(_decode_cursor(cursor))
+    params.append(limit)
+    q = async_db.events_query(bool(type), bool(label), min_score is not None, bool(cursor))
     try:
-        rows = conn.execute(q, (limit, offset)).fetchall()
-        return [dict(r) for r in rows]
-    except Exception as e:
-        return {"error": str(e)}
-    finally:
-        conn.close()
+        rows = await db.fetchall(q, params)
+    except sqlite3.Error as e:
+        raise HTTPException(status_code=503, detail=f"Events unavailable: {e}")
+    items = [{**r, "id": r["event_id"], "created_at": r["timestamp"]} for r in rows]
+    return {"items": items, "next_cursor": _encode_cursor(rows[-1]) if len(rows) == limit else None}
 
-@app.get("/logs/tail")
-def tail_logs(lines: int = Query(100)):
-    """Returns last N lines of event_log.jsonl."""
-    if not EVENT_LOG_FILE.exists():
-        return []
-    
-    with open(EVENT_LOG_FILE, 'r') as f:
-        all_lines = f.readlines()
-        
-    recent = all_lines[-lines:]
-    result = []
-    for line in recent:
+@app.get("/events/{type}/{event_id}")
+async def get_event(type: str, event_id: int):
+    """Full row of one event (all detector columns and evidence paths)."""
+    template = {"RADIO": "event_radio", "IMAGE": "event_image"}.get(type.upper())
+    if template is None:
+        raise HTTPException(status_code=400, detail="type must be RADIO or IMAGE")
+    row = await db.fetchone(template, (event_id,))
+    if row is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    return row
+
+# (kind, event_id) -> resolved file, so repeat views skip the DB row and the path probing
+_evidence_files = collections.OrderedDict()
+_evidence_resolver = evidence_paths.PathResolver([BASE_DIR, OMNISKY_DATA])
+
+async def _evidence_file(event_id, kind):
+    key = (kind, event_id)
+    path = _evidence_files.get(key)
+    if path is not None:
+        _evidence_files.move_to_end(key)
+        return path
+    table, column = evidence_paths.KINDS[kind]
+    row = await db.fetchone(async_db.evidence_query(table, column), (event_id,))
+    if row is None:
+        raise HTTPException(status_code=404, detail="Event not found")
+    path, exists, _ = _evidence_resolver.resolve(row[column], verify=False)
+    if not exists:
+        raise HTTPException(status_code=404, detail=f"No {kind} evidence for this event")
+    _evidence_files[key] = path
+    if len(_evidence_files) > evidence_paths.CACHE_ENTRIES:
+        _evidence_files.popitem(last=False)
+    return path
+
+def _not_modified(request, etag, mtime):
+    inm = request.headers.get("if-none-match")
+    if inm is not None:
+        return inm.strip() == "*" or etag in [t.strip().removeprefix("W/") for t in inm.split(",")]
+    ims = request.headers.get("if-modified-since")
+    if ims:
         try:
-            result.append(json.loads(line))
-        except:
-            pass
-    return result
+            return int(mtime) <= parsedate_to_datetime(ims).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+@app.api_route("/evidence/{event_id}/{kind}", methods=["GET", "HEAD"])
+async def get_evidence(event_id: int, kind: str, request: Request):
+    """
+    Evidence file for an event (waterfall, npz, audio, audio_clean, annotated, cutout).
+    Byte ranges (audio seeking), ETag/Last-Modified with 304 revalidation, and
+    http.response.pathsend (zero-copy) on servers that offer it.
+    """
+    if kind not in evidence_paths.KINDS:
+        raise HTTPException(status_code=404, detail=f"Unknown kind; one of {sorted(evidence_paths.KINDS)}")
+    path = await _evidence_file(event_id, kind)
+    try:
+        st = os.stat(path)
+    except OSError:
+        _evidence_files.pop((kind, event_id), None) # Moved/cleaned since we resolved it
+        _evidence_resolver.forget(path)
+        raise HTTPException(status_code=404, detail=f"No {kind} evidence for this event")
+
+    etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+    headers = {"etag": etag, "cache-control": f"private, max-age={EVIDENCE_MAX_AGE_SEC}"}
+    if _not_modified(request, etag, st.st_mtime):
+        return Response(status_code=304, headers=headers)
+    media_type = evidence_paths.MEDIA_TYPES.get(os.path.splitext(path)[1].lower())
+    return FileResponse(path, stat_result=st, media_type=media_type, headers=headers,
+                        filename=os.path.basename(path), content_disposition_type="inline")
+
+@app.get("/logs/tail")
+def tail_logs(lines: int = Query(100, ge=1, le=10000)):
+    """Returns last N lines of event_log.jsonl (reverse block read, independent of log size)."""
+    return event_log.tail(EVENT_LOG_FILE, lines)
+
+@app.get("/logs/range")
+def range_logs(
+    start: str = Query(None, description="ISO timestamp, inclusive"),
+    end: str = Query(None, description="ISO timestamp, inclusive"),
+    artifact_id: int = Query(None),
+    event: str = Query(None),
+    limit: int = Query(1000, ge=1, le=10000)
+):
+    """Events in a time window and/or for one artifact, seeking via the sparse sidecar index."""
+    if not (start or end or artifact_id is not None):
+        raise HTTPException(status_code=400, detail="Give start/end and/or artifact_id (use /logs/tail for recent events)")
+    return event_log.query(EVENT_LOG_FILE, start, end, artifact_id, limit, event)
+
+@app.get("/stream")
+async def stream(topics: str = Query(None, description="Comma list: status,event (default both)")):
+    """Server-Sent Events: 'status' on daemon/pipeline status changes, 'event' per new event_log entry."""
+    sub = hub.subscribe(topics.split(",") if topics else None)
+    return StreamingResponse(hub.stream(sub), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
 
 @app.get("/telemetry/latest")
 def get_telemetry():
     """Returns raw status.json snapshot."""
     return read_json(STATUS_FILE)
 
+@app.get("/telemetry/history")
+async def get_telemetry_history(
+    window: int = Query(3600, ge=1, le=365 * 86400, description="Seconds back from now"),
+    resolution: str = Query(None, description="1s, 1m or 1h (default: finest that fits the window)")
+):
+    """Throughput/queue history with min/avg/max/p95 per point, from the raw table or its rollups."""
+    res = resolution or telemetry_rollup.pick_resolution(window)
+    if res not in telemetry_rollup.RESOLUTIONS:
+        raise HTTPException(status_code=400, detail=f"resolution must be one of {list(telemetry_rollup.RESOLUTIONS)}")
+    start = telemetry_rollup.time_key(time.time() - window, res)
+    try:
+        points = await db.fetchall(telemetry_rollup.history_query(res), (start,))
+    except sqlite3.Error as e:
+        raise HTTPException(status_code=503, detail=f"Telemetry unavailable: {e}")
+    return {"resolution": res, "window": window, "points": points}
+
+@app.get("/telemetry/stages")
+def get_stage_latency():
+    """Per-stage latency (count, mean, p50/p95/p99 in ms) over the pipeline's rolling trace window."""
+    status = read_json(PIPELINE_STATUS_FILE)
+    return {"ts": status.get("ts"), "stages": status.get("stages", {})}
+
+@app.get("/telemetry/percentiles")
+def get_telemetry_percentiles():
+    """Throughput / queue depth / active workers: p50/p95/p99 over the last TELEMETRY_RING_SIZE samples and the session."""
+    tel = read_json(PIPELINE_STATUS_FILE).get("telemetry")
+    if not tel:
+        raise HTTPException(status_code=404, detail="No telemetry percentiles published yet")
+    return tel
+
+@app.get("/metrics")
+def get_metrics():
+    """Prometheus text exposition of the daemon's metrics registry."""
+    try:
+        body = METRICS_FILE.read_text()
+    except OSError:
+        raise HTTPException(status_code=503, detail="Daemon has not published metrics yet")
+    return Response(content=body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/disk")
+def get_disk():
+    """TEMP_CACHE usage, reservations and watermark state as last published by the pipeline."""
+    disk = read_json(PIPELINE_STATUS_FILE).get("disk")
+    if not disk:
+        raise HTTPException(status_code=404, detail="No disk budget published yet")
+    return disk
+
 # --- Static UI Serving (Optional) ---
 UI_DIST = BASE_DIR / "ui" / "dist"
 if UI_DIST.exists():
@@ -5,11 +5,29 @@ import os
 TEST_MODE = True
 
 # --- PIPELINE SETTINGS ---
-MAX_DOWNLOAD_WORKERS = 10 # Turbo Mode
+MAX_DOWNLOAD_WORKERS = 10 # Turbo Mode (upper bound when autoscaling)
 MAX_ANALYZE_WORKERS = 5
+MIN_DOWNLOAD_WORKERS = 2
+MIN_ANALYZE_WORKERS = 1
+AUTOSCALE_ENABLED = True
+AUTOSCALE_INTERVAL_SEC = 5
+AUTOSCALE_CPU_HIGH_PCT = 85 # Above this, analysis is CPU-bound: don't add analyzers
+AUTOSCALE_NET_HIGH_PCT = 90 # % of PLAN_MBPS considered a saturated link
 QUEUE_SIZE = 50          
 RETRY_ATTEMPTS = 1
 BACKOFF_FACTOR = 0.5     # Aggressive retries
+SCHED_AGING_SECONDS = 120 # Waiting jobs climb one priority class per interval
+TRIAGE_BATCH_SIZE = 256         # Persisted events are ML-triaged in batches of up to this many...
+TRIAGE_BATCH_MAX_WAIT_SEC = 2.0 # ...or once the oldest pending one has waited this long
+RESCORE_CHUNK_ROWS = 20000  # Offline re-scoring (scripts/rescore_events.py): rows per chunk / commit
+RESCORE_WORKERS = 0         # Prediction processes; 0 = one per CPU
+RESCORE_PROGRESS_SEC = 10   # RESCORE_PROGRESS event-log interval
+RESCORE_CACHE_MB = 256      # SQLite page cache for the job (the writes are index-bound)
+MAX_RESIDENT_ARTIFACTS = 20 # Raw files allowed in TEMP_CACHE at once (downloaded, not yet cleaned)
+TEMP_CACHE_BUDGET_MB = 20 * 1024 # Expected bytes admitted into TEMP_CACHE
+MIN_FREE_DISK_MB = 2048 # Never start a download below this much free space
+DISK_HIGH_WATERMARK_PCT = 90 # Of TEMP_CACHE_BUDGET_MB: pause downloads above this...
+DISK_LOW_WATERMARK_PCT = 70  # ...and resume once usage falls below this
 
 # --- FUENTES DE DATOS REALES (Hardcoded) ---
 RADIO_SOURCES = [
@@ -53,6 +71,15 @@ DIR_VISUAL = os.path.join(OMNISKY_ROOT, "HALLAZGOS", "5_IMAGENES_VISUALES")
 # Alias legacy
 DIR_OUTPUT = DIR_CANDIDATES
 
+# Triage model training (modules/training.py, scripts/train_model.py)
+FEATURE_SNAPSHOT_DIR = os.path.join(OMNISKY_ROOT, "models", "features") # Incremental npz training set
+FEATURE_SNAPSHOT_MAX_PARTS = 32  # Merge the snapshot's parts beyond this many
+TRAIN_TREES = 100
+TRAIN_N_JOBS = -1                # Fit in parallel on every core
+TRAIN_MAX_ROWS = 2_000_000       # Random subsample above this
+TRAIN_HOLDOUT = 0.1              # Random fraction of rows kept out of the fit for accuracy
+TRIAGE_RELOAD_CHECK_SEC = 30     # Running engines look for a newly activated model this often
+
 # Base de Datos
 DB_PATH = "omnisky.db"
 
@@ -66,9 +93,37 @@ MAX_DOWNLOAD_MBPS = None # Unlimited
 DOWNLOAD_CHUNK_SIZE = 1024 * 256 # 256KB
 PLAN_MBPS = 800.0 # Tu plan de fibra
 TELEMETRY_INTERVAL_SEC = 1
+TELEMETRY_FLUSH_SEC = 5       # Raw samples are buffered and batch-inserted this often
+TELEMETRY_MAX_POINTS = 1500   # Charts pick the finest resolution (1s/1m/1h) within this many rows
+TELEMETRY_RETENTION_HOURS = {"1s": 6, "1m": 24 * 7, "1h": 24 * 365} # Per resolution
+TELEMETRY_RING_SIZE = 3600    # In-memory samples per metric (window percentiles, no DB)
+TELEMETRY_SKETCH_ACCURACY = 0.01 # Relative error of the session-long quantile sketches
+TRACE_LOG_SPANS = True # Write every stage span to event_log.jsonl as a SPAN event
+TRACE_WINDOW_SECONDS = 900 # Rolling window for per-stage p50/p95/p99
+TRACE_WINDOW_SIZE = 2000   # Max samples kept per stage inside the window
+METRICS_FILE = os.path.join(OMNISKY_ROOT, "OBS", "metrics.prom") # Prometheus textfile, served by the API on /metrics
+OBS_FLUSH_INTERVAL_SEC = 0.25 # Event log writer batches for at most this long...
+OBS_BATCH_SIZE = 500          # ...or until this many events are queued
+OBS_QUEUE_MAX = 100_000       # Queued events beyond this drop the oldest (never block producers)
+OBS_STATUS_MIN_INTERVAL_SEC = 1.0 # status.json rewritten at most this often
+OBS_LOG_MAX_MB = 64           # Rotate event_log.jsonl past this size...
+OBS_LOG_MAX_AGE_HOURS = 24    # ...or age, gzip the old file
+OBS_LOG_KEEP = 14             # Compressed archives kept
 
 # --- SOURCE PLUGINS ---
-ENABLED_SOURCES = ["vlass_quicklook", "breakthrough_listen"]
+ENABLED_SOURCES = ["vlass_tiles", "breakthrough_listen", "directory_index"]
+DISCOVERY_MAX_NEW_PER_PLUGIN = 200 # Per discovery cycle; plugins may stream far more
+
+# Directory Index crawler (walks RADIO_SOURCES "Index of" pages)
+DIR_INDEX_MAX_DEPTH = 3
+DIR_INDEX_EXTENSIONS = (".h5", ".fil", ".fits")
+DIR_INDEX_CHUNK_SIZE = 64 * 1024
+
+# VLASS Quick Look tile grid (epoch/tile/subtile) + HEALPix coverage
+VLASS_QL_ROOT = "https://archive-new.nrao.edu/vlass/quicklook/"
+VLASS_EPOCHS = ["VLASS1.1", "VLASS1.2", "VLASS2.1", "VLASS2.2", "VLASS3.1", "VLASS3.2"]
+VLASS_IMAGE_SUFFIX = ".I.iter1.image.pbcor.tt0.subim.fits"
+COVERAGE_NSIDE = 128 # ~0.46 deg pixels, finer than a 1 deg subtile; 24 KB bitmap per epoch
 
 # --- DAEMON / BACKGROUND MODE ---
 DAEMON_ENABLED = True
@@ -77,11 +132,18 @@ HEAVY_PROCESS_NAMES = [
     "blender.exe", "premiere.exe", "afterfx.exe", "davinciresolve.exe",
     "Valorant.exe", "LeagueofLegends.exe", "VALORANT-Win64-Shipping.exe"
 ]
-PAUSE_CPU_PCT = 70
-PAUSE_RAM_PCT = 85
+PAUSE_CPU_PCT = 70 # Host CPU budget: above it the throttle sheds background load (no longer a pause)
+PAUSE_RAM_PCT = 85 # Host RAM budget, same
 PAUSE_GPU_PCT = 60 # Requires nvidia-smi
 PAUSE_GRACE_SECONDS = 10
 RESUME_COOLDOWN_SECONDS = 30
+THROTTLE_GAIN = 0.01      # Level change per tick per point of CPU/RAM headroom (+) or excess (-)
+THROTTLE_MIN_LEVEL = 0.1  # Floor: only HEAVY_PROCESS_NAMES stop the pipeline entirely
+THROTTLE_NICE_MAX = 10    # POSIX nice at the lowest level
 FINISH_CURRENT_JOB_ON_PAUSE = True
+SHUTDOWN_DRAIN_SECONDS = 60 # In-flight jobs get this long to finish on SIGTERM...
+SHUTDOWN_GRACE_SECONDS = 10 # ...then downloads are cancelled and the rest checkpointed
+PIPELINE_CHECKPOINT_FILE = os.path.join(OMNISKY_ROOT, "OBS", "pipeline_checkpoint.json")
 CHECK_INTERVAL_SECONDS = 3
+HOST_SAMPLE_SEC = 1.0 # Background CPU/RAM/process sampler (DaemonControl, autoscaler)
 DAEMON_STATE_FILE = os.path.join(OMNISKY_ROOT, "OBS", "daemon_state.json")
@@ -4,11 +4,13 @@ import numpy as np
 import plotly.express as px
 import time
 import os
+import threading
 import config
 
 # Import Adapters
 from modules.ui_data import UIDataLoader
 from modules.gamification import GamificationManager
+from modules.summaries import DashboardSummary
 
 # --- PAGE CONFIG ---
 st.set_page_config(
@@ -19,9 +21,23 @@ st.set_page_config(
 )
 
 # --- CACHING & DATA ---
-@st.cache_data(ttl=15) # Refresh every 15s automatically
+EVENTS_REFRESH_SEC = 15 # Poll for new events this often
+
+@st.cache_resource
+def _event_frame():
+    """Process-wide event frame; reruns only fetch rows newer than it holds."""
+    return {"df": None, "at": 0.0, "lock": threading.Lock()}
+
 def load_data(limit=1000):
-    return UIDataLoader.fetch_all_events(limit)
+    cache = _event_frame()
+    with cache["lock"]:
+        if cache["df"] is None:
+            cache["df"] = UIDataLoader.fetch_all_events(limit)
+            cache["at"] = time.time()
+        elif time.time() - cache["at"] >= EVENTS_REFRESH_SEC:
+            cache["df"] = UIDataLoader.refresh_events(cache["df"], limit)
+            cache["at"] = time.time()
+        return cache["df"]
 
 def clear_cache():
     st.cache_data.clear()
@@ -269,8 +285,30 @@ def render_detail_panel(row):
             st.caption("No files associated with this event.")
 
 
+@st.cache_data(ttl=15)
+def load_summary():
+    """All-time aggregates from the trigger-maintained summary tables (cheap at any event count)."""
+    return {
+        "totals": DashboardSummary.totals(),
+        "labels": DashboardSummary.label_counts(),
+        "hourly": DashboardSummary.hourly(48),
+        "scores": DashboardSummary.score_histogram(),
+        "sources": DashboardSummary.sources(),
+    }
+
 def tab_overview(df):
     st.header("📊 Mission Status")
+
+    summary = load_summary()
+    totals = summary["totals"]
+    k1, k2, k3, k4 = st.columns(4)
+    k1.metric("Radio Events", totals.get('RADIO', 0))
+    k2.metric("Image Events", totals.get('IMAGE', 0))
+    k3.metric("Artifacts", totals.get('artifacts', 0))
+    k4.metric("Failed Artifacts", totals.get('failed', 0))
+    if not summary["hourly"].empty:
+        st.plotly_chart(px.bar(summary["hourly"], x='hour', y='n', color='type', title="Events per Hour (last 48h with activity)"),
+                        use_container_width=True)
     
     # Live Feed
     st.subheader("� Live Signals Feed")
@@ -381,6 +419,24 @@ def load_telemetry(limit=60):
         conn.close()
         return pd.DataFrame()
 
+TELEMETRY_WINDOWS = {"Last 60s": 60, "Last 15 min": 900, "Last hour": 3600, "Last 24h": 86400, "Last 7 days": 7 * 86400}
+
+@st.cache_data(ttl=5)
+def load_telemetry_history(window_sec):
+    """History at the resolution matching the window (1s raw, 1m or 1h rollups)."""
+    from modules import telemetry_rollup
+    res = telemetry_rollup.pick_resolution(window_sec)
+    start = telemetry_rollup.time_key(time.time() - window_sec, res)
+    conn = UIDataLoader.get_connection()
+    try:
+        df = pd.read_sql_query(telemetry_rollup.history_query(res), conn, params=(start,))
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        return res, df
+    except Exception:
+        return res, pd.DataFrame()
+    finally:
+        conn.close()
+
 def tab_network(df):
     st.header("📡 Network & Pipeline Live Telemetry")
     
@@ -399,10 +455,15 @@ def tab_network(df):
     c4.metric("Bandwidth Usage", f"{latest['plan_usage_pct']:.1f}%", help=f"Of {config.PLAN_MBPS} Mbps Plan")
     
     # Charts
-    st.subheader("Traffic Analysis (Last 60s)")
-    chart_data = tel_df.sort_values('timestamp')
-    fig = px.line(chart_data, x='timestamp', y=['mbps_down', 'mbps_up'], 
-                  labels={'value': 'Mbps', 'variable': 'Direction'}, 
+    window_label = st.selectbox("Window", list(TELEMETRY_WINDOWS), index=0)
+    res, chart_data = load_telemetry_history(TELEMETRY_WINDOWS[window_label])
+    st.subheader(f"Traffic Analysis ({window_label}, {res} resolution)")
+    if chart_data.empty:
+        st.info("No telemetry in this window yet.")
+        return
+    y = ['mbps_down', 'mbps_up'] if res == "1s" else ['mbps_down', 'mbps_down_p95', 'mbps_down_max', 'mbps_up']
+    fig = px.line(chart_data, x='timestamp', y=y,
+                  labels={'value': 'Mbps', 'variable': 'Series'},
                   title="Network Throughput")
     st.plotly_chart(fig, use_container_width=True)
     
@@ -468,11 +529,21 @@ def tab_intelligence(df):
         st.subheader("🤖 Triage Engine")
         from modules.triage import TriageEngine
         engine = TriageEngine()
-        st.metric("Model Status", "Active" if engine.is_ready else "Heuristic Fallback")
-        if st.button("Re-Train Model (Dummy)"):
+        st.metric("Model Status", f"Active ({engine.version})" if engine.is_ready else "Heuristic Fallback")
+        if st.button("Re-Train Model"):
+            from modules.training import ModelTrainer
             try:
-                msg = engine.train_dummy()
-                st.success(msg)
+                with st.spinner("Training on labelled events..."):
+                    run = ModelTrainer().train()
+                acc = run['holdout_accuracy'] # None when too few rows for a holdout
+                st.success(f"Model {run['version']} active: {run['rows']} rows, "
+                           f"holdout accuracy {'n/a' if acc is None else f'{acc:.3f}'}")
+            except ValueError:
+                if engine.is_ready:
+                    st.warning(f"Not enough labelled events yet: keeping model {engine.version}.")
+                else:
+                    st.warning("Not enough labelled events yet: activated the bootstrap model instead.")
+                    st.success(f"Bootstrap model {ModelTrainer().bootstrap()} active")
             except Exception as e:
                 st.error(str(e))
                 
@@ -506,16 +577,33 @@ def tab_missions(df):
     st.info("Complete objectives to earn XP and Badges (Gamification Engine Active)")
     # Stub visualization of 'missions' table
     # In real impl, fetch from DB
+    totals = load_summary()["totals"]
+    radio, image = totals.get('RADIO', 0), totals.get('IMAGE', 0)
     c1, c2, c3 = st.columns(3)
-    c1.metric("Mission: Radio Novice", "3/10", "In Progress")
-    c2.metric("Mission: Deep Field", "0/1", "Pending")
+    c1.metric("Mission: Radio Novice", f"{min(radio, 10)}/10", "Complete" if radio >= 10 else "In Progress")
+    c2.metric("Mission: Deep Field", f"{min(image, 1)}/1", "Complete" if image >= 1 else "Pending")
     c3.metric("XP Level", "5 (Novice)")
 
 def tab_quality(df):
     st.header("⚠️ Data Quality & Flags")
-    # Stub
-    st.metric("Corrupt Files", "0")
-    st.metric("Missing Metadata", "2")
+    summary = load_summary()
+    st.metric("Failed Artifacts", summary["totals"].get('failed', 0))
+
+    st.subheader("Per-Source Totals")
+    sources = summary["sources"]
+    if sources.empty:
+        st.caption("No artifacts recorded yet.")
+    else:
+        sources = sources.assign(mb=(sources['bytes'] / 1024 / 1024).round(1)).drop(columns=['bytes'])
+        st.dataframe(sources, hide_index=True, use_container_width=True)
+
+    c1, c2 = st.columns(2)
+    if not summary["labels"].empty:
+        c1.plotly_chart(px.bar(summary["labels"], x='label', y='n', color='type', title="Label Distribution"),
+                        use_container_width=True)
+    if not summary["scores"].empty:
+        c2.plotly_chart(px.bar(summary["scores"], x='bucket', y='n', title="Score Histogram"),
+                        use_container_width=True)
 
 def tab_clusters(df):
     st.header("🧩 Spatial Clustering")
@@ -545,6 +633,17 @@ def tab_ops(df):
     if st.button("Export All (CSV)"):
         pass
 
+def render_coverage():
+    """Survey coverage from the stored HEALPix counters (one row per epoch)."""
+    from modules.sky_coverage import SkyCoverage
+    rows = SkyCoverage("VLASS").summary()
+    if not rows:
+        st.caption("No VLASS sky coverage recorded yet.")
+        return
+    cols = st.columns(len(rows))
+    for col, r in zip(cols, rows):
+        col.metric(r['epoch'], f"{r['sky_fraction'] * 100:.3f}% sky", f"{r['pixels']} px")
+
 # ... (Main update is needed to include these new functions)
 
 # ... (Main Update) ...
@@ -566,6 +665,7 @@ def main():
         with t3: tab_audio(df)
         with t4: 
              st.header("🌌 Galactic Viz")
+             render_coverage()
              st.plotly_chart(px.scatter_3d(df.head(50), x='data_value', y='data_value', z='data_value'), use_container_width=True)
         with t5: tab_network(df)
         with t6: tab_live_ops()
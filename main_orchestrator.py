@@ -35,14 +35,10 @@ def main():
             logging.info("📡 Scanning for new targets...")
             new_targets = discovery.find_new_targets()
             
-            # 2. Add to Pipeline
+            # 2. Add to Pipeline (Targets carry kind, size and priority hints)
             count = 0
-            for url in new_targets:
-                 # Infer type from extension or discovery source?
-                 # For simplicity, assume .fits = IMAGE, else RADIO
-                 job_type = "IMAGE" if ".fits" in url.lower() else "RADIO"
-                 
-                 if pipeline.submit_job(url, job_type):
+            for target in new_targets:
+                 if pipeline.submit_task(target):
                      count += 1
             
             logging.info(f"Orchestrator fed {count} jobs to pipeline.")
@@ -0,0 +1,25 @@
+-- Migration 006: Sky Coverage Tracking
+-- HEALPix bitmap per survey epoch + tile progress for coverage-driven scheduling
+
+-- 1. Coverage bitmap: one bit per HEALPix (RING) pixel, count kept for O(1) summaries
+CREATE TABLE IF NOT EXISTS sky_coverage (
+    survey TEXT,
+    epoch TEXT,
+    nside INTEGER,
+    bitmap BLOB,
+    n_covered INTEGER DEFAULT 0,
+    updated_at TEXT,
+    PRIMARY KEY (survey, epoch)
+);
+
+-- 2. Survey tiles: listing/harvest progress per tile (e.g. VLASS1.2 / T01t01)
+CREATE TABLE IF NOT EXISTS survey_tiles (
+    survey TEXT,
+    epoch TEXT,
+    tile TEXT,
+    n_seen INTEGER DEFAULT 0,      -- Subtiles found in the last listing
+    n_harvested INTEGER DEFAULT 0, -- Subtiles persisted by the pipeline
+    last_listed_at TEXT,
+    last_harvested_at TEXT,
+    PRIMARY KEY (survey, epoch, tile)
+);
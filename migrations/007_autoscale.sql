@@ -0,0 +1,19 @@
+-- Migration 007: Worker Pool Autoscaling Audit
+CREATE TABLE IF NOT EXISTS autoscale_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT,
+    pool TEXT,        -- DL, AN
+    old_size INTEGER,
+    new_size INTEGER,
+    reason TEXT,      -- ANALYZE_BACKLOG, CPU_BOUND, DOWNLOAD_BACKLOG, LINK_SATURATED, *_IDLE
+
+    -- Inputs at decision time
+    q_download_size INTEGER,
+    q_analyze_size INTEGER,
+    cpu_pct REAL,
+    mbps_down REAL,
+    dl_latency_s REAL,
+    an_latency_s REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_autoscale_ts ON autoscale_events(timestamp);
@@ -0,0 +1,52 @@
+-- Migration 008: Unified events table for the API / dashboards
+-- One narrow row per radio/image event, kept in sync by triggers, so listing
+-- "all events newest first" is a single index walk instead of UNION + sort.
+CREATE TABLE IF NOT EXISTS events_all (
+    type TEXT NOT NULL,       -- RADIO, IMAGE
+    event_id INTEGER NOT NULL, -- events_radio.id / events_image.id
+    artifact_id INTEGER,
+    timestamp TEXT,
+    label TEXT,
+    score REAL,
+    ml_score REAL,
+    ml_label TEXT,
+    PRIMARY KEY (type, event_id)
+) WITHOUT ROWID;
+
+-- Backfill
+INSERT OR REPLACE INTO events_all (type, event_id, artifact_id, timestamp, label, score, ml_score, ml_label)
+    SELECT 'RADIO', id, artifact_id, timestamp, label, score, ml_score, ml_label FROM events_radio;
+INSERT OR REPLACE INTO events_all (type, event_id, artifact_id, timestamp, label, score, ml_score, ml_label)
+    SELECT 'IMAGE', id, artifact_id, timestamp, label, score, ml_score, ml_label FROM events_image;
+
+-- Sync triggers
+CREATE TRIGGER IF NOT EXISTS trg_events_radio_ins AFTER INSERT ON events_radio BEGIN
+    INSERT OR REPLACE INTO events_all (type, event_id, artifact_id, timestamp, label, score, ml_score, ml_label)
+    VALUES ('RADIO', NEW.id, NEW.artifact_id, NEW.timestamp, NEW.label, NEW.score, NEW.ml_score, NEW.ml_label);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_events_radio_upd AFTER UPDATE ON events_radio BEGIN
+    DELETE FROM events_all WHERE type = 'RADIO' AND event_id = OLD.id;
+    INSERT INTO events_all (type, event_id, artifact_id, timestamp, label, score, ml_score, ml_label)
+    VALUES ('RADIO', NEW.id, NEW.artifact_id, NEW.timestamp, NEW.label, NEW.score, NEW.ml_score, NEW.ml_label);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_events_radio_del AFTER DELETE ON events_radio BEGIN
+    DELETE FROM events_all WHERE type = 'RADIO' AND event_id = OLD.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_events_image_ins AFTER INSERT ON events_image BEGIN
+    INSERT OR REPLACE INTO events_all (type, event_id, artifact_id, timestamp, label, score, ml_score, ml_label)
+    VALUES ('IMAGE', NEW.id, NEW.artifact_id, NEW.timestamp, NEW.label, NEW.score, NEW.ml_score, NEW.ml_label);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_events_image_upd AFTER UPDATE ON events_image BEGIN
+    DELETE FROM events_all WHERE type = 'IMAGE' AND event_id = OLD.id;
+    INSERT INTO events_all (type, event_id, artifact_id, timestamp, label, score, ml_score, ml_label)
+    VALUES ('IMAGE', NEW.id, NEW.artifact_id, NEW.timestamp, NEW.label, NEW.score, NEW.ml_score, NEW.ml_label);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_events_image_del AFTER DELETE ON events_image BEGIN
+    DELETE FROM events_all WHERE type = 'IMAGE' AND event_id = OLD.id;
+END;
+
+-- Covering indexes for keyset pagination (ORDER BY timestamp DESC, type DESC, event_id DESC)
+CREATE INDEX IF NOT EXISTS idx_evall_ts ON events_all(timestamp, type, event_id, label, score, ml_score, ml_label, artifact_id);
+CREATE INDEX IF NOT EXISTS idx_evall_type_ts ON events_all(type, timestamp, event_id, label, score, ml_score, ml_label, artifact_id);
+CREATE INDEX IF NOT EXISTS idx_evall_label_ts ON events_all(label, timestamp, type, event_id, score, ml_score, ml_label, artifact_id);
@@ -0,0 +1,132 @@
+-- Migration 009: Dashboard summary tables, maintained by triggers
+-- The dashboard reads these aggregates instead of recounting raw events on every
+-- rerun. events_all (008) already mirrors both event tables, so its insert/delete
+-- triggers cover every event write (an event UPDATE is a delete + insert there).
+-- scripts/rebuild_summaries.py recomputes everything from the raw tables (--check to diff).
+
+-- Host part of source_url ("archive.org" for "https://archive.org/x/y.h5")
+ALTER TABLE artifacts ADD COLUMN source_host TEXT GENERATED ALWAYS AS (
+    CASE WHEN instr(source_url, '://') > 0
+         THEN substr(substr(source_url, instr(source_url, '://') + 3), 1,
+                     instr(substr(source_url, instr(source_url, '://') + 3) || '/', '/') - 1)
+         ELSE COALESCE(NULLIF(source_url, ''), '(none)') END
+) VIRTUAL;
+
+-- Counts per type/label/hour
+CREATE TABLE IF NOT EXISTS summary_events (
+    type TEXT NOT NULL,
+    label TEXT NOT NULL,  -- 'UNKNOWN' when NULL
+    hour TEXT NOT NULL,   -- 'YYYY-MM-DDTHH'
+    n INTEGER NOT NULL DEFAULT 0,
+    score_sum REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (type, label, hour)
+) WITHOUT ROWID;
+
+-- Score histogram, 1-unit buckets (score truncated to an integer)
+CREATE TABLE IF NOT EXISTS summary_score_hist (
+    type TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    n INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (type, bucket)
+) WITHOUT ROWID;
+
+-- RFI density per 1 MHz (Intel tab heatmap)
+CREATE TABLE IF NOT EXISTS summary_rfi_freq (
+    freq_bin INTEGER PRIMARY KEY,
+    n INTEGER NOT NULL DEFAULT 0
+);
+
+-- Per-source totals
+CREATE TABLE IF NOT EXISTS summary_sources (
+    source TEXT PRIMARY KEY,
+    artifacts INTEGER NOT NULL DEFAULT 0,
+    bytes INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0,
+    events INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+-- Per-artifact event lookups (source totals, API events_by_artifact)
+CREATE INDEX IF NOT EXISTS idx_evall_artifact ON events_all(artifact_id);
+
+-- Backfill (same statements as modules/summaries.py REBUILD_SQL)
+INSERT INTO summary_events (type, label, hour, n, score_sum)
+    SELECT type, COALESCE(label, 'UNKNOWN'), substr(timestamp, 1, 13), COUNT(*), COALESCE(SUM(score), 0)
+    FROM events_all GROUP BY 1, 2, 3;
+INSERT INTO summary_score_hist (type, bucket, n)
+    SELECT type, CAST(score AS INTEGER), COUNT(*) FROM events_all WHERE score IS NOT NULL GROUP BY 1, 2;
+INSERT INTO summary_rfi_freq (freq_bin, n)
+    SELECT CAST(round(fch1) AS INTEGER), COUNT(*) FROM events_radio
+    WHERE fch1 IS NOT NULL AND label IN ('RFI', 'INTERFERENCIA_TERRESTRE', 'NOISE') GROUP BY 1;
+INSERT INTO summary_sources (source, artifacts, bytes, failed, events)
+    SELECT a.source_host, COUNT(*), COALESCE(SUM(a.size_bytes), 0), SUM(a.status IS 'FAILED'), COALESCE(SUM(e.n), 0)
+    FROM artifacts a LEFT JOIN (SELECT artifact_id, COUNT(*) AS n FROM events_all GROUP BY artifact_id) e
+         ON e.artifact_id = a.id
+    GROUP BY 1;
+
+-- Events
+CREATE TRIGGER IF NOT EXISTS trg_summary_events_ins AFTER INSERT ON events_all BEGIN
+    INSERT INTO summary_events (type, label, hour, n, score_sum)
+    VALUES (NEW.type, COALESCE(NEW.label, 'UNKNOWN'), substr(NEW.timestamp, 1, 13), 1, COALESCE(NEW.score, 0))
+    ON CONFLICT (type, label, hour) DO UPDATE SET n = n + 1, score_sum = score_sum + excluded.score_sum;
+    INSERT INTO summary_score_hist (type, bucket, n)
+    SELECT NEW.type, CAST(NEW.score AS INTEGER), 1 WHERE NEW.score IS NOT NULL
+    ON CONFLICT (type, bucket) DO UPDATE SET n = n + 1;
+    UPDATE summary_sources SET events = events + 1
+    WHERE source = (SELECT source_host FROM artifacts WHERE id = NEW.artifact_id);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_summary_events_del AFTER DELETE ON events_all BEGIN
+    UPDATE summary_events SET n = n - 1, score_sum = score_sum - COALESCE(OLD.score, 0)
+    WHERE type = OLD.type AND label = COALESCE(OLD.label, 'UNKNOWN') AND hour = substr(OLD.timestamp, 1, 13);
+    UPDATE summary_score_hist SET n = n - 1
+    WHERE OLD.score IS NOT NULL AND type = OLD.type AND bucket = CAST(OLD.score AS INTEGER);
+    UPDATE summary_sources SET events = events - 1
+    WHERE source = (SELECT source_host FROM artifacts WHERE id = OLD.artifact_id);
+END;
+
+-- RFI frequencies (needs fch1, which only events_radio has)
+CREATE TRIGGER IF NOT EXISTS trg_summary_rfi_ins AFTER INSERT ON events_radio
+WHEN NEW.fch1 IS NOT NULL AND NEW.label IN ('RFI', 'INTERFERENCIA_TERRESTRE', 'NOISE') BEGIN
+    INSERT INTO summary_rfi_freq (freq_bin, n) VALUES (CAST(round(NEW.fch1) AS INTEGER), 1)
+    ON CONFLICT (freq_bin) DO UPDATE SET n = n + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_summary_rfi_del AFTER DELETE ON events_radio
+WHEN OLD.fch1 IS NOT NULL AND OLD.label IN ('RFI', 'INTERFERENCIA_TERRESTRE', 'NOISE') BEGIN
+    UPDATE summary_rfi_freq SET n = n - 1 WHERE freq_bin = CAST(round(OLD.fch1) AS INTEGER);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_summary_rfi_upd AFTER UPDATE OF fch1, label ON events_radio BEGIN
+    UPDATE summary_rfi_freq SET n = n - 1
+    WHERE OLD.fch1 IS NOT NULL AND OLD.label IN ('RFI', 'INTERFERENCIA_TERRESTRE', 'NOISE')
+      AND freq_bin = CAST(round(OLD.fch1) AS INTEGER);
+    INSERT INTO summary_rfi_freq (freq_bin, n)
+    SELECT CAST(round(NEW.fch1) AS INTEGER), 1
+    WHERE NEW.fch1 IS NOT NULL AND NEW.label IN ('RFI', 'INTERFERENCIA_TERRESTRE', 'NOISE')
+    ON CONFLICT (freq_bin) DO UPDATE SET n = n + 1;
+END;
+
+-- Sources
+CREATE TRIGGER IF NOT EXISTS trg_summary_sources_ins AFTER INSERT ON artifacts BEGIN
+    INSERT INTO summary_sources (source, artifacts, bytes, failed)
+    VALUES (NEW.source_host, 1, COALESCE(NEW.size_bytes, 0), NEW.status IS 'FAILED')
+    ON CONFLICT (source) DO UPDATE SET artifacts = artifacts + 1, bytes = bytes + excluded.bytes,
+                                       failed = failed + excluded.failed;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_summary_sources_upd AFTER UPDATE OF size_bytes, status, source_url ON artifacts
+WHEN OLD.size_bytes IS NOT NEW.size_bytes OR OLD.source_url IS NOT NEW.source_url
+     OR (OLD.status IS 'FAILED') IS NOT (NEW.status IS 'FAILED') BEGIN
+    -- Move the artifact's contribution from its old row to its new one (same row unless the URL changed)
+    UPDATE summary_sources SET artifacts = artifacts - 1, bytes = bytes - COALESCE(OLD.size_bytes, 0),
+                               failed = failed - (OLD.status IS 'FAILED'),
+                               events = events - (SELECT COUNT(*) FROM events_all WHERE artifact_id = OLD.id)
+    WHERE source = OLD.source_host;
+    INSERT INTO summary_sources (source, artifacts, bytes, failed, events)
+    VALUES (NEW.source_host, 1, COALESCE(NEW.size_bytes, 0), NEW.status IS 'FAILED',
+            (SELECT COUNT(*) FROM events_all WHERE artifact_id = NEW.id))
+    ON CONFLICT (source) DO UPDATE SET artifacts = artifacts + 1, bytes = bytes + excluded.bytes,
+                                       failed = failed + excluded.failed, events = events + excluded.events;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_summary_sources_del AFTER DELETE ON artifacts BEGIN
+    UPDATE summary_sources SET artifacts = artifacts - 1, bytes = bytes - COALESCE(OLD.size_bytes, 0),
+                               failed = failed - (OLD.status IS 'FAILED'),
+                               events = events - (SELECT COUNT(*) FROM events_all WHERE artifact_id = OLD.id)
+    WHERE source = OLD.source_host;
+END;
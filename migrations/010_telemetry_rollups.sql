@@ -0,0 +1,25 @@
+-- Migration 010: Telemetry rollups
+-- `telemetry` stays the 1s raw table; these hold min/avg/max/p95 per minute / hour,
+-- written by TelemetryMonitor when a bucket closes (modules/telemetry_rollup.py).
+-- Retention per resolution: config.TELEMETRY_RETENTION_HOURS.
+CREATE TABLE IF NOT EXISTS telemetry_1m (
+    bucket TEXT PRIMARY KEY, -- 'YYYY-MM-DDTHH:MM' (local time, like telemetry.timestamp)
+    n INTEGER, -- 1s samples in the bucket
+    mbps_down_min REAL, mbps_down_avg REAL, mbps_down_max REAL, mbps_down_p95 REAL,
+    mbps_up_min REAL, mbps_up_avg REAL, mbps_up_max REAL, mbps_up_p95 REAL,
+    plan_pct_min REAL, plan_pct_avg REAL, plan_pct_max REAL, plan_pct_p95 REAL,
+    q_download_min REAL, q_download_avg REAL, q_download_max REAL, q_download_p95 REAL,
+    q_analyze_min REAL, q_analyze_avg REAL, q_analyze_max REAL, q_analyze_p95 REAL,
+    q_persist_min REAL, q_persist_avg REAL, q_persist_max REAL, q_persist_p95 REAL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS telemetry_1h (
+    bucket TEXT PRIMARY KEY, -- 'YYYY-MM-DDTHH'
+    n INTEGER, -- 1s samples in the bucket
+    mbps_down_min REAL, mbps_down_avg REAL, mbps_down_max REAL, mbps_down_p95 REAL,
+    mbps_up_min REAL, mbps_up_avg REAL, mbps_up_max REAL, mbps_up_p95 REAL,
+    plan_pct_min REAL, plan_pct_avg REAL, plan_pct_max REAL, plan_pct_p95 REAL,
+    q_download_min REAL, q_download_avg REAL, q_download_max REAL, q_download_p95 REAL,
+    q_analyze_min REAL, q_analyze_avg REAL, q_analyze_max REAL, q_analyze_p95 REAL,
+    q_persist_min REAL, q_persist_avg REAL, q_persist_max REAL, q_persist_p95 REAL
+) WITHOUT ROWID;
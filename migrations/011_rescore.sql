@@ -0,0 +1,47 @@
+-- Migration 011: Offline re-scoring (modules/rescore.py, scripts/rescore_events.py)
+
+-- Resume point per model version and event table: the job commits each chunk's
+-- ml_score/ml_label UPDATE together with its row here.
+CREATE TABLE IF NOT EXISTS rescore_progress (
+    model_version TEXT NOT NULL REFERENCES model_runs(version),
+    table_name TEXT NOT NULL,   -- events_radio | events_image
+    last_id INTEGER NOT NULL DEFAULT 0,
+    n_done INTEGER NOT NULL DEFAULT 0,
+    n_total INTEGER,
+    updated_at TEXT,
+    finished_at TEXT,
+    PRIMARY KEY (model_version, table_name)
+) WITHOUT ROWID;
+
+-- The 008 sync triggers turn every event UPDATE into a delete + insert on events_all
+-- (and through it the 009 summary triggers). A change to ml_score/ml_label alone
+-- only needs those two columns patched in place.
+DROP TRIGGER IF EXISTS trg_events_radio_upd;
+CREATE TRIGGER trg_events_radio_upd AFTER UPDATE ON events_radio
+WHEN OLD.id IS NOT NEW.id OR OLD.artifact_id IS NOT NEW.artifact_id OR OLD.timestamp IS NOT NEW.timestamp
+     OR OLD.label IS NOT NEW.label OR OLD.score IS NOT NEW.score BEGIN
+    DELETE FROM events_all WHERE type = 'RADIO' AND event_id = OLD.id;
+    INSERT INTO events_all (type, event_id, artifact_id, timestamp, label, score, ml_score, ml_label)
+    VALUES ('RADIO', NEW.id, NEW.artifact_id, NEW.timestamp, NEW.label, NEW.score, NEW.ml_score, NEW.ml_label);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_events_radio_upd_ml AFTER UPDATE OF ml_score, ml_label ON events_radio
+WHEN OLD.id IS NEW.id AND OLD.artifact_id IS NEW.artifact_id AND OLD.timestamp IS NEW.timestamp
+     AND OLD.label IS NEW.label AND OLD.score IS NEW.score BEGIN
+    UPDATE events_all SET ml_score = NEW.ml_score, ml_label = NEW.ml_label
+    WHERE type = 'RADIO' AND event_id = NEW.id;
+END;
+
+DROP TRIGGER IF EXISTS trg_events_image_upd;
+CREATE TRIGGER trg_events_image_upd AFTER UPDATE ON events_image
+WHEN OLD.id IS NOT NEW.id OR OLD.artifact_id IS NOT NEW.artifact_id OR OLD.timestamp IS NOT NEW.timestamp
+     OR OLD.label IS NOT NEW.label OR OLD.score IS NOT NEW.score BEGIN
+    DELETE FROM events_all WHERE type = 'IMAGE' AND event_id = OLD.id;
+    INSERT INTO events_all (type, event_id, artifact_id, timestamp, label, score, ml_score, ml_label)
+    VALUES ('IMAGE', NEW.id, NEW.artifact_id, NEW.timestamp, NEW.label, NEW.score, NEW.ml_score, NEW.ml_label);
+END;
+CREATE TRIGGER IF NOT EXISTS trg_events_image_upd_ml AFTER UPDATE OF ml_score, ml_label ON events_image
+WHEN OLD.id IS NEW.id AND OLD.artifact_id IS NEW.artifact_id AND OLD.timestamp IS NEW.timestamp
+     AND OLD.label IS NEW.label AND OLD.score IS NEW.score BEGIN
+    UPDATE events_all SET ml_score = NEW.ml_score, ml_label = NEW.ml_label
+    WHERE type = 'IMAGE' AND event_id = NEW.id;
+END;
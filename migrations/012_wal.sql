@@ -0,0 +1,6 @@
+-- Migration 012: Write-ahead logging
+-- The API reads through a pool of read-only connections (modules/async_db.py) while the
+-- daemon writes. In rollback-journal mode every daemon commit locks those readers out;
+-- in WAL they keep reading the last committed snapshot. The mode is stored in the
+-- database file, so setting it once covers every later connection.
+PRAGMA journal_mode = WAL;
@@ -0,0 +1,129 @@
+"""
+Async read-only access to the SQLite vault for the API process.
+
+A small, fixed set of worker threads each own ONE read-only connection for
+their lifetime (sqlite3 connections are thread-bound), so requests never pay
+connect/open costs and never block the event loop. Queries are named templates
+(TEMPLATES, or the cached /events builder): the same SQL text every time means
+each connection's statement cache serves them already prepared.
+
+    pool = ReadPool(db_path)
+    rows = await pool.fetchall("events_by_artifact", (42,))
+
+Stdlib only, so the API can import it without the daemon's dependencies.
+"""
+import queue
+import sqlite3
+import asyncio
+import functools
+import threading
+
+POOL_SIZE = 4            # Reader threads/connections; SQLite (WAL) allows concurrent readers
+STATEMENT_CACHE = 128    # Prepared statements kept per connection
+BUSY_TIMEOUT_MS = 2000   # Wait this long on a writer's lock before failing a read
+
+EVENT_COLUMNS = "type, event_id, artifact_id, timestamp, label, score, ml_score, ml_label"
+
+TEMPLATES = {
+    "event_radio": "SELECT * FROM events_radio WHERE id = ?",
+    "event_image": "SELECT * FROM events_image WHERE id = ?",
+    "events_by_artifact": f"SELECT {EVENT_COLUMNS} FROM events_all WHERE artifact_id = ? ORDER BY timestamp DESC",
+}
+
+
+@functools.lru_cache(maxsize=None)
+def events_query(by_type, by_label, by_score, after_cursor):
+    """SQL for one combination of /events filters (16 at most, each built once)."""
+    where = []
+    if by_type: where.append("type = ?")
+    if by_label: where.append("label = ?")
+    if by_score: where.append("COALESCE(ml_score, score) >= ?")
+    if after_cursor: where.append("(timestamp, type, event_id) < (?, ?, ?)")
+    q = f"SELECT {EVENT_COLUMNS} FROM events_all"
+    if where:
+        q += " WHERE " + " AND ".join(where)
+    return q + " ORDER BY timestamp DESC, type DESC, event_id DESC LIMIT ?"
+
+
+@functools.lru_cache(maxsize=None)
+def evidence_query(event_type, column):
+    """SQL for one evidence column (column names come from evidence_paths.KINDS, never from the client)."""
+    table = {"RADIO": "events_radio", "IMAGE": "events_image"}[event_type]
+    return f"SELECT {column} FROM {table} WHERE id = ?"
+
+
+class ReadPool:
+    def __init__(self, db_path, size=POOL_SIZE):
+        self.db_path = str(db_path)
+        self.size = size
+        self._jobs = queue.SimpleQueue()
+        self._threads = []
+        self._start_lock = threading.Lock()
+
+    # --- Worker threads ---
+
+    def _start(self):
+        with self._start_lock:
+            if self._threads: return
+            for i in range(self.size):
+                t = threading.Thread(target=self._worker, name=f"db-read-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def _connect(self):
+        conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True,
+                               cached_statements=STATEMENT_CACHE, timeout=BUSY_TIMEOUT_MS / 1000)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def _worker(self):
+        conn = None
+        while True:
+            job = self._jobs.get()
+            if job is None: break
+            loop, fut, sql, params = job
+            try:
+                if conn is None:
+                    conn = self._connect() # Lazily, so the API can start before the daemon creates the DB
+                result = [dict(r) for r in conn.execute(sql, params).fetchall()]
+            except Exception as e:
+                if conn is not None and isinstance(e, sqlite3.OperationalError):
+                    conn.close() # Locked/missing/replaced file: reopen on the next job
+                    conn = None
+                loop.call_soon_threadsafe(_settle, fut, None, e)
+            else:
+                loop.call_soon_threadsafe(_settle, fut, result, None)
+        if conn is not None:
+            conn.close()
+
+    def close(self):
+        for _ in self._threads:
+            self._jobs.put(None)
+        for t in self._threads:
+            t.join(timeout=2)
+        self._threads = []
+
+    # --- Async API ---
+
+    async def fetchall(self, template_or_sql, params=()):
+        """Rows as dicts. Accepts a TEMPLATES name or SQL built by a cached builder."""
+        if not self._threads:
+            self._start()
+        sql = TEMPLATES.get(template_or_sql, template_or_sql)
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._jobs.put((loop, fut, sql, tuple(params)))
+        return await fut
+
+    async def fetchone(self, template_or_sql, params=()):
+        rows = await self.fetchall(template_or_sql, params)
+        return rows[0] if rows else None
+
+
+def _settle(fut, result, exc):
+    if fut.cancelled(): return # Client went away; drop the result
+    if exc is not None:
+        fut.set_exception(exc)
+    else:
+        fut.set_result(result)
@@ -0,0 +1,126 @@
+import math
+import time
+import sqlite3
+import logging
+import datetime
+import threading
+import config
+from modules.obs import Observability
+from modules.resource_sampler import ResourceSampler
+
+
+class PoolAutoscaler:
+    """
+    Resizes the DL/AN pools within their configured bounds to keep the pipeline balanced.
+
+    Signals: stage queue depths, busy workers, per-job latency (pool EWMA),
+    CPU utilisation and link usage from TelemetryMonitor when available.
+      - Analysis backlog + CPU headroom  -> more analyzers
+      - Analysis backlog + CPU saturated -> fewer downloaders (match analyze throughput)
+      - Download backlog + idle analyzers + link headroom -> more downloaders
+      - Idle pools shrink one worker per tick
+    Every change is written to the event log and the autoscale_events table.
+    """
+
+    def __init__(self, pipeline, interval=None, db_path=None):
+        self.pipeline = pipeline
+        self.interval = interval or config.AUTOSCALE_INTERVAL_SEC
+        self.db_path = db_path or config.DB_PATH
+        self.running = False
+        self.thread = None
+        self.sampler = ResourceSampler.shared() # CPU delta state is process-global: share one sampler
+
+    def start(self):
+        if self.running: return
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+        logging.info("⚖️ Pool Autoscaler Started")
+
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=2)
+
+    def _loop(self):
+        while self.running:
+            time.sleep(self.interval)
+            try:
+                self.tick()
+            except Exception as e:
+                logging.error(f"Autoscaler Error: {e}")
+
+    def sample(self):
+        p = self.pipeline
+        tel = getattr(p, "telemetry", None)
+        latest = getattr(tel, "latest", None) or {}
+        return {
+            "q_download": p.q_download.qsize(),
+            "q_analyze": p.q_analyze.qsize(),
+            "q_analyze_max": p.q_analyze.maxsize or config.QUEUE_SIZE,
+            # DL workers parked in disk admission are not transferring; don't count them as busy
+            "dl_size": p.pool_download.size, "dl_busy": p.pool_download.busy - getattr(p, "_admission_waiting", 0),
+            "an_size": p.pool_analyze.size, "an_busy": p.pool_analyze.busy,
+            "dl_latency": p.pool_download.latency_ewma,
+            "an_latency": p.pool_analyze.latency_ewma,
+            "cpu_pct": self.sampler.snapshot()["cpu"],
+            "plan_pct": latest.get("plan_pct", 0.0),
+            "mbps_down": latest.get("mbps_down", 0.0)
+        }
+
+    def decide(self, s):
+        """Returns {pool_name: (new_size, reason)} for pools that should change."""
+        out = {}
+        an_backlog = s["q_analyze"] / max(1, s["q_analyze_max"])
+        cpu_hot = s["cpu_pct"] >= config.AUTOSCALE_CPU_HIGH_PCT
+        link_full = s["plan_pct"] >= config.AUTOSCALE_NET_HIGH_PCT
+
+        # Analyze stage
+        if an_backlog >= 0.5 and s["an_busy"] >= s["an_size"]:
+            if not cpu_hot:
+                out["AN"] = (s["an_size"] + 1, "ANALYZE_BACKLOG")
+            elif s["dl_latency"] and s["an_latency"]:
+                # CPU-bound: download only as fast as analyzers can consume
+                balanced = math.ceil(s["an_size"] * s["dl_latency"] / s["an_latency"])
+                if balanced < s["dl_size"]:
+                    out["DL"] = (max(balanced, s["dl_size"] - 2), "CPU_BOUND")
+        elif s["q_analyze"] == 0 and s["an_busy"] < s["an_size"] / 2:
+            out["AN"] = (s["an_size"] - 1, "ANALYZE_IDLE")
+
+        # Download stage
+        if "DL" not in out:
+            if s["q_download"] > 0 and s["dl_busy"] >= s["dl_size"] and an_backlog < 0.25 and not link_full:
+                out["DL"] = (s["dl_size"] + 1, "DOWNLOAD_BACKLOG")
+            elif s["q_download"] == 0 and s["dl_busy"] < s["dl_size"] / 2:
+                out["DL"] = (s["dl_size"] - 1, "DOWNLOAD_IDLE")
+            elif link_full and s["dl_busy"] >= s["dl_size"]:
+                out["DL"] = (s["dl_size"] - 1, "LINK_SATURATED")
+        return out
+
+    def tick(self):
+        s = self.sample()
+        pools = {"DL": self.pipeline.pool_download, "AN": self.pipeline.pool_analyze}
+        for name, (wanted, reason) in self.decide(s).items():
+            pool = pools[name]
+            old = pool.size
+            new = pool.resize(wanted)
+            if new != old:
+                self._record(name, old, new, reason, s)
+
+    def _record(self, pool, old, new, reason, s):
+        logging.info(f"⚖️ Autoscale {pool}: {old} -> {new} ({reason})")
+        Observability.log_event("AUTOSCALE", pool=pool, old=old, new=new, reason=reason,
+                                q_download=s["q_download"], q_analyze=s["q_analyze"], cpu=s["cpu_pct"])
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute("""
+                INSERT INTO autoscale_events (
+                    timestamp, pool, old_size, new_size, reason,
+                    q_download_size, q_analyze_size, cpu_pct, mbps_down, dl_latency_s, an_latency_s
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (datetime.datetime.now().isoformat(), pool, old, new, reason,
+                  s["q_download"], s["q_analyze"], s["cpu_pct"], s["mbps_down"], s["dl_latency"], s["an_latency"]))
+            conn.commit()
+            conn.close()
+        except Exception as e:
+            logging.warning(f"Autoscale audit write failed: {e}")
@@ -1,4 +1,3 @@
-import psutil
 import time
 import json
 import os
@@ -6,10 +5,14 @@ import shutil
 import logging
 import subprocess
 import config
+from modules import metrics as registry # update_state's `metrics` argument shadows the module name
+from modules.resource_sampler import ResourceSampler
+from modules.throttle import Throttle
 
 class DaemonControl:
     """
     Monitors system resources and heavy processes to control Daemon state.
+    Heavy processes pause the daemon; CPU/RAM pressure only throttles it.
     """
     
     def __init__(self):
@@ -17,32 +20,26 @@ class DaemonControl:
         self.last_pause = 0
         self.last_resume = 0
         self.is_paused = False
+        self.last_check_ms = 0.0
+        self.sampler = ResourceSampler.shared()
+        self.throttle = Throttle() # Applied to the pipeline by the daemon loop (throttle.apply)
         
         # Ensure OBS dir exists
         os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
 
-    def check_should_pause(self):
+    def check_should_pause(self, snap=None):
         """
         Returns (should_pause: bool, reason: str)
+        snap: a ResourceSampler snapshot (default: the latest one; never blocks on psutil)
         """
-        # 1. Check Heavy Processes
-        try:
-            # Iterating processes can be slow, might want to optimize or cache PIDs logic
-            # For robustness, we check names.
-            for proc in psutil.process_iter(['name']):
-                if proc.info['name'] in config.HEAVY_PROCESS_NAMES:
-                    return True, f"HEAVY_PROCESS: {proc.info['name']}"
-        except Exception:
-            pass # Access denied etc.
+        snap = snap or self.sampler.snapshot()
 
-        # 2. Check Resources
-        cpu = psutil.cpu_percent(interval=0.1)
-        if cpu > config.PAUSE_CPU_PCT:
-            return True, f"CPU_HIGH: {cpu}%"
+        # 1. Check Heavy Processes (names cached by PID in the sampler)
+        heavy = snap["process_names"].intersection(config.HEAVY_PROCESS_NAMES)
+        if heavy:
+            return True, f"HEAVY_PROCESS: {sorted(heavy)[0]}"
 
-        ram = psutil.virtual_memory().percent
-        if ram > config.PAUSE_RAM_PCT:
-            return True, f"RAM_HIGH: {ram}%"
+        # 2. CPU/RAM over budget no longer pause: Throttle sheds load proportionally (see update_state)
 
         # 3. Check GPU (NVIDIA only stub)
         # shutil.which("nvidia-smi") could check presence
@@ -52,7 +49,9 @@ class DaemonControl:
 
     def update_state(self, current_status="IDLE", metrics=None):
         """Writes state to JSON for Dashboard."""
-        should_pause, reason = self.check_should_pause()
+        t0 = time.perf_counter()
+        snap = self.sampler.snapshot()
+        should_pause, reason = self.check_should_pause(snap)
         
         # Hysteresis / Cooldown Logic
         now = time.time()
@@ -77,20 +76,32 @@ class DaemonControl:
             else:
                 state_str = "RUNNING"
                 reason = "SYSTEM_OK"
+        if not self.is_paused:
+            self.throttle.update(snap)
+            if self.throttle.level < 1.0:
+                reason = f"THROTTLED {self.throttle.level:.2f}: {self.throttle.reason}"
 
         # If pipeline is idle despite running, we mark IDLE
         if state_str == "RUNNING" and current_status == "WAITING":
             state_str = "IDLE"
 
+        registry.DAEMON_PAUSED.set(1 if self.is_paused else 0)
+        registry.HOST_UTIL.labels("cpu").set(snap["cpu"])
+        registry.HOST_UTIL.labels("ram").set(snap["ram"])
+
         state_data = {
             "daemon_state": state_str,
             "pause_reason": reason,
             "updated_at": now,
             "metrics": {
-                "cpu": psutil.cpu_percent(interval=None),
-                "ram": psutil.virtual_memory().percent,
-                "gpu": "N/A"
-            }
+                "cpu": snap["cpu"],
+                "ram": snap["ram"],
+                "gpu": "N/A",
+                "sampled_at": snap["ts"]
+            },
+            "throttle": {"level": round(self.throttle.level, 3), **self.throttle.state},
+            # Monitoring cost: last background sample, previous update_state() call
+            "overhead_ms": {"sample": round(snap["sample_ms"], 3), "check": round(self.last_check_ms, 3)}
         }
         
         # Write Atomic
@@ -99,5 +110,8 @@ class DaemonControl:
                 json.dump(state_data, f)
             shutil.move(self.state_file + ".tmp", self.state_file)
         except: pass
-        
+
+        self.last_check_ms = (time.perf_counter() - t0) * 1000
+        registry.DAEMON_CONTROL_SECONDS.labels("sample").set(snap["sample_ms"] / 1000)
+        registry.DAEMON_CONTROL_SECONDS.labels("check").set(self.last_check_ms / 1000)
         return self.is_paused, reason
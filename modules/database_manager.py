@@ -21,10 +21,28 @@ import datetime
 import logging
 import config
 import glob
+import time
+import functools
+from modules import metrics
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - DB_MANAGER - %(message)s')
 
+def _timed_write(op):
+    """Counts and times a write method in the metrics registry (omnisky_db_write_*)."""
+    writes, seconds = metrics.DB_WRITES.labels(op), metrics.DB_WRITE_SECONDS.labels(op)
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                seconds.observe(time.perf_counter() - t0)
+                writes.inc()
+        return wrapper
+    return deco
+
 class DatabaseManager:
     def __init__(self, db_path=config.DB_PATH):
         self.db_path = db_path
@@ -95,6 +113,7 @@ class DatabaseManager:
         conn.close()
         return exists
 
+    @_timed_write("register_artifact")
     def register_artifact(self, url, filename, status="NEW"):
         now = datetime.datetime.now().isoformat()
         conn = self.get_connection()
@@ -113,6 +132,7 @@ class DatabaseManager:
         finally:
             conn.close()
 
+    @_timed_write("update_artifact")
     def update_artifact_status(self, art_id, status, path=None, file_hash=None, size=None, error=None):
         now = datetime.datetime.now().isoformat()
         conn = self.get_connection()
@@ -145,6 +165,19 @@ class DatabaseManager:
         finally:
             conn.close()
 
+    def get_unfinished_artifacts(self):
+        """Artifacts a previous run left mid-pipeline: (id, source_url, filename, status, download_path)."""
+        conn = self.get_connection()
+        try:
+            return conn.execute("""
+                SELECT id, source_url, filename, status, download_path FROM artifacts
+                WHERE status IN ('NEW', 'QUEUED', 'DOWNLOADING', 'DOWNLOADED', 'ANALYZING', 'CHECKPOINTED', 'INTERRUPTED')
+                ORDER BY id
+            """).fetchall()
+        finally:
+            conn.close()
+
+    @_timed_write("radio_event")
     def log_radio_event(self, art_id, data):
         """Data dict con keys fch1, snr, etc"""
         conn = self.get_connection()
@@ -160,6 +193,7 @@ class DatabaseManager:
             data.get('score'), data.get('label'), data.get('notes'),
             data.get('waterfall_path'), data.get('audio_raw'), data.get('audio_clean')
         ))
+        event_id = c.lastrowid
         conn.commit()
         
         # Legacy support: Insert into hallazgos for Dashboard v1 (Temporal)
@@ -175,7 +209,9 @@ class DatabaseManager:
         ))
         conn.commit()
         conn.close()
+        return event_id
         
+    @_timed_write("image_event")
     def log_image_event(self, art_id, data):
         conn = self.get_connection()
         c = conn.cursor()
@@ -189,6 +225,7 @@ class DatabaseManager:
             data.get('score'), data.get('label'), data.get('notes'),
             data.get('annotated_path')
         ))
+        event_id = c.lastrowid
         conn.commit()
         
         # Legacy
@@ -203,6 +240,24 @@ class DatabaseManager:
         
         conn.commit()
         conn.close()
+        return event_id
+
+    @_timed_write("triage_update")
+    def update_event_triage(self, rows):
+        """rows: [(event_type 'RADIO'|'IMAGE', event_id, ml_score, ml_label)]; one transaction, one statement per table."""
+        by_table = {"RADIO": [], "IMAGE": []}
+        for etype, event_id, score, label in rows:
+            by_table["RADIO" if etype == "RADIO" else "IMAGE"].append((score, label, event_id))
+        conn = self.get_connection()
+        try:
+            with conn:
+                for etype, params in by_table.items():
+                    if params:
+                        table = "events_radio" if etype == "RADIO" else "events_image"
+                        conn.executemany(f"UPDATE {table} SET ml_score = ?, ml_label = ? WHERE id = ?", params)
+        finally:
+            conn.close()
+
     # --- SESSION MANAGEMENT (PRO) ---
     def create_session(self, config_snapshot=None):
         import uuid
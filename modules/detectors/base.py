@@ -1,4 +1,19 @@
 from abc import ABC, abstractmethod
+import numpy as np
+import pandas as pd
+
+# Column order when detect_batch() gets a bare ndarray
+BATCH_COLUMNS = ("snr", "drift")
+
+
+def as_frame(data):
+    """DataFrame view of a batch: DataFrame as is, ndarray columns per BATCH_COLUMNS, or a list of event dicts."""
+    if isinstance(data, pd.DataFrame):
+        return data
+    if isinstance(data, np.ndarray):
+        return pd.DataFrame(np.atleast_2d(data), columns=list(BATCH_COLUMNS[:np.atleast_2d(data).shape[1]]))
+    return pd.DataFrame.from_records(list(data))
+
 
 class Detector(ABC):
     @property
@@ -12,3 +27,17 @@ class Detector(ABC):
         Returns {score: 0-100, label: str, metadata: dict}
         """
         pass
+
+    def detect_batch(self, data):
+        """
+        Scores many events at once. data: DataFrame (one row per event), ndarray or list of dicts.
+        Returns (scores float ndarray, labels object ndarray). Override with a vectorized version;
+        this default calls detect() per row.
+        """
+        if isinstance(data, (pd.DataFrame, np.ndarray)):
+            rows = as_frame(data).to_dict("records")
+        else:
+            rows = list(data) # Event dicts as given: a missing key stays missing, not NaN
+        results = [self.detect(r) for r in rows]
+        return (np.array([r['score'] for r in results], dtype=float),
+                np.array([r['label'] for r in results], dtype=object))
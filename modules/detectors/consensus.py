@@ -1,5 +1,9 @@
+import time
+import uuid
 import logging
 import sqlite3
+import numpy as np
+import pandas as pd
 import config
 from .heuristic import HeuristicDetector
 # from .ml import MLDetector # Could wrap TriageEngine here
@@ -11,46 +15,93 @@ class ConsensusEngine:
         self.db_path = config.DB_PATH
 
     def run_all(self, event_data, event_id=None):
-        results = []
+        """Consensus for one event (a batch of one). Returns {label, score, disputed, details}."""
+        out = self.run_batch([event_data], None if event_id is None else [event_id])
+        if out.empty or not self.detectors:
+            return {"label": "UNKNOWN", "score": 0, "disputed": False}
+        row = out.iloc[0]
+        details = [{"detector": d.name, "score": float(row[f"{d.name}_score"]), "label": row[f"{d.name}_label"]}
+                   for d in self.detectors if f"{d.name}_label" in out]
+        if not details:
+            return {"label": "UNKNOWN", "score": 0, "disputed": False}
+        return {"label": row["label"], "score": float(row["score"]), "disputed": bool(row["disputed"]), "details": details}
+
+    def run_batch(self, data, event_ids=None, run_id=None):
+        """
+        Runs every detector once over the whole batch and takes the consensus column-wise.
+        data: DataFrame / ndarray / list of event dicts. With event_ids, each detector's
+        results go to detector_runs under run_id (default: a new id per call).
+        Returns a DataFrame: label (majority), score (mean), disputed, <detector>_score, <detector>_label.
+        """
+        # Event dicts go to detectors as given, so per-row detect() fallbacks see missing keys as missing
+        batch = data if isinstance(data, (pd.DataFrame, np.ndarray)) else list(data)
+        n = len(batch)
+        out = pd.DataFrame(index=range(n))
+        names, scores, labels = [], [], []
         for d in self.detectors:
             try:
-                res = d.detect(event_data)
-                results.append({
-                    "detector": d.name,
-                    "score": res['score'],
-                    "label": res['label']
-                })
-                
-                # Persist run if event_id provided
-                if event_id:
-                   self._persist_run(event_id, d.name, res)
-                   
+                s, l = d.detect_batch(batch)
             except Exception as e:
                 logging.error(f"Detector {d.name} failed: {e}")
-        
-        # Determine Consensus
-        # Simple Majority or Max Score
-        if not results: return {"label": "UNKNOWN", "score": 0, "disputed": False}
-        
-        labels = [r['label'] for r in results]
-        consensus = max(set(labels), key=labels.count)
-        disputed = len(set(labels)) > 1
-        avg_score = sum(r['score'] for r in results) / len(results)
-        
-        return {
-            "label": consensus,
-            "score": avg_score,
-            "disputed": disputed,
-            "details": results
-        }
-
-    def _persist_run(self, event_id, det_name, res):
+                continue
+            names.append(d.name)
+            scores.append(np.asarray(s, dtype=float))
+            labels.append(np.asarray(l, dtype=object))
+            out[f"{d.name}_score"] = scores[-1]
+            out[f"{d.name}_label"] = labels[-1]
+
+        if not names:
+            out["label"], out["score"], out["disputed"] = "UNKNOWN", 0.0, False
+            return out
+
+        L = np.column_stack(labels) # (events, detectors)
+        S = np.column_stack(scores)
+        # Majority label: one vote count per distinct label, argmax across them (ties: first in sort order)
+        candidates = np.unique(L)
+        votes = np.stack([(L == c).sum(axis=1) for c in candidates], axis=1)
+        out["label"] = candidates[votes.argmax(axis=1)]
+        out["score"] = S.mean(axis=1)
+        out["disputed"] = (L != L[:, :1]).any(axis=1)
+
+        if event_ids is not None:
+            self._persist_runs(run_id or uuid.uuid4().hex, np.asarray(event_ids), names, scores, labels)
+        return out
+
+    def run_history(self, run_id=None, chunk_rows=None):
+        """
+        Consensus over every radio event, streamed in keyset chunks, all under one run_id.
+        Returns {run_id, events, seconds}.
+        """
+        run_id = run_id or uuid.uuid4().hex
+        chunk_rows = chunk_rows or config.RESCORE_CHUNK_ROWS
+        t0 = time.time()
+        n, last_id = 0, 0
+        conn = sqlite3.connect(self.db_path)
+        try:
+            while True:
+                chunk = pd.read_sql_query(
+                    "SELECT id, snr, drift_rate AS drift FROM events_radio WHERE id > ? ORDER BY id LIMIT ?",
+                    conn, params=(last_id, chunk_rows))
+                if chunk.empty: break
+                self.run_batch(chunk, chunk["id"].to_numpy(), run_id)
+                n += len(chunk)
+                last_id = int(chunk["id"].iloc[-1])
+        finally:
+            conn.close()
+        return {"run_id": run_id, "events": n, "seconds": round(time.time() - t0, 2)}
+
+    def _persist_runs(self, run_id, event_ids, names, scores, labels):
+        """All detectors' results for the batch: one connection, one executemany."""
+        rows = [(run_id, name, int(eid), float(s), l)
+                for name, sc, lb in zip(names, scores, labels)
+                for eid, s, l in zip(event_ids.tolist(), sc.tolist(), lb.tolist())]
         conn = sqlite3.connect(self.db_path)
         try:
-            conn.execute(
-                "INSERT INTO detector_runs (run_id, detector_name, event_id, score, label, created_at) VALUES (?, ?, ?, ?, ?, datetime('now'))",
-                ("BATCH", det_name, event_id, res['score'], res['label'])
-            )
-            conn.commit()
-        except: pass
-        finally: conn.close()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO detector_runs (run_id, detector_name, event_id, score, label, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, datetime('now'))", rows)
+        except sqlite3.Error as e:
+            logging.error(f"detector_runs write failed ({len(rows)} rows): {e}")
+        finally:
+            conn.close()
@@ -1,4 +1,13 @@
-from .base import Detector
+import numpy as np
+import pandas as pd
+from .base import Detector, as_frame
+
+
+def _column(frame, name):
+    if name not in frame:
+        return np.zeros(len(frame))
+    return pd.to_numeric(frame[name], errors='coerce').fillna(0).to_numpy(dtype=float)
+
 
 class HeuristicDetector(Detector):
     @property
@@ -6,13 +15,15 @@ class HeuristicDetector(Detector):
         return "HEURISTIC"
 
     def detect(self, event_data):
-        score = 0
-        snr = float(event_data.get('snr', 0) or event_data.get('sigma', 0))
-        drift = abs(float(event_data.get('drift', 0)))
-        
-        if snr > 10: score += 50
-        if snr > 50: score += 30
-        if 0.1 < drift < 2.0: score += 20
-        
-        label = "CANDIDATE" if score > 60 else "NOISE"
-        return {"score": score, "label": label, "metadata": {}}
+        scores, labels = self.detect_batch([event_data])
+        return {"score": float(scores[0]), "label": labels[0], "metadata": {}}
+
+    def detect_batch(self, data):
+        frame = as_frame(data)
+        snr = _column(frame, 'snr')
+        snr = np.where(snr != 0, snr, _column(frame, 'sigma')) # sigma when snr is missing/0
+        drift = np.abs(_column(frame, 'drift'))
+
+        score = 50.0 * (snr > 10) + 30.0 * (snr > 50) + 20.0 * ((drift > 0.1) & (drift < 2.0))
+        label = np.where(score > 60, "CANDIDATE", "NOISE").astype(object)
+        return score, label
@@ -5,6 +5,7 @@ import importlib
 import inspect
 from modules.sources.base import DataSource
 from .database_manager import DatabaseManager
+from .sky_coverage import SUBTILE_RE
 
 # Intentar importar astroquery, si falla usamos fallback
 try:
@@ -42,40 +43,35 @@ class DiscoveryAgent:
 
     def find_new_targets(self):
         logging.info("🕵️ Initiating Discovery Protocol (Plugin System Active)")
-        new_targets_objs = []
-        
+        valid_targets = []
+        conn = self.db.get_connection()
+        c = conn.cursor()
+        candidates = self._candidate_keys(c)
+
         # 1. Execute Plugins
+        # discover() may return a list or a generator (streaming crawlers), so we
+        # dedupe while consuming and stop once the per-cycle budget is reached.
         for plugin in self.plugins:
+            seen, fresh = 0, 0
             try:
-                targets = plugin.discover()
-                if targets:
-                    logging.info(f"   -> {plugin.name} found {len(targets)} candidates")
-                    new_targets_objs.extend(targets)
+                for t_obj in plugin.discover() or []:
+                    seen += 1
+                    # 2. DB Deduplication (Check ID/URL)
+                    c.execute("SELECT 1 FROM artifacts WHERE source_url = ?", (t_obj.url,))
+                    if c.fetchone():
+                        continue # Already known
+                    # Re-observation of something already flagged -> jump the queue
+                    if self._object_key(t_obj.url) in candidates:
+                        t_obj.metadata = dict(t_obj.metadata or {}, priority="REOBSERVE")
+                    valid_targets.append(t_obj)
+                    fresh += 1
+                    if fresh >= config.DISCOVERY_MAX_NEW_PER_PLUGIN:
+                        break
             except Exception as e:
                 logging.error(f"Plugin {plugin.name} crashed: {e}")
+            if seen:
+                logging.info(f"   -> {plugin.name} found {seen} candidates ({fresh} new)")
 
-        # 2. Extract URLs for DB Check
-        # Convert Target objects to list of URLs for compatibility with pipeline/dedupe
-        candidate_urls = [t.url for t in new_targets_objs]
-
-        # 3. DB Deduplication
-        valid_targets = []
-        conn = self.db.get_connection()
-        c = conn.cursor()
-        
-        for t_obj in new_targets_objs:
-            # Check ID/URL
-            c.execute("SELECT 1 FROM artifacts WHERE source_url = ?", (t_obj.url,))
-            if not c.fetchone():
-                valid_targets.append(t_obj.url)
-                # Ideally we pass the full Target object to pipeline, 
-                # but legacy pipeline expects simple URLs list logic currently.
-                # TODO: Upgrade pipeline to accept Objects or store metadata now?
-                # For now, keep interface: return list of URLs. 
-                # (Harvesters will re-parse or we rely on them downloading)
-            else:
-                pass # Already known
-        
         conn.close()
                 
         logging.info(f"✨ New Valid Targets: {len(valid_targets)}")
@@ -97,3 +93,26 @@ class DiscoveryAgent:
         except Exception as e:
             logging.error(f"Error Dorking: {e}")
         return founded
+
+    @staticmethod
+    def _object_key(url_or_name):
+        """
+        '.../VLASS1.2.ql.T01t01.J000412+000631.10.2048.v1.I...fits' -> 'J000412+000631' (matches across epochs).
+        Names without a J-name fall back to the stem: '.../voyager_f1032.h5' -> 'voyager_f1032'.
+        """
+        name = url_or_name.split('/')[-1]
+        m = SUBTILE_RE.search(name)
+        return m.group(0) if m else name.split('.')[0]
+
+    def _candidate_keys(self, c):
+        """Object keys of artifacts that already produced a candidate/source event."""
+        try:
+            c.execute("""
+                SELECT a.filename FROM artifacts a JOIN events_radio r ON r.artifact_id = a.id WHERE r.label = 'CANDIDATE'
+                UNION
+                SELECT a.filename FROM artifacts a JOIN events_image i ON i.artifact_id = a.id WHERE i.label = 'VISUAL_SOURCE'
+            """)
+            return {self._object_key(row[0]) for row in c.fetchall() if row[0]}
+        except Exception as e:
+            logging.warning(f"Candidate lookup failed: {e}")
+            return set()
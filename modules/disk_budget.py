@@ -0,0 +1,153 @@
+import os
+import shutil
+import logging
+import threading
+import requests
+import config
+from modules.obs import Observability
+
+MB = 1024 * 1024
+
+
+def content_length(url, timeout=10):
+    """Size announced by the server (HEAD), or 0 when unknown."""
+    try:
+        r = requests.head(url, allow_redirects=True, timeout=timeout,
+                          headers={'User-Agent': config.USER_AGENTS[0]})
+        return int(r.headers.get("Content-Length") or 0) if r.ok else 0
+    except Exception:
+        return 0
+
+
+class DiskBudget:
+    """
+    Byte quota for TEMP_CACHE.
+
+    Each download reserves its expected size before it starts; the reservation is
+    settled to the real size once the file lands and released when the raw file is
+    cleaned up. Usage is max(reserved, bytes on disk) so files left behind for
+    forensics still count.
+
+    Watermarks: crossing DISK_HIGH_WATERMARK_PCT of the budget pauses admission
+    (DL workers park) until usage falls back under DISK_LOW_WATERMARK_PCT.
+    MIN_FREE_DISK_MB is a hard floor for the whole volume (SQLite + evidence live there too).
+    """
+
+    def __init__(self, root=None, budget_mb=None, high_pct=None, low_pct=None, min_free_mb=None):
+        self.root = root or config.DIR_TEMP
+        self.budget = (budget_mb or config.TEMP_CACHE_BUDGET_MB) * MB
+        self.high = self.budget * (high_pct or config.DISK_HIGH_WATERMARK_PCT) / 100.0
+        self.low = self.budget * (low_pct or config.DISK_LOW_WATERMARK_PCT) / 100.0
+        self.min_free = (min_free_mb if min_free_mb is not None else config.MIN_FREE_DISK_MB) * MB
+        self.paused = False
+        self._reservations = {} # key -> bytes
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    # --- Accounting ---
+
+    def on_disk(self):
+        total = 0
+        try:
+            with os.scandir(self.root) as it:
+                for e in it:
+                    if e.is_file(follow_symlinks=False):
+                        total += e.stat().st_size
+        except OSError:
+            pass
+        return total
+
+    def reserved(self):
+        with self._lock:
+            return sum(self._reservations.values())
+
+    def _used(self):
+        return max(sum(self._reservations.values()), self.on_disk())
+
+    def _update_watermarks(self, used):
+        if self.paused and used <= self.low:
+            self.paused = False
+            logging.info(f"💾 TEMP_CACHE below low watermark ({used / MB:.0f} MB). Downloads resumed.")
+            Observability.log_event("DISK_RESUME", used_bytes=used, low_bytes=int(self.low))
+        elif not self.paused and used >= self.high:
+            self.paused = True
+            logging.warning(f"💾 TEMP_CACHE above high watermark ({used / MB:.0f} MB). Downloads paused.")
+            Observability.log_event("DISK_PAUSE", used_bytes=used, high_bytes=int(self.high))
+
+    def reserve(self, key, nbytes):
+        """Non-blocking. True if `nbytes` may be written now under `key`."""
+        nbytes = max(0, int(nbytes or 0))
+        with self._lock:
+            used = self._used()
+            self._update_watermarks(used)
+            if self.paused:
+                return False
+            # With nothing in flight a single oversized file is still admitted, otherwise it would never run
+            if self._reservations and used + nbytes > self.high:
+                return False
+            if shutil.disk_usage(self.root).free - nbytes < self.min_free:
+                return False
+            self._reservations[key] = nbytes
+            return True
+
+    def track(self, key, nbytes):
+        """Registers a file already on disk (recovered after restart) without admission checks."""
+        with self._lock:
+            self._reservations[key] = max(0, int(nbytes or 0))
+
+    def settle(self, key, actual_bytes):
+        """Replaces the estimate with the real size of the downloaded file."""
+        with self._lock:
+            if key in self._reservations:
+                self._reservations[key] = max(0, int(actual_bytes or 0))
+
+    def release(self, key):
+        with self._lock:
+            self._reservations.pop(key, None)
+
+    # --- Maintenance ---
+
+    def sweep_orphans(self, keep=()):
+        """
+        Deletes files in TEMP_CACHE that no job owns (leftovers of a crash/kill).
+        Run at startup before any reservation exists. Returns (files, bytes) freed.
+        """
+        keep = {os.path.abspath(p) for p in keep if p}
+        files, freed = 0, 0
+        try:
+            entries = list(os.scandir(self.root))
+        except OSError:
+            return 0, 0
+        for e in entries:
+            if not e.is_file(follow_symlinks=False) or os.path.abspath(e.path) in keep:
+                continue
+            try:
+                size = e.stat().st_size
+                os.remove(e.path)
+                files += 1
+                freed += size
+            except OSError:
+                logging.warning(f"Orphan sweep could not delete {e.path}")
+        if files:
+            logging.info(f"🧹 Swept {files} orphaned TEMP_CACHE files ({freed / MB:.1f} MB)")
+            Observability.log_event("DISK_SWEEP", files=files, bytes=freed)
+        return files, freed
+
+    def snapshot(self):
+        with self._lock:
+            reserved = sum(self._reservations.values())
+            n = len(self._reservations)
+        try:
+            free = shutil.disk_usage(self.root).free
+        except OSError:
+            free = None
+        return {
+            "budget_bytes": self.budget,
+            "on_disk_bytes": self.on_disk(),
+            "reserved_bytes": reserved,
+            "reservations": n,
+            "free_bytes": free,
+            "high_bytes": int(self.high),
+            "low_bytes": int(self.low),
+            "paused": self.paused
+        }
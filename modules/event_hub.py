@@ -0,0 +1,151 @@
+"""
+In-memory fan-out for the API's live stream (/stream, Server-Sent Events).
+
+The daemon and the API are separate processes, so the hub is fed by ONE follower
+per API process that picks up what Observability writes (new event_log.jsonl
+lines, status.json / daemon_state.json changes). Every connected dashboard is
+served from memory: N clients cost one small file poll, not N.
+
+Each subscriber has a bounded deque; a slow client loses its oldest messages
+(drop-oldest) and is told how many via a 'dropped' message, instead of
+growing memory or stalling the others. The follower only runs while at least
+one client is connected.
+
+Stdlib only (asyncio); everything runs on the API's event loop.
+"""
+import os
+import json
+import asyncio
+import itertools
+import collections
+
+CLIENT_BUFFER = 256      # Messages kept per slow client before dropping the oldest
+POLL_INTERVAL_SEC = 0.5  # Follower poll period (the daemon's log writer batches at 0.25s)
+HEARTBEAT_SEC = 15       # SSE comment to keep proxies from closing idle streams
+MAX_READ_BYTES = 1024 * 1024 # Per poll; a burst beyond this is picked up next tick
+
+
+class Subscriber:
+    def __init__(self, topics=None, buffer=CLIENT_BUFFER):
+        self.topics = set(topics) if topics else None
+        self.queue = collections.deque(maxlen=buffer)
+        self.dropped = 0
+        self.ready = asyncio.Event()
+
+    def push(self, msg):
+        if self.topics is not None and msg[1] not in self.topics:
+            return
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+        self.queue.append(msg)
+        self.ready.set()
+
+
+class EventHub:
+    def __init__(self, log_path, status_paths):
+        self.log_path = str(log_path)
+        self.status_paths = {name: str(p) for name, p in status_paths.items()}
+        self.subscribers = set()
+        self._seq = itertools.count(1)
+        self._task = None
+        self._log_pos = None
+        self._log_ino = None
+        self._status_mtime = {}
+        self.last_status = {}
+
+    # --- Clients ---
+
+    def subscribe(self, topics=None):
+        sub = Subscriber(topics)
+        self.subscribers.add(sub)
+        # Late joiners get the current status immediately
+        for name, data in self.last_status.items():
+            sub.push((next(self._seq), "status", {"source": name, **data}))
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._follow())
+        return sub
+
+    def unsubscribe(self, sub):
+        self.subscribers.discard(sub)
+
+    def publish(self, topic, data):
+        msg = (next(self._seq), topic, data)
+        for sub in list(self.subscribers):
+            sub.push(msg)
+
+    async def stream(self, sub):
+        """Yields SSE frames for one subscriber until the client disconnects."""
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    await asyncio.wait_for(sub.ready.wait(), timeout=HEARTBEAT_SEC)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                sub.ready.clear()
+                if sub.dropped:
+                    n, sub.dropped = sub.dropped, 0
+                    yield f"event: dropped\ndata: {json.dumps({'count': n})}\n\n"
+                while sub.queue:
+                    seq, topic, data = sub.queue.popleft()
+                    yield f"id: {seq}\nevent: {topic}\ndata: {json.dumps(data, default=str)}\n\n"
+        finally:
+            self.unsubscribe(sub)
+
+    # --- Follower (one per process) ---
+
+    async def _follow(self):
+        self._init_log_position()
+        while self.subscribers:
+            try:
+                self._poll_status()
+                self._poll_log()
+            except Exception:
+                pass # Files mid-rotation/rename: retry next tick
+            await asyncio.sleep(POLL_INTERVAL_SEC)
+        self._task = None
+
+    def _init_log_position(self):
+        # Start at EOF: the stream carries new events; history is /logs/tail
+        try:
+            st = os.stat(self.log_path)
+            self._log_pos, self._log_ino = st.st_size, st.st_ino
+        except OSError:
+            self._log_pos, self._log_ino = 0, None
+
+    def _poll_log(self):
+        try:
+            st = os.stat(self.log_path)
+        except OSError:
+            return
+        if st.st_ino != self._log_ino or st.st_size < self._log_pos:
+            self._log_pos, self._log_ino = 0, st.st_ino # Rotated: new file from the start
+        if st.st_size == self._log_pos:
+            return
+        with open(self.log_path, 'rb') as f:
+            f.seek(self._log_pos)
+            chunk = f.read(min(st.st_size - self._log_pos, MAX_READ_BYTES))
+        end = chunk.rfind(b"\n")
+        if end < 0:
+            return # Partial line only; wait for the rest
+        self._log_pos += end + 1
+        for raw in chunk[:end].split(b"\n"):
+            try:
+                self.publish("event", json.loads(raw))
+            except Exception:
+                pass
+
+    def _poll_status(self):
+        for name, path in self.status_paths.items():
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                continue
+            if self._status_mtime.get(name) == mtime:
+                continue
+            self._status_mtime[name] = mtime
+            with open(path, 'r') as f:
+                data = json.load(f)
+            self.last_status[name] = data
+            self.publish("status", {"source": name, **data})
@@ -0,0 +1,207 @@
+"""
+Read/query helpers for event_log.jsonl that never scan the whole file.
+
+- tail(): reads fixed-size blocks backwards from EOF until N lines are found.
+- Sparse sidecar index (event_log.jsonl.idx): the writer appends one JSON record
+  per ~INDEX_BLOCK_BYTES of log: {"off", "end", "ts_min", "ts_max", "a_min", "a_max", "n"}.
+  range queries (time window and/or artifact id) read only overlapping blocks,
+  plus the short unindexed tail after the last record. Only the writer process
+  (Observability) creates or rebuilds the sidecar; readers never write it.
+
+Stdlib only and path-driven, so the API process can import it without config.
+"""
+import os
+import json
+import threading
+
+
+INDEX_BLOCK_BYTES = 256 * 1024
+READ_BLOCK_BYTES = 64 * 1024
+
+
+def index_path(log_path):
+    return str(log_path) + ".idx"
+
+
+def _parse(lines):
+    out = []
+    for raw in lines:
+        try:
+            out.append(json.loads(raw))
+        except Exception:
+            pass # Torn/partial line
+    return out
+
+
+def tail(log_path, n, block_size=READ_BLOCK_BYTES):
+    """Last n events in file order (oldest first). Cost depends on n, not on the file size."""
+    if n <= 0: return []
+    try:
+        f = open(log_path, 'rb')
+    except OSError:
+        return []
+    with f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        buf = b""
+        lines = []
+        while pos > 0 and len(lines) <= n:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            buf = f.read(step) + buf
+            parts = buf.split(b"\n")
+            # parts[0] may be a partial line unless we reached the start of the file
+            buf = parts[0] if pos > 0 else b""
+            lines = [p for p in (parts[1:] if pos > 0 else parts) if p.strip()] + lines
+        return _parse(lines[-n:])
+
+
+class IndexWriter:
+    """
+    Accumulates per-block stats while the log writer appends lines and emits an
+    index record whenever a block reaches INDEX_BLOCK_BYTES.
+    """
+
+    def __init__(self, log_path, block_bytes=INDEX_BLOCK_BYTES):
+        self.log_path = str(log_path)
+        self.block_bytes = block_bytes
+        self._reset(None)
+
+    def _reset(self, off):
+        self.off, self.end, self.n = off, off, 0
+        self.ts_min = self.ts_max = None
+        self.a_min = self.a_max = None
+
+    def note(self, offset, nbytes, ts, artifact_id=None):
+        """Call for each line written at `offset` (bytes, including newline)."""
+        if self.off is None:
+            self._reset(offset)
+        self.end = offset + nbytes
+        self.n += 1
+        if ts:
+            if self.ts_min is None or ts < self.ts_min: self.ts_min = ts
+            if self.ts_max is None or ts > self.ts_max: self.ts_max = ts
+        if isinstance(artifact_id, int):
+            if self.a_min is None or artifact_id < self.a_min: self.a_min = artifact_id
+            if self.a_max is None or artifact_id > self.a_max: self.a_max = artifact_id
+        if self.end - self.off >= self.block_bytes:
+            self.flush()
+
+    def flush(self):
+        if self.off is None or self.n == 0: return
+        rec = {"off": self.off, "end": self.end, "ts_min": self.ts_min, "ts_max": self.ts_max,
+               "a_min": self.a_min, "a_max": self.a_max, "n": self.n}
+        with open(index_path(self.log_path), 'a') as f:
+            f.write(json.dumps(rec) + "\n")
+        self._reset(None)
+
+    def discard(self):
+        """Log rotated: the current block belongs to the old file."""
+        self._reset(None)
+
+
+def indexed_until(log_path):
+    records = load_index(log_path)
+    return records[-1]["end"] if records else 0
+
+
+def build_index(log_path, block_bytes=INDEX_BLOCK_BYTES):
+    """(Re)builds the sidecar for an existing log with one sequential pass."""
+    idx = index_path(log_path)
+    if os.path.exists(idx): os.remove(idx)
+    w = IndexWriter(log_path, block_bytes)
+    off = 0
+    with open(log_path, 'rb') as f:
+        for raw in f:
+            if not raw.endswith(b"\n"): break # Partial last line stays unindexed
+            try:
+                e = json.loads(raw)
+                w.note(off, len(raw), e.get("ts"), e.get("artifact_id"))
+            except Exception:
+                w.note(off, len(raw), None)
+            off += len(raw)
+    w.flush() # Cover every complete line, so a writer appending from `off` leaves no gap
+    return off
+
+
+_cache = {} # idx path -> (mtime, size, records)
+_cache_lock = threading.Lock()
+
+
+def load_index(log_path):
+    idx = index_path(log_path)
+    try:
+        st = os.stat(idx)
+    except OSError:
+        return []
+    with _cache_lock:
+        hit = _cache.get(idx)
+        if hit and hit[0] == st.st_mtime and hit[1] == st.st_size:
+            return hit[2]
+    records = []
+    with open(idx, 'r') as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except Exception:
+                pass
+    with _cache_lock:
+        _cache[idx] = (st.st_mtime, st.st_size, records)
+    return records
+
+
+def _matches(e, start, end, artifact_id):
+    ts = e.get("ts") or ""
+    if start and ts < start: return False
+    if end and ts > end: return False
+    if artifact_id is not None and e.get("artifact_id") != artifact_id: return False
+    return True
+
+
+def _lines(f, nbytes):
+    """Lines in the next nbytes of f, read line by line (an unindexed log can be large)."""
+    while nbytes > 0:
+        raw = f.readline(nbytes)
+        if not raw: return
+        nbytes -= len(raw)
+        yield raw
+
+
+def query(log_path, start=None, end=None, artifact_id=None, limit=1000, event=None):
+    """
+    Events with start <= ts <= end (ISO strings) and/or a given artifact_id, in file order.
+    Seeks straight to candidate blocks via the sidecar index; whatever it does not
+    cover (missing or stale sidecar, the tail past its last record) is scanned. Read-only.
+    """
+    try:
+        size = os.path.getsize(log_path)
+    except OSError:
+        return []
+    records = load_index(log_path)
+    if records and records[-1]["end"] > size:
+        # Sidecar of a rotated/truncated log. Only the writer process rebuilds it (Observability
+        # on open); readers scan without writing, so they never race its appends.
+        records = []
+
+    ranges = []
+    for r in records:
+        if start and r["ts_max"] and r["ts_max"] < start: continue
+        if end and r["ts_min"] and r["ts_min"] > end: continue
+        if artifact_id is not None and (r["a_min"] is None or not r["a_min"] <= artifact_id <= r["a_max"]): continue
+        ranges.append((r["off"], r["end"]))
+    indexed_end = records[-1]["end"] if records else 0
+    if indexed_end < size:
+        ranges.append((indexed_end, size))
+
+    out = []
+    with open(log_path, 'rb') as f:
+        for off, stop in ranges:
+            f.seek(off)
+            for e in _parse(_lines(f, stop - off)):
+                if event and e.get("event") != event: continue
+                if _matches(e, start, end, artifact_id):
+                    out.append(e)
+                    if len(out) >= limit:
+                        return out
+    return out
@@ -0,0 +1,88 @@
+"""
+Evidence file lookup shared by the API (/evidence) and the dashboard.
+
+Event rows store evidence paths as written at analysis time: absolute,
+relative to the repo root, or relative to OMNISKY_ROOT. PathResolver probes
+those locations once per stored path and remembers the hit, so repeated
+views cost at most one stat instead of a probe of every root.
+
+Stdlib only, so the API can import it without the daemon's dependencies.
+"""
+import os
+import threading
+import collections
+
+CACHE_ENTRIES = 8192 # Resolved paths remembered per resolver
+
+# /evidence/{event_id}/{kind} -> (event table type, column)
+KINDS = {
+    "waterfall": ("RADIO", "path_waterfall"),
+    "npz": ("RADIO", "path_npz"),
+    "audio": ("RADIO", "path_audio_raw"),
+    "audio_clean": ("RADIO", "path_audio_clean"),
+    "annotated": ("IMAGE", "path_annotated"),
+    "cutout": ("IMAGE", "path_cutout"),
+}
+
+MEDIA_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".wav": "audio/wav",
+    ".npz": "application/octet-stream",
+    ".fits": "application/fits",
+    ".json": "application/json",
+    ".md": "text/markdown",
+}
+
+
+def is_empty(path_str):
+    return not path_str or str(path_str).lower() in ['none', 'nan', '', 'null']
+
+
+class PathResolver:
+    def __init__(self, roots, max_entries=CACHE_ENTRIES):
+        self.roots = [str(r) for r in roots]
+        self.max_entries = max_entries
+        self._hits = collections.OrderedDict() # stored path -> (absolute path, details)
+        self._lock = threading.Lock()
+
+    def resolve(self, path_str, verify=True):
+        """
+        (absolute_path, exists_bool, details_str) for a stored evidence path.
+        Only hits are cached (a missing file may be backfilled later). With
+        verify=False a cached hit is returned without touching the disk; the
+        caller is expected to stat it and forget() it if it has gone.
+        """
+        if is_empty(path_str):
+            return None, False, "Path is Empty/None"
+        key = str(path_str)
+        with self._lock:
+            hit = self._hits.get(key)
+            if hit is not None:
+                self._hits.move_to_end(key)
+        if hit is not None:
+            if not verify or os.path.exists(hit[0]):
+                return hit[0], True, hit[1]
+            self.forget(key)
+
+        found = self._probe(key)
+        if found is None:
+            return os.path.abspath(os.path.join(self.roots[0], key)), False, "File Not Found"
+        with self._lock:
+            self._hits[key] = found
+            if len(self._hits) > self.max_entries:
+                self._hits.popitem(last=False)
+        return found[0], True, found[1]
+
+    def _probe(self, path_str):
+        if os.path.isabs(path_str):
+            return (path_str, "OK (Absolute)") if os.path.exists(path_str) else None
+        for root in self.roots:
+            candidate = os.path.abspath(os.path.join(root, path_str))
+            if os.path.exists(candidate):
+                return candidate, f"OK ({root})"
+        return None
+
+    def forget(self, path_str):
+        with self._lock:
+            self._hits.pop(str(path_str), None)
@@ -2,11 +2,17 @@ import os
 import requests
 import logging
 import hashlib
+import time
 import config
 import numpy as np
 import matplotlib.pyplot as plt
 from .sonifier import Sonifier
 from .gamification import GamificationManager
+from modules import tracing
+from modules import metrics
+from modules import throttle
+
+_dl_bytes = metrics.DOWNLOAD_BYTES.labels("RADIO")
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - HEAVY_GRANULAR - %(message)s')
 
@@ -16,9 +22,10 @@ class HeavyHarvester:
         self.game = GamificationManager()
         if not os.path.exists(config.DIR_TEMP): os.makedirs(config.DIR_TEMP)
 
-    def download_granular(self, url):
+    def download_granular(self, url, cancel=None):
         """
         Retorna (path, sha256, size_bytes)
+        cancel: optional threading.Event; when set the transfer aborts and the partial file is removed.
         """
         filename = os.path.basename(url)
         if not filename.endswith(('.h5', '.fil')): filename += ".h5"
@@ -28,14 +35,22 @@ class HeavyHarvester:
             # Backoff simple logic handled by pipeline retries usually, 
             # here we do direct download with timeout
             hash_sha256 = hashlib.sha256()
+            t_hash = 0.0 # Hashing is interleaved with the transfer; time it separately
             with requests.get(url, stream=True, timeout=30, headers={'User-Agent': config.USER_AGENTS[0]}) as r:
                 r.raise_for_status()
                 with open(path, 'wb') as f:
                     for chunk in r.iter_content(chunk_size=8192):
+                        if cancel is not None and cancel.is_set():
+                            raise InterruptedError("download cancelled")
+                        throttle.BANDWIDTH.consume(len(chunk), cancel)
                         f.write(chunk)
+                        t0 = time.perf_counter()
                         hash_sha256.update(chunk)
+                        t_hash += time.perf_counter() - t0
                         
+            tracing.record("hash", t_hash)
             size = os.path.getsize(path)
+            _dl_bytes.inc(size)
             # XP Gain for bandwidth
             self.game.add_xp(mb=size/(1024*1024)) 
             return path, hash_sha256.hexdigest(), size
@@ -63,10 +78,12 @@ class HeavyHarvester:
                 score = min(100, snr * 2)
             
             # 3. Generar Evidencia (Zero Waste)
-            evidence = self._generate_evidence(path, label)
+            with tracing.span("evidence"):
+                evidence = self._generate_evidence(path, label)
             
             # 4. Audio
-            audio_raw, audio_clean = self.sonifier.sonify(np.linspace(0,1,100), [], [], os.path.basename(path).split('.')[0])
+            with tracing.span("sonify"):
+                audio_raw, audio_clean = self.sonifier.sonify(np.linspace(0,1,100), [], [], os.path.basename(path).split('.')[0])
             
             # 5. XP
             if label == "CANDIDATE": self.game.add_xp(findings=1)
@@ -7,13 +7,18 @@ import random
 import numpy as np
 import matplotlib.pyplot as plt
 from .gamification import GamificationManager
+from modules import tracing
+from modules import metrics
+from modules import throttle
+
+_dl_bytes = metrics.DOWNLOAD_BYTES.labels("IMAGE")
 
 class ImageHarvester:
     def __init__(self):
         self.game = GamificationManager()
         if not os.path.exists(config.DIR_TEMP): os.makedirs(config.DIR_TEMP)
 
-    def download_granular(self, url):
+    def download_granular(self, url, cancel=None):
         filename = f"img_{random.randint(1000,9999)}.fits" # Mock name for robustness if parsing fails
         path = os.path.join(config.DIR_TEMP, filename)
         
@@ -32,10 +37,14 @@ class ImageHarvester:
                     r.raise_for_status()
                     with open(path, 'wb') as f:
                         for chunk in r.iter_content(chunk_size=8192):
+                            if cancel is not None and cancel.is_set():
+                                raise InterruptedError("download cancelled")
+                            throttle.BANDWIDTH.consume(len(chunk), cancel)
                             f.write(chunk)
                             hash_sha256.update(chunk)
                  size = os.path.getsize(path)
             
+            _dl_bytes.inc(size)
             self.game.add_xp(mb=size/(1024*1024))
             return path, hash_sha256.hexdigest(), size
         except Exception as e:
@@ -104,7 +113,8 @@ class ImageHarvester:
                     label = "VISUAL_SOURCE" if score > 70 else "NOISE"
 
             # Evidence
-            annotated_path = self._generate_evidence(path, label)
+            with tracing.span("evidence"):
+                annotated_path = self._generate_evidence(path, label)
             
             if label != "NOISE": self.game.add_xp(findings=1)
             
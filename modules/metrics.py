@@ -0,0 +1,210 @@
+"""
+In-process metrics registry (counters, gauges, histograms) rendered in the
+Prometheus text exposition format.
+
+The daemon owns the registry; TelemetryMonitor writes it to METRICS_FILE every
+tick and the API serves that file on /metrics (textfile-collector style, since
+the API runs in a separate process).
+
+Hot path: resolve the labelled child once and keep it, e.g.
+    _dl_bytes = metrics.DOWNLOAD_BYTES.labels("RADIO")
+    _dl_bytes.inc(size)
+inc()/observe() are a lock plus an add (a few hundred ns in CPython).
+"""
+import os
+import math
+import bisect
+import threading
+import config
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _escape(v):
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt(v):
+    if v == math.inf: return "+Inf"
+    if isinstance(v, float) and v.is_integer(): return str(int(v))
+    return repr(v) if isinstance(v, float) else str(v)
+
+
+def _labelstr(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra: pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _CounterChild:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, n=1):
+        with self._lock:
+            self.value += n
+
+
+class _GaugeChild(_CounterChild):
+    __slots__ = ()
+
+    def set(self, v):
+        self.value = v # Single store, atomic under the GIL
+
+    def dec(self, n=1):
+        self.inc(-n)
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1) # last slot = +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, v):
+        i = bisect.bisect_left(self.bounds, v)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += v
+
+
+class _Metric:
+    kind = None
+    child_cls = None
+
+    def __init__(self, name, doc, labelnames=()):
+        self.name = name
+        self.doc = doc
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        return self.child_cls()
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    # Unlabelled shortcuts
+    def inc(self, n=1):
+        self.labels().inc(n)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            lines.append(f"{self.name}{_labelstr(self.labelnames, values)} {_fmt(child.value)}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+    child_cls = _CounterChild
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+    child_cls = _GaugeChild
+
+    def set(self, v):
+        self.labels().set(v)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, doc, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, doc, labelnames)
+        self.bounds = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.bounds)
+
+    def observe(self, v):
+        self.labels().observe(v)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.doc}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            acc = 0
+            for bound, n in zip(self.bounds + (math.inf,), counts):
+                acc += n
+                le = 'le="%s"' % _fmt(float(bound))
+                lines.append(f"{self.name}_bucket{_labelstr(self.labelnames, values, le)} {acc}")
+            lines.append(f"{self.name}_sum{_labelstr(self.labelnames, values)} {_fmt(total)}")
+            lines.append(f"{self.name}_count{_labelstr(self.labelnames, values)} {acc}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing # Module reloads / repeated imports share the series
+            self._metrics[metric.name] = metric
+            return metric
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for m in metrics:
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path=None):
+        """Atomic write (temp -> rename) so the API never serves a half-written scrape."""
+        path = path or config.METRICS_FILE
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, 'w') as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+
+REGISTRY = Registry()
+
+
+def counter(name, doc, labelnames=()):
+    return REGISTRY.register(Counter(name, doc, labelnames))
+
+
+def gauge(name, doc, labelnames=()):
+    return REGISTRY.register(Gauge(name, doc, labelnames))
+
+
+def histogram(name, doc, labelnames=(), buckets=DEFAULT_BUCKETS):
+    return REGISTRY.register(Histogram(name, doc, labelnames, buckets))
+
+
+# --- OmniSky series ---
+JOBS = counter("omnisky_jobs_total", "Jobs leaving a pipeline stage, by outcome", ("stage", "outcome"))
+STAGE_SECONDS = histogram("omnisky_stage_seconds", "Time spent per pipeline stage (tracing spans)", ("stage",))
+QUEUE_DEPTH = gauge("omnisky_queue_depth", "Jobs held by each stage", ("stage", "state"))
+POOL_WORKERS = gauge("omnisky_pool_workers", "Worker pool size and busy workers", ("pool", "state"))
+DOWNLOAD_BYTES = counter("omnisky_download_bytes_total", "Bytes downloaded by the harvesters", ("kind",))
+DB_WRITES = counter("omnisky_db_writes_total", "Database writes by operation", ("op",))
+DB_WRITE_SECONDS = histogram("omnisky_db_write_seconds", "Database write latency by operation", ("op",),
+                             buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1))
+TEMP_CACHE_BYTES = gauge("omnisky_temp_cache_bytes", "TEMP_CACHE usage", ("kind",))
+NET_MBPS = gauge("omnisky_network_mbps", "Host network throughput", ("direction",))
+HOST_UTIL = gauge("omnisky_host_utilization_percent", "Host CPU/RAM utilisation seen by DaemonControl", ("resource",))
+DAEMON_PAUSED = gauge("omnisky_daemon_paused", "1 while DaemonControl holds the daemon paused")
+THROTTLE_LEVEL = gauge("omnisky_throttle_level", "Background load level set by the throttle (1 = full speed)")
+DAEMON_CONTROL_SECONDS = gauge("omnisky_daemon_control_seconds", "Resource monitoring cost: last background sample / daemon-loop check", ("phase",))
@@ -1,9 +1,15 @@
 import json
 import os
 import time
+import gzip
+import glob
+import shutil
+import atexit
 import threading
 import logging
+import collections
 import config
+from modules import event_log
 
 # Paths
 OBS_DIR = os.path.join(config.OMNISKY_ROOT, "OBS")
@@ -17,10 +23,16 @@ if not os.path.exists(OBS_DIR):
 class Observability:
     """
     Handles Live Observability via atomic JSON files.
+
+    log_event/update_status only touch memory: events go to a bounded deque and
+    status changes are merged into current_status. A background writer thread
+    batches events into event_log.jsonl (kept open), rewrites status.json at most
+    every OBS_STATUS_MIN_INTERVAL_SEC and rotates the log (gzip) by size or age.
+    Pipeline threads never wait on disk. flush() forces everything out (atexit too).
     """
     _status_lock = threading.Lock()
-    _log_lock = threading.Lock()
-    
+    _log_lock = threading.Lock() # Writer side: file handle, rotation
+
     # Defaults
     current_status = {
         "ts": None,
@@ -30,10 +42,23 @@ class Observability:
         "counters": {}
     }
 
+    _pending = collections.deque(maxlen=config.OBS_QUEUE_MAX) # (serialized line, ts, artifact_id)
+    _dropped = 0
+    _status_dirty = False
+    _status_written_at = 0.0
+    _wake = threading.Event()
+    _writer = None
+    _start_lock = threading.Lock()
+    _fh = None
+    _log_opened_at = 0.0
+    _index = event_log.IndexWriter(EVENT_LOG_FILE) # Sparse ts/artifact -> offset sidecar
+
+    # --- Producer side (any thread, no disk I/O) ---
+
     @staticmethod
     def update_status(updates):
         """
-        Updates the in-memory status and writes to disk atomically.
+        Merges updates into the in-memory status; the writer persists it (coalesced).
         updates: dict with keys to merge into current_status
         """
         with Observability._status_lock:
@@ -43,42 +68,169 @@ class Observability:
                      Observability.current_status[k].update(v)
                 else:
                     Observability.current_status[k] = v
-            
+
             Observability.current_status["ts"] = time.strftime("%Y-%m-%dT%H:%M:%S")
-            
-            # Atomic Write (Write temp -> Rename)
-            tmp_file = STATUS_FILE + ".tmp"
-            try:
-                with open(tmp_file, 'w') as f:
-                    json.dump(Observability.current_status, f)
-                os.replace(tmp_file, STATUS_FILE)
-            except Exception as e:
-                logging.error(f"OBS Status Write Error: {e}")
+            Observability._status_dirty = True
+        Observability._ensure_writer()
 
     @staticmethod
     def log_event(event_type, **kwargs):
         """
-        Appends an event to the JSONL log.
+        Queues an event for the JSONL log.
         """
         entry = {
             "ts": time.strftime("%Y-%m-%dT%H:%M:%S"),
             "event": event_type,
             **kwargs
         }
-        
+
         # Console output for debugging
         # logging.info(f"OBS: {event_type} - {kwargs}")
-        
-        with Observability._log_lock:
+
+        q = Observability._pending
+        if len(q) == q.maxlen:
+            Observability._dropped += 1 # deque drops the oldest; count it
+        q.append((json.dumps(entry, default=str), entry["ts"], kwargs.get("artifact_id")))
+        if len(q) >= config.OBS_BATCH_SIZE:
+            Observability._wake.set()
+        Observability._ensure_writer()
+
+    # --- Writer side ---
+
+    @staticmethod
+    def _ensure_writer():
+        if Observability._writer is not None: return
+        with Observability._start_lock:
+            if Observability._writer is not None: return
+            t = threading.Thread(target=Observability._writer_loop, name="obs-writer", daemon=True)
+            Observability._writer = t
+            t.start()
+            atexit.register(Observability.flush)
+
+    @staticmethod
+    def _writer_loop():
+        while True:
+            Observability._wake.wait(config.OBS_FLUSH_INTERVAL_SEC)
+            Observability._wake.clear()
             try:
-                with open(EVENT_LOG_FILE, 'a') as f:
-                    f.write(json.dumps(entry) + "\n")
+                Observability._drain(force_status=False)
             except Exception as e:
-                logging.error(f"OBS Log Write Error: {e}")
+                logging.error(f"OBS Writer Error: {e}")
+
+    @staticmethod
+    def flush():
+        """Writes all queued events and the latest status now (blocking)."""
+        if Observability._writer is None: return
+        Observability._drain(force_status=True)
+
+    @staticmethod
+    def _drain(force_status):
+        with Observability._log_lock:
+            q = Observability._pending
+            lines = []
+            while q:
+                try:
+                    lines.append(q.popleft())
+                except IndexError:
+                    break
+            if Observability._dropped:
+                ts = time.strftime("%Y-%m-%dT%H:%M:%S")
+                lines.append((json.dumps({"ts": ts, "event": "OBS_DROPPED", "count": Observability._dropped}), ts, None))
+                Observability._dropped = 0
+            if lines:
+                Observability._write_lines(lines)
+
+            now = time.time()
+            if Observability._status_dirty and (force_status or
+                    now - Observability._status_written_at >= config.OBS_STATUS_MIN_INTERVAL_SEC):
+                Observability._write_status()
+                Observability._status_written_at = now
+
+    @staticmethod
+    def _write_lines(lines):
+        try:
+            if Observability._fh is None:
+                Observability._open_log()
+            fh = Observability._fh
+            off = fh.tell()
+            fh.write(("\n".join(line for line, _, _ in lines) + "\n").encode('utf-8'))
+            fh.flush()
+            # json.dumps output is ASCII, so len() is the byte length
+            for line, ts, art in lines:
+                Observability._index.note(off, len(line) + 1, ts, art)
+                off += len(line) + 1
+            Observability._maybe_rotate()
+        except Exception as e:
+            logging.error(f"OBS Log Write Error: {e}")
+            Observability._fh = None
+
+    @staticmethod
+    def _open_log():
+        Observability._fh = open(EVENT_LOG_FILE, 'ab')
+        size = Observability._fh.tell()
+        if size and event_log.indexed_until(EVENT_LOG_FILE) != size:
+            # Log written before the sidecar existed (or by a crashed writer): index it once
+            event_log.build_index(EVENT_LOG_FILE)
+        try:
+            with open(EVENT_LOG_FILE, 'r', encoding='utf-8') as f:
+                first = f.readline()
+            # Age counts from the first event in the file, so restarts don't postpone rotation forever
+            Observability._log_opened_at = time.mktime(time.strptime(json.loads(first)["ts"], "%Y-%m-%dT%H:%M:%S")) if first else time.time()
+        except Exception:
+            Observability._log_opened_at = time.time()
+
+    @staticmethod
+    def _maybe_rotate():
+        fh = Observability._fh
+        too_big = fh.tell() >= config.OBS_LOG_MAX_MB * 1024 * 1024
+        too_old = time.time() - Observability._log_opened_at >= config.OBS_LOG_MAX_AGE_HOURS * 3600
+        if not (too_big or too_old): return
+        fh.close()
+        Observability._fh = None
+        rotated = os.path.join(OBS_DIR, f"event_log.{time.strftime('%Y%m%d-%H%M%S')}.jsonl")
+        os.replace(EVENT_LOG_FILE, rotated)
+        # The sidecar indexes offsets of the live file only; archives are gzipped anyway
+        Observability._index.discard()
+        try: os.remove(event_log.index_path(EVENT_LOG_FILE))
+        except OSError: pass
+        Observability._open_log()
+        # Compress off the writer thread so a large gzip never delays the next batch
+        threading.Thread(target=Observability._compress, args=(rotated,), daemon=True).start()
+
+    @staticmethod
+    def _compress(path):
+        try:
+            with open(path, 'rb') as src, gzip.open(path + ".gz", 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(path)
+        except Exception as e:
+            logging.error(f"OBS Log Compress Error: {e}")
+            return
+        archives = sorted(glob.glob(os.path.join(OBS_DIR, "event_log.*.jsonl.gz")))
+        for old in archives[:-config.OBS_LOG_KEEP]:
+            try: os.remove(old)
+            except OSError: pass
+
+    @staticmethod
+    def _write_status():
+        with Observability._status_lock:
+            payload = json.dumps(Observability.current_status, default=str)
+            Observability._status_dirty = False
+        # Atomic Write (Write temp -> Rename)
+        tmp_file = STATUS_FILE + ".tmp"
+        try:
+            with open(tmp_file, 'w') as f:
+                f.write(payload)
+            os.replace(tmp_file, STATUS_FILE)
+        except Exception as e:
+            logging.error(f"OBS Status Write Error: {e}")
+
+    # --- Readers ---
 
     @staticmethod
     def get_status():
         """Reads status.json safely."""
+        Observability.flush() # No-op unless this process is also the writer
         if not os.path.exists(STATUS_FILE): return {}
         try:
             with open(STATUS_FILE, 'r') as f:
@@ -87,23 +239,12 @@ class Observability:
 
     @staticmethod
     def get_recent_events(limit=50):
-        """Reads start of event_log.jsonl (or tail if implemented efficiently, here simple readlines)"""
-        if not os.path.exists(EVENT_LOG_FILE): return []
-        events = []
-        try:
-            # Read last N lines involves seeking, but for simplicity read all and slice logic
-            # OR better: read line by line storing generic ring buffer
-            # Since files might be big, we use 'tail' logic
-            with open(EVENT_LOG_FILE, 'rb') as f:
-                f.seek(0, os.SEEK_END)
-                pos = f.tell()
-                lines = []
-                # Simple tail logic: read blocks backwards
-                # For MVP just read lines if small, or use `deque`
-                pass
-            
-            # Simple fallback for MVP usage
-            with open(EVENT_LOG_FILE, 'r') as f:
-                lines = f.readlines()
-                return [json.loads(l) for l in lines[-limit:]][::-1]
-        except: return []
+        """Newest first. Reads event_log.jsonl backwards block by block (cost ~ limit, not file size)."""
+        Observability.flush()
+        return event_log.tail(EVENT_LOG_FILE, limit)[::-1]
+
+    @staticmethod
+    def query_events(start=None, end=None, artifact_id=None, event=None, limit=1000):
+        """Events in [start, end] (ISO ts) and/or for one artifact, via the sparse sidecar index."""
+        Observability.flush()
+        return event_log.query(EVENT_LOG_FILE, start, end, artifact_id, limit, event)
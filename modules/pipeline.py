@@ -1,139 +1,478 @@
+import os
+import json
 import queue
 import threading
 import time
 import logging
-import concurrent.futures
 import config
 from .database_manager import DatabaseManager
 from modules.obs import Observability
-from modules.triage import TriageEngine
+from modules.triage import TriageEngine, TriageBatcher
 from modules.deduplication import DeduplicationEngine
+from modules.sky_coverage import SkyCoverage
+from modules.scheduler import Job, JobScheduler, resolve_priority
+from modules.sources.base import Target
+from modules.worker_pool import ElasticPool
+from modules.disk_budget import DiskBudget, content_length
+from modules import tracing
+from modules import metrics
+from modules.autoscaler import PoolAutoscaler
+from modules.telemetry import TelemetryMonitor
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - PIPELINE - %(message)s')
 
 
 class PipelineManager:
-    def __init__(self, heavy_harvester, image_harvester):
+    def __init__(self, heavy_harvester, image_harvester, temp_dir=None):
         self.db = DatabaseManager()
         self.heavy = heavy_harvester
         self.image = image_harvester
-        self.triage = TriageEngine()
+        self.triage = TriageBatcher(TriageEngine(), self.db) # ML scores for persisted events, in batches
+        self.coverage = SkyCoverage("VLASS")
         
-        # Queues
-        self.q_download = queue.Queue(maxsize=config.QUEUE_SIZE * 2)
-        self.q_analyze = queue.Queue(maxsize=config.QUEUE_SIZE)
-        self.q_persist = queue.Queue(maxsize=config.QUEUE_SIZE)
+        # Queues (priority + aging + per-source fairness, see modules/scheduler.py)
+        self.q_download = JobScheduler(maxsize=config.QUEUE_SIZE * 2)
+        self.q_analyze = JobScheduler(maxsize=config.QUEUE_SIZE)
+        self.q_persist = JobScheduler(maxsize=config.QUEUE_SIZE)
         
-        # ThreadPools
-        self.pool_download = concurrent.futures.ThreadPoolExecutor(max_workers=config.MAX_DOWNLOAD_WORKERS, thread_name_prefix="DL")
-        self.pool_analyze = concurrent.futures.ThreadPoolExecutor(max_workers=config.MAX_ANALYZE_WORKERS, thread_name_prefix="AN")
+        # Worker Pools: pull from the schedulers only when a worker is free (resizable)
+        self.pool_download = ElasticPool("DL", self.q_download, self._task_download,
+                                         size=config.MAX_DOWNLOAD_WORKERS,
+                                         min_size=config.MIN_DOWNLOAD_WORKERS, max_size=config.MAX_DOWNLOAD_WORKERS)
+        self.pool_analyze = ElasticPool("AN", self.q_analyze, self._task_analyze,
+                                        size=config.MAX_ANALYZE_WORKERS,
+                                        min_size=config.MIN_ANALYZE_WORKERS, max_size=config.MAX_ANALYZE_WORKERS)
+        self.telemetry = TelemetryMonitor(self)
+        self.autoscaler = PoolAutoscaler(self)
+
+        # Backpressure: raw files in TEMP_CACHE (count + byte budget) and blocked DL workers
+        self._resident = threading.BoundedSemaphore(config.MAX_RESIDENT_ARTIFACTS)
+        self.disk = DiskBudget(root=temp_dir) # Default: config.DIR_TEMP, where the harvesters download
+        self._admission_waiting = 0
+        self._resident_files = 0 # Slots of _resident held (jobs with job.resident)
+        self._persisting = 0
+        self._acct_lock = threading.Lock()
+
+        # Lifecycle: intake gate, pause gate, cancel flag for in-flight downloads
+        self.accepting = True
+        self.paused = False
+        self._cancel = threading.Event()
+        self._stranded = [] # Interrupted DL jobs waiting for resume() or the shutdown checkpoint
+        self._persist_thread = None
         
         self.running = True
+        self.on_job_done = None # Optional callback(job), e.g. benchmarks measuring time-to-result
         
         # Start consumers
         threading.Thread(target=self._worker_dispatcher, daemon=True).start()
 
-    def submit_job(self, url, job_type="RADIO"):
+    def submit_task(self, target, priority=None):
         """
-        Entry point: Add URL to Download Queue.
+        Entry point: Add a Target (as built by DataSource.discover) to the Download Queue.
+        priority: class name/int; defaults to target.metadata['priority'] or NORMAL.
         BLOCKS if queue is full (Backpressure).
-        Returns True if queued, False if timeout/error.
+        Returns True if queued, False if timeout/error or the pipeline is shutting down.
         """
+        if not self.accepting:
+            return False
+        if priority is None:
+            priority = (target.metadata or {}).get("priority")
+        job = Job(target=target, priority=resolve_priority(priority))
         try:
             # Blocking PUT with timeout to allow checking shutdown flag
             # 5 second timeout to allow main loop to check other things if block persists
-            self.q_download.put((url, job_type), block=True, timeout=5)
-            # logging.info(f"Job queued: {url}")
+            self.q_download.put(job, block=True, timeout=5)
             return True
         except queue.Full:
             # Backpressure hit
-            # logging.warning("⚠️ Backpressure: Queue Full. Waiting...")
             return False
+
+    def submit_job(self, url, job_type="RADIO", priority=None):
+        """Legacy entry point for bare URLs (verify scripts, manual backfills)."""
+        name = url.split('/')[-1]
+        target = Target(url=url, kind=job_type, object_name=name.split('.')[0], dataset="MANUAL", metadata={})
+        return self.submit_task(target, priority)
             
     def _worker_dispatcher(self):
         """Standard Worker Pool Logic is handled by Consumers below."""
         pass
 
-    def start(self):
-        # Start Consumers dedicated threads that feed the pools
-        threading.Thread(target=self._consume_download, daemon=True).start()
-        threading.Thread(target=self._consume_analyze, daemon=True).start()
-        threading.Thread(target=self._consume_persist, daemon=True).start()
+    def start(self, recover=True, sweep=True):
+        """
+        recover: requeue the checkpoint file and unfinished artifacts of the last run (consumes the file).
+        sweep: delete files no job owns in this pipeline's TEMP_CACHE (self.disk.root); needs recover,
+        which claims the raw files of recovered analyses.
+        Only the process that owns that state (the daemon) should do either; tools pass False.
+        """
+        to_download, to_analyze = self._recover() if recover else ([], [])
+        if recover and sweep:
+            # Nothing is in flight yet, so anything else left in TEMP_CACHE belongs to a dead process
+            self.disk.sweep_orphans(keep=[j.path for j in to_analyze])
+        # DL/AN pools pull from their queues; persist keeps a dedicated thread
+        self.pool_download.start()
+        self.pool_analyze.start()
+        self._persist_thread = threading.Thread(target=self._consume_persist, daemon=True)
+        self._persist_thread.start()
+        self.telemetry.start()
+        self.triage.start()
+        if config.AUTOSCALE_ENABLED:
+            self.autoscaler.start()
+        if to_download or to_analyze:
+            # Queues are bounded: feed recovered work from a thread instead of blocking start()
+            threading.Thread(target=self._requeue_recovered, args=(to_download, to_analyze), daemon=True).start()
         logging.info("🚀 Pipeline Started: Download -> Analyze -> Persist")
 
-    def _consume_download(self):
-        while self.running:
-            url, jtype = self.q_download.get()
-            self.pool_download.submit(self._task_download, url, jtype)
-            self.q_download.task_done()
+    def stop(self):
+        """Stops workers after their current job (does not drain queues). See shutdown()."""
+        self.running = False
+        self.accepting = False
+        self.autoscaler.stop()
+        self.pool_download.stop()
+        self.pool_analyze.stop()
+        self.telemetry.stop()
+        self.triage.stop()
 
-    def _consume_analyze(self):
-        while self.running:
-            artifact_id, jtype = self.q_analyze.get()
-            self.pool_analyze.submit(self._task_analyze, artifact_id, jtype)
+    # --- LIFECYCLE ---
+
+    def pause(self, finish_current=None):
+        """
+        Stops handing out jobs. With finish_current (default FINISH_CURRENT_JOB_ON_PAUSE)
+        in-flight jobs complete; otherwise running downloads are cancelled and re-queued
+        on resume(). A running analysis always completes (it cannot be interrupted safely).
+        """
+        if finish_current is None:
+            finish_current = config.FINISH_CURRENT_JOB_ON_PAUSE
+        if self.paused: return
+        self.paused = True
+        self.pool_download.pause()
+        self.pool_analyze.pause()
+        if not finish_current:
+            self._cancel.set()
+        Observability.log_event("PIPELINE_PAUSE", finish_current=finish_current, pending=self.pending())
+
+    def resume(self):
+        if not self.paused: return
+        self._cancel.clear()
+        with self._acct_lock:
+            stranded, self._stranded = self._stranded, []
+        self.paused = False
+        self.pool_analyze.resume()
+        self.pool_download.resume()
+        for job in stranded:
+            self.q_download.put(job)
+        Observability.log_event("PIPELINE_RESUME", requeued=len(stranded))
+
+    def _wait_until(self, predicate, deadline):
+        while time.monotonic() < deadline:
+            if predicate(): return True
+            time.sleep(0.2)
+        return predicate()
+
+    def shutdown(self, deadline=None):
+        """
+        Graceful stop:
+          1. Stop intake and stop starting downloads
+          2. Let in-flight downloads, analysis and persistence drain for `deadline` seconds
+          3. Past the deadline cancel downloads and stop starting analyses (SHUTDOWN_GRACE_SECONDS)
+          4. Flush the persist queue, then checkpoint what is left:
+             queued/interrupted downloads -> PIPELINE_CHECKPOINT_FILE,
+             downloaded but unanalyzed artifacts -> status CHECKPOINTED (raw file kept)
+        start() on the next run picks all of it up again.
+        """
+        deadline = config.SHUTDOWN_DRAIN_SECONDS if deadline is None else deadline
+        t0 = time.monotonic()
+        logging.info(f"🛑 Pipeline shutdown: draining in-flight jobs (deadline {deadline}s)")
+        Observability.log_event("SHUTDOWN_BEGIN", deadline=deadline, pending=self.pending())
+        self.accepting = False
+        self.autoscaler.stop()
+        self.pool_download.pause()
+
+        def downstream_idle():
+            p = self.pending()
+            return (p["download"]["active"] == 0 and p["analyze"]["queued"] == 0 and p["analyze"]["active"] == 0
+                    and p["persist"]["queued"] == 0 and p["persist"]["active"] == 0)
+
+        drained = self._wait_until(downstream_idle, t0 + deadline)
+        if not drained:
+            logging.warning("⏱️ Drain deadline reached: cancelling downloads, checkpointing the rest")
+            self._cancel.set()
+            self.pool_analyze.pause()
+            self._wait_until(lambda: self.pool_download.busy == 0 and self.pool_analyze.busy == 0 and self.q_persist.empty()
+                             and not self._persisting, time.monotonic() + config.SHUTDOWN_GRACE_SECONDS)
+
+        self.running = False
+        self.pool_download.stop()
+        self.pool_analyze.stop()
+        self.telemetry.stop()
+        if self._persist_thread:
+            self._persist_thread.join(timeout=5)
+
+        # Flush the persistence writer: results already computed must reach the DB
+        flushed = 0
+        while True:
+            try:
+                job = self.q_persist.get(block=False)
+            except queue.Empty:
+                break
+            self._task_persist(job)
+            self.q_persist.task_done()
+            flushed += 1
+        self.triage.stop() # Triage what was just persisted
+
+        checkpointed = 0
+        while True:
+            try:
+                job = self.q_analyze.get(block=False)
+            except queue.Empty:
+                break
+            self.db.update_artifact_status(job.artifact_id, "CHECKPOINTED", job.path)
+            self._release(job)
             self.q_analyze.task_done()
+            checkpointed += 1
+
+        with self._acct_lock:
+            leftovers, self._stranded = self._stranded, []
+        while True:
+            try:
+                leftovers.append(self.q_download.get(block=False))
+                self.q_download.task_done()
+            except queue.Empty:
+                break
+        self._write_checkpoint(leftovers)
+
+        summary = {"drained": drained, "elapsed_s": round(time.monotonic() - t0, 1), "persist_flushed": flushed,
+                   "analyze_checkpointed": checkpointed, "download_checkpointed": len(leftovers),
+                   "still_running": self.pool_analyze.busy}
+        Observability.log_event("SHUTDOWN_DONE", **summary)
+        Observability.flush()
+        logging.info(f"🛑 Pipeline stopped: {summary}")
+        return summary
+
+    def _write_checkpoint(self, jobs):
+        """Queued download jobs have no DB row yet (or keep their id if interrupted); park them on disk."""
+        path = config.PIPELINE_CHECKPOINT_FILE
+        if not jobs:
+            if os.path.exists(path): os.remove(path)
+            return
+        rows = [{"url": j.url, "kind": j.kind, "object_name": j.target.object_name, "dataset": j.target.dataset,
+                 "metadata": j.target.metadata, "priority": j.priority, "artifact_id": j.artifact_id} for j in jobs]
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".tmp", 'w') as f:
+            json.dump(rows, f, default=str)
+        os.replace(path + ".tmp", path)
+
+    def _recover(self):
+        """
+        Rebuilds unfinished work from the last run: the download checkpoint file plus
+        artifacts left mid-pipeline (clean shutdown or crash).
+        Returns (download_jobs, analyze_jobs).
+        """
+        to_download, to_analyze = [], []
+        path = config.PIPELINE_CHECKPOINT_FILE
+        claimed = set()
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    for row in json.load(f):
+                        target = Target(row["url"], row["kind"], row["object_name"], row["dataset"], row.get("metadata") or {})
+                        to_download.append(Job(target=target, priority=row.get("priority", 2), artifact_id=row.get("artifact_id")))
+                        claimed.add(row.get("artifact_id"))
+            except Exception as e:
+                logging.error(f"Checkpoint unreadable, ignoring: {e}")
+            os.remove(path)
+
+        for art_id, url, filename, status, dl_path in self.db.get_unfinished_artifacts():
+            if art_id in claimed: continue
+            name = filename or url.split('/')[-1]
+            kind = "IMAGE" if name.lower().endswith(".fits") else "RADIO"
+            target = Target(url, kind, name.split('.')[0], "RECOVERED", {})
+            job = Job(target=target, priority=resolve_priority("BACKFILL"), artifact_id=art_id)
+            if status in ("DOWNLOADED", "ANALYZING", "CHECKPOINTED") and dl_path and os.path.exists(dl_path):
+                job.path = dl_path
+                to_analyze.append(job)
+            else:
+                # Never finished downloading (or the raw file is gone): fetch again under the same row
+                self.db.update_artifact_status(art_id, "INTERRUPTED")
+                to_download.append(job)
+
+        if to_download or to_analyze:
+            logging.info(f"♻️ Recovering {len(to_download)} downloads and {len(to_analyze)} analyses from last run")
+            Observability.log_event("RECOVERY", downloads=len(to_download), analyses=len(to_analyze))
+        return to_download, to_analyze
+
+    def _requeue_recovered(self, to_download, to_analyze):
+        for job in to_analyze:
+            # The raw file is already in TEMP_CACHE: hold a slot and count its bytes, no admission checks
+            while self.running and not self._resident.acquire(timeout=1):
+                pass
+            if not self.running: return
+            with self._acct_lock:
+                job.resident = True
+                self._resident_files += 1
+            job.disk_bytes = os.path.getsize(job.path)
+            self.disk.track(job.seq, job.disk_bytes)
+            self.q_analyze.put(job)
+        for job in to_download:
+            if not self.running: return
+            self.q_download.put(job)
+
+    def _interrupted(self, job):
+        """A download cancelled by pause/shutdown: keep the job so resume() or the checkpoint can redo it."""
+        with self._acct_lock:
+            self._stranded.append(job)
             
     def _consume_persist(self):
         while self.running:
             # Persist is fast (DB write), maybe single thread is enough or small pool
             # For now, simply execute inline
-            data = self.q_persist.get()
-            self._task_persist(data)
-            self.q_persist.task_done()
+            try:
+                job = self.q_persist.get(timeout=1)
+            except queue.Empty:
+                continue
+            self._persisting = 1
+            try:
+                self._task_persist(job)
+            finally:
+                self._persisting = 0
+                self.q_persist.task_done()
+
+    # --- BACKPRESSURE / ACCOUNTING ---
+
+    def _admit(self, job):
+        """
+        Blocks the DL worker until the job may put a raw file in TEMP_CACHE:
+        a resident slot is free (MAX_RESIDENT_ARTIFACTS) and DiskBudget accepts its
+        expected size (Content-Length). Returns False if the pipeline stops or cancels.
+        """
+        expected = (job.target.metadata or {}).get("size_bytes") or content_length(job.url)
+        with self._acct_lock:
+            self._admission_waiting += 1
+        warned = False
+        try:
+            while self.running and not self._cancel.is_set():
+                if self.paused:
+                    # Not started yet, so it is not a "current job" that pause lets finish
+                    time.sleep(1)
+                    continue
+                if not self._resident.acquire(timeout=1):
+                    continue
+                if self.disk.reserve(job.seq, expected):
+                    with self._acct_lock:
+                        job.resident, job.disk_bytes = True, expected
+                        self._resident_files += 1
+                    return True
+                self._resident.release()
+                if not warned:
+                    Observability.log_event("DISK_BACKPRESSURE", url=job.url, expected=expected,
+                                            reserved_bytes=self.disk.reserved(), paused=self.disk.paused)
+                    warned = True
+                time.sleep(1)
+            return False
+        finally:
+            with self._acct_lock:
+                self._admission_waiting -= 1
+
+    def _account(self, job, actual_bytes):
+        """Replaces the admitted estimate with the real on-disk size."""
+        job.disk_bytes = actual_bytes or 0
+        self.disk.settle(job.seq, job.disk_bytes)
+
+    def _release(self, job):
+        """Returns the job's TEMP_CACHE slot and reservation (idempotent). Call once its raw file is gone."""
+        with self._acct_lock:
+            if not job.resident: return
+            job.resident = False
+            self._resident_files -= 1
+        self.disk.release(job.seq)
+        self._resident.release()
+
+    def pending(self):
+        """Jobs per stage: queued (waiting for a worker) and active (held by a worker)."""
+        return {
+            "download": {"queued": self.q_download.qsize(), "active": self.pool_download.busy,
+                         "admission_wait": self._admission_waiting},
+            "analyze": {"queued": self.q_analyze.qsize(), "active": self.pool_analyze.busy},
+            "persist": {"queued": self.q_persist.qsize(), "active": self._persisting},
+            "temp_cache": {"files": self._resident_files,
+                           "bytes": self.disk.reserved()}
+        }
+
+    def has_work(self):
+        p = self.pending()
+        return any(p[s]["queued"] or p[s]["active"] for s in ("download", "analyze", "persist"))
 
     # --- TASKS ---
 
-    def _task_download(self, url, jtype):
+    def _task_download(self, job):
         """Executed in DL Pool"""
+        url, jtype = job.url, job.kind
         filename = url.split('/')[-1] if '?' not in url else "unknown.dat"
-        
-        # 1. Register NEW
-        art_id = self.db.register_artifact(url, filename, status="NEW")
-        if not art_id: return
+
+        tracing.record("queue_download", time.time() - job.enqueued_at, source=job.source)
+
+        # 0. Admission (TEMP_CACHE slots + disk budget)
+        with tracing.span("admission"):
+            admitted = self._admit(job)
+        if not admitted:
+            self._interrupted(job)
+            return
+
+        # 1. Register NEW (recovered/interrupted jobs keep their row)
+        art_id = job.artifact_id or self.db.register_artifact(url, filename, status="NEW")
+        if not art_id:
+            self._release(job)
+            return
+        job.artifact_id = art_id
 
         # 2. Download
         try:
             self.db.update_artifact_status(art_id, "DOWNLOADING")
-            if jtype == "RADIO":
-                path, fhash, size = self.heavy.download_granular(url)
-            else:
-                path, fhash, size = self.image.download_granular(url)
+            with tracing.span("download", artifact_id=art_id, kind=jtype):
+                if jtype == "RADIO":
+                    path, fhash, size = self.heavy.download_granular(url, cancel=self._cancel)
+                else:
+                    path, fhash, size = self.image.download_granular(url, cancel=self._cancel)
                 
             if path:
+                self._account(job, size)
                 # 3. Check Idempotency (Hash)
                 if self.db.check_artifact_exists(fhash):
                     logging.info(f"♻️ Duplicate Hash {fhash[:8]}. Skipping.")
                     self.db.update_artifact_status(art_id, "DUPLICATE", path, fhash, size)
-                    # Cleanup
-                    self.db.update_artifact_status(art_id, "DUPLICATE", path, fhash, size)
                     
                     # FORENSIC: Only cleanup if not flagged for retention (duplicates usually trash)
                     self.heavy.cleanup(path)
+                    self._release(job)
+                    metrics.JOBS.labels("download", "duplicate").inc()
                     return
                 
-                # 4. Success -> Queue Analyze
+                # 4. Success -> Queue Analyze (blocks while the analyze stage is full)
                 self.db.update_artifact_status(art_id, "DOWNLOADED", path, fhash, size)
-                self.q_analyze.put((art_id, jtype))
+                job.path = path
+                metrics.JOBS.labels("download", "ok").inc()
+                self.q_analyze.put(job)
                 Observability.log_event("DOWNLOAD_DONE", artifact_id=art_id, size=size)
+            elif self._cancel.is_set():
+                self.db.update_artifact_status(art_id, "INTERRUPTED")
+                self._release(job)
+                self._interrupted(job)
+                metrics.JOBS.labels("download", "interrupted").inc()
             else:
+                metrics.JOBS.labels("download", "failed").inc()
                 self.db.update_artifact_status(art_id, "FAILED", error="Download returned None")
                 Observability.log_event("DOWNLOAD_FAIL", artifact_id=art_id, reason="Empty Path")
+                self._release(job)
                 
         except Exception as e:
+            metrics.JOBS.labels("download", "error").inc()
             self.db.update_artifact_status(art_id, "FAILED", error=str(e))
             logging.error(f"DL Task Error: {e}")
+            self._release(job)
 
-    def _task_analyze(self, art_id, jtype):
+    def _task_analyze(self, job):
         """Executed in AN Pool"""
-        # Fetch path from DB
-        conn = self.db.get_connection()
-        c = conn.cursor()
-        c.execute("SELECT download_path, source_url FROM artifacts WHERE id=?", (art_id,))
-        row = c.fetchone()
-        conn.close()
-        
-        if not row: return
-        path, url = row
+        art_id, jtype, path = job.artifact_id, job.kind, job.path
+        tracing.record("queue_analyze", time.time() - job.enqueued_at, artifact_id=art_id)
         
         try:
             self.db.update_artifact_status(art_id, "ANALYZING")
@@ -141,37 +480,59 @@ class PipelineManager:
             Observability.update_status({"stage": "ANALYZING", "current": {"artifact_id": art_id}})
             
             result_data = None
-            if jtype == "RADIO":
-                result_data = self.heavy.analyze_granular(path)
-            else:
-                result_data = self.image.analyze_granular(path)
+            with tracing.span("analyze", artifact_id=art_id, kind=jtype):
+                if jtype == "RADIO":
+                    result_data = self.heavy.analyze_granular(path)
+                else:
+                    result_data = self.image.analyze_granular(path)
                 
             # Queue Persist
             if result_data:
-                self.q_persist.put((art_id, jtype, result_data, path))
+                metrics.JOBS.labels("analyze", "ok").inc()
+                job.result = result_data
+                self.q_persist.put(job)
             else:
+                 metrics.JOBS.labels("analyze", "failed").inc()
                  self.db.update_artifact_status(art_id, "FAILED_ANALYSIS")
                  self.heavy.cleanup(path) # Cleanup on fail
+                 self._release(job)
 
         except Exception as e:
+            metrics.JOBS.labels("analyze", "error").inc()
             self.db.update_artifact_status(art_id, "ERROR_ANALYZING", error=str(e))
             self.heavy.cleanup(path) # Ensure cleanup
+            self._release(job)
 
-    def _task_persist(self, data):
+    def _task_persist(self, job):
         """Executed in Persist Thread"""
-        art_id, jtype, result, path = data
+        art_id, jtype, result, path, url = job.artifact_id, job.kind, job.result, job.path, job.url
+        tracing.record("queue_persist", time.time() - job.enqueued_at, artifact_id=art_id)
         
         try:
-            if jtype == "RADIO":
-                self.db.log_radio_event(art_id, result)
-            else:
-                self.db.log_image_event(art_id, result)
+            with tracing.span("persist", artifact_id=art_id, kind=jtype):
+                if jtype == "RADIO":
+                    event_id = self.db.log_radio_event(art_id, result)
+                else:
+                    event_id = self.db.log_image_event(art_id, result)
+                    # Sky coverage bitmap (no-op for non-VLASS URLs)
+                    self.coverage.mark_url(url)
+                    
+                self.db.update_artifact_status(art_id, "CLEANED") # Mark as finally processed
+                if event_id:
+                    self.triage.add(jtype, event_id, result)
                 
-            self.db.update_artifact_status(art_id, "CLEANED") # Mark as finally processed
-            
-            # Zero Waste: Nuke original
-            self.heavy.cleanup(path)
+                # Zero Waste: Nuke original
+                self.heavy.cleanup(path)
             logging.info(f"✨ Artifact {art_id} processed & cleaned.")
+            metrics.JOBS.labels("persist", "ok").inc()
+            Observability.log_event("JOB_DONE", artifact_id=art_id, priority=job.priority,
+                                    source=job.source, latency_s=round(time.time() - job.submitted_at, 3))
+            if self.on_job_done:
+                self.on_job_done(job)
             
         except Exception as e:
+            metrics.JOBS.labels("persist", "error").inc()
             logging.error(f"Persist Error: {e}")
+        finally:
+            # Raw file is gone (or left for forensics on error); either way stop counting it
+            self._release(job)
@@ -0,0 +1,189 @@
+"""
+Offline re-scoring of the whole event history with a triage model.
+
+The main process streams (id, feature columns) from each event table in keyset
+chunks, builds X with triage.column_matrix, and hands chunks to a process pool
+whose workers load the model once and run one predict_proba per chunk. Results
+are written back in chunk order: each chunk's bulk UPDATE commits together with
+its rescore_progress row (migration 011), so a killed job resumes at the first
+unwritten chunk. Progress goes to the event log (RESCORE_* events).
+"""
+import os
+import json
+import time
+import sqlite3
+import logging
+import datetime
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import joblib
+import numpy as np
+import config
+from modules.obs import Observability
+from modules.triage import MODEL_PATH, column_matrix, model_version
+
+# Event table -> {schema feature: column}; features a table lacks are 0
+RESCORE_TABLES = {
+    "events_radio": {"snr": "snr", "drift": "drift_rate"},
+    "events_image": {},
+}
+# Tables with at least one schema feature. The others would be all-zero rows: one constant
+# prediction for every event, so they are neither re-scored nor used for training.
+SCORED_TABLES = [t for t, cols in RESCORE_TABLES.items() if cols]
+
+_model = None # Per worker process
+
+
+def _init_worker(model_path):
+    global _model
+    _model = joblib.load(model_path)
+
+
+def _predict(X):
+    """(score 0-100, class index) per row of X."""
+    proba = _model.predict_proba(X)
+    best = proba.argmax(axis=1)
+    return (proba[np.arange(len(best)), best] * 100).astype(np.float32), best.astype(np.int32)
+
+
+class Rescorer:
+    def __init__(self, model_path=MODEL_PATH, db_path=None, version=None, chunk_rows=None, workers=None):
+        self.model_path = model_path
+        self.db_path = db_path or config.DB_PATH
+        self.version = version or model_version(model_path)
+        self.chunk_rows = chunk_rows or config.RESCORE_CHUNK_ROWS
+        self.workers = workers if workers is not None else (config.RESCORE_WORKERS or os.cpu_count() or 1)
+        self.model = joblib.load(model_path) # Main process: classes_ and algorithm name
+
+    def run(self, tables=None, restart=False):
+        """Re-scores every event of `tables` (default: SCORED_TABLES) not yet done for this model version; returns a summary."""
+        tables = list(tables or SCORED_TABLES)
+        for t in [t for t in tables if t not in SCORED_TABLES]:
+            logging.warning(f"♻️ {t} has no triage features: not re-scored (its ml_* columns stay as they are)")
+            tables.remove(t)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA busy_timeout = 30000") # The daemon may be writing
+        conn.execute(f"PRAGMA cache_size = -{config.RESCORE_CACHE_MB * 1024}") # events_all index pages stay hot
+        t0 = time.time()
+        summary = {"version": self.version, "tables": {}}
+        try:
+            self._register(conn)
+            plan = {t: self._resume_point(conn, t, restart) for t in tables}
+            Observability.log_event("RESCORE_START", version=self.version, workers=self.workers,
+                                    chunk_rows=self.chunk_rows,
+                                    todo={t: total - done for t, (_, done, total) in plan.items()})
+            pool = ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=(self.model_path,)) \
+                if self.workers > 1 else None
+            if pool is None:
+                _init_worker(self.model_path)
+            try:
+                for table in tables:
+                    summary["tables"][table] = self._rescore_table(conn, pool, table, *plan[table])
+            finally:
+                if pool is not None:
+                    pool.shutdown(cancel_futures=True)
+        finally:
+            elapsed = time.time() - t0
+            summary["seconds"] = round(elapsed, 1)
+            n = sum(summary["tables"].values())
+            summary["events_per_sec"] = round(n / elapsed) if elapsed else None
+            self._finish(conn, summary)
+            conn.close()
+        Observability.log_event("RESCORE_DONE", **summary)
+        return summary
+
+    # --- Internals ---
+
+    def _register(self, conn):
+        trained = datetime.datetime.fromtimestamp(os.path.getmtime(self.model_path)).isoformat()
+        with conn:
+            conn.execute("""INSERT OR IGNORE INTO model_runs (version, trained_at, algorithm, metrics_json, is_active)
+                            VALUES (?, ?, ?, '{}', 0)""", (self.version, trained, type(self.model).__name__))
+
+    def _resume_point(self, conn, table, restart):
+        """(last_id, n_done, n_total) for this version/table."""
+        if restart:
+            with conn:
+                conn.execute("DELETE FROM rescore_progress WHERE model_version = ? AND table_name = ?", (self.version, table))
+        row = conn.execute("SELECT last_id, n_done FROM rescore_progress WHERE model_version = ? AND table_name = ?",
+                           (self.version, table)).fetchone()
+        last_id, done = row or (0, 0)
+        remaining = conn.execute(f"SELECT COUNT(*) FROM {table} WHERE id > ?", (last_id,)).fetchone()[0]
+        return last_id, done, done + remaining
+
+    def _chunks(self, conn, table, last_id):
+        """Yields (ids, X) in id order."""
+        cols = RESCORE_TABLES[table]
+        select = ", ".join(["id"] + list(cols.values()))
+        sql = f"SELECT {select} FROM {table} WHERE id > ? ORDER BY id LIMIT ?"
+        while True:
+            rows = conn.execute(sql, (last_id, self.chunk_rows)).fetchall()
+            if not rows: return
+            arr = np.array(rows, dtype=float) # NULL -> nan -> 0 in column_matrix
+            ids = arr[:, 0].astype(np.int64)
+            X = column_matrix({name: arr[:, i + 1] for i, name in enumerate(cols)}, len(rows))
+            last_id = int(ids[-1])
+            yield ids, X
+
+    def _rescore_table(self, conn, pool, table, last_id, done, total):
+        classes = np.asarray(self.model.classes_, dtype=object)
+        update = f"UPDATE {table} SET ml_score = ?, ml_label = ? WHERE id = ?"
+        inflight = deque()
+        chunks = self._chunks(conn, table, last_id)
+        start_done, t0, last_report = done, time.time(), 0.0
+
+        def write(ids, result):
+            nonlocal done, last_report
+            scores, best = result
+            with conn:
+                conn.executemany(update, zip(scores.astype(float).tolist(), classes[best].tolist(), ids.tolist()))
+                done += len(ids)
+                conn.execute("""
+                    INSERT INTO rescore_progress (model_version, table_name, last_id, n_done, n_total, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (model_version, table_name) DO UPDATE SET
+                        last_id = excluded.last_id, n_done = excluded.n_done,
+                        n_total = excluded.n_total, updated_at = excluded.updated_at
+                """, (self.version, table, int(ids[-1]), done, total, datetime.datetime.now().isoformat()))
+            now = time.time()
+            if now - last_report >= config.RESCORE_PROGRESS_SEC:
+                last_report = now
+                rate = (done - start_done) / max(now - t0, 1e-9)
+                eta = (total - done) / rate if rate else None
+                Observability.log_event("RESCORE_PROGRESS", version=self.version, table=table, done=done,
+                                        total=total, events_per_sec=round(rate), eta_s=eta and round(eta))
+                logging.info(f"♻️ Rescore {table}: {done}/{total} ({rate:.0f} ev/s)")
+
+        for ids, X in chunks:
+            if pool is None:
+                write(ids, _predict(X))
+                continue
+            inflight.append((ids, pool.submit(_predict, X)))
+            # Keep every worker busy while writing strictly in chunk order
+            while len(inflight) > self.workers * 2 or (inflight and inflight[0][1].done()):
+                head_ids, fut = inflight.popleft()
+                write(head_ids, fut.result())
+        while inflight:
+            head_ids, fut = inflight.popleft()
+            write(head_ids, fut.result())
+
+        with conn:
+            conn.execute("""
+                INSERT INTO rescore_progress (model_version, table_name, last_id, n_done, n_total, updated_at, finished_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (model_version, table_name) DO UPDATE SET finished_at = excluded.finished_at,
+                    n_total = excluded.n_total, updated_at = excluded.updated_at
+            """, (self.version, table, last_id, done, total, datetime.datetime.now().isoformat(),
+                  datetime.datetime.now().isoformat()))
+        return done - start_done
+
+    def _finish(self, conn, summary):
+        """Keeps the latest re-score stats in model_runs.metrics_json (other keys untouched)."""
+        try:
+            row = conn.execute("SELECT metrics_json FROM model_runs WHERE version = ?", (self.version,)).fetchone()
+            metrics = json.loads(row[0] or "{}") if row else {}
+            metrics["rescore"] = {**summary, "finished_at": datetime.datetime.now().isoformat()}
+            with conn:
+                conn.execute("UPDATE model_runs SET metrics_json = ? WHERE version = ?", (json.dumps(metrics), self.version))
+        except sqlite3.Error as e:
+            logging.warning(f"Could not record rescore stats: {e}")
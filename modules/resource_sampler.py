@@ -0,0 +1,95 @@
+import time
+import logging
+import threading
+import psutil
+import config
+
+
+class ResourceSampler:
+    """
+    Background host sampler: one snapshot (CPU, RAM, running process names) per
+    HOST_SAMPLE_SEC, shared by DaemonControl's pause logic, its state file and
+    the pool autoscaler.
+
+    - CPU is psutil's non-blocking delta since the previous sample. That delta
+      state is process-global, so there is a single sampler per process (shared()).
+    - Process names are cached by PID; only PIDs not seen before are looked up.
+      (A PID reused between two samples keeps its old name until it exits; with
+      second-level sampling that window is negligible.)
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, interval=None):
+        self.interval = interval or config.HOST_SAMPLE_SEC
+        self.running = False
+        self.thread = None
+        self._names = {} # pid -> process name (None when inaccessible)
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        """The process-wide sampler, started on first use."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+                cls._shared.start()
+            return cls._shared
+
+    def start(self):
+        if self.running: return
+        psutil.cpu_percent(interval=None) # Prime the delta
+        self.sample()
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, name="resource-sampler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=2)
+
+    def _loop(self):
+        while self.running:
+            time.sleep(self.interval)
+            try:
+                self.sample()
+            except Exception as e:
+                logging.error(f"Resource sampler error: {e}")
+
+    def sample(self):
+        """Takes and publishes one snapshot."""
+        t0 = time.perf_counter()
+        cpu = psutil.cpu_percent(interval=None)
+        ram = psutil.virtual_memory().percent
+
+        pids = set(psutil.pids())
+        new = pids.difference(self._names)
+        for pid in new:
+            try:
+                self._names[pid] = psutil.Process(pid).name()
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                self._names[pid] = None
+        for pid in set(self._names).difference(pids):
+            del self._names[pid]
+
+        snap = {
+            "ts": time.time(),
+            "cpu": cpu,
+            "ram": ram,
+            "process_names": frozenset(n for n in self._names.values() if n),
+            "n_processes": len(pids),
+            "new_pids": len(new),
+            "sample_ms": (time.perf_counter() - t0) * 1000,
+        }
+        with self._lock:
+            self._snapshot = snap
+        return snap
+
+    def snapshot(self):
+        """Latest snapshot (samples synchronously if none has been taken yet)."""
+        with self._lock:
+            snap = self._snapshot
+        return snap or self.sample()
@@ -1,6 +1,4 @@
-import pandas as pd
-import sqlite3
-import config
+from modules.summaries import DashboardSummary
 
 class RFIIntelligence:
     """
@@ -11,27 +9,10 @@ class RFIIntelligence:
     def get_frequency_heatmap():
         """
         Returns a DataFrame of frequency ranges and their RFI density.
+        Read from summary_rfi_freq (1 MHz bins, kept current by triggers).
         """
-        conn = sqlite3.connect(config.DB_PATH)
-        # Query known RFI events
-        q = """
-            SELECT fch1 as freq, bandwidth 
-            FROM events_radio 
-            WHERE label IN ('RFI', 'INTERFERENCIA_TERRESTRE', 'NOISE')
-        """
-        try:
-            df = pd.read_sql_query(q, conn)
-            if df.empty: return None
-            
-            # Simple histogram for heatmap
-            # bin freq into 1MHz buckets
-            df['freq_bin'] = df['freq'].round(0)
-            counts = df.groupby('freq_bin').size().reset_index(name='count')
-            return counts
-        except:
-            return None
-        finally:
-            conn.close()
+        counts = DashboardSummary.rfi_heatmap()
+        return None if counts.empty else counts
 
     @staticmethod
     def check_zone(freq_mhz):
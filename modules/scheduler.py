@@ -0,0 +1,161 @@
+import time
+import queue
+import threading
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+import config
+from modules.sources.base import Target
+
+# Priority classes (lower runs first)
+PRIORITY_REOBSERVE = 0 # New epoch/observation of something already flagged as candidate
+PRIORITY_BACKFILL = 1  # Explicit user request
+PRIORITY_NORMAL = 2    # Regular discovery
+PRIORITY_CLASSES = {"REOBSERVE": PRIORITY_REOBSERVE, "BACKFILL": PRIORITY_BACKFILL, "NORMAL": PRIORITY_NORMAL}
+
+_seq = itertools.count()
+
+
+def resolve_priority(value):
+    """Accepts a class name ('BACKFILL') or int; anything else is NORMAL."""
+    if isinstance(value, int):
+        return value
+    return PRIORITY_CLASSES.get(str(value).upper(), PRIORITY_NORMAL) if value else PRIORITY_NORMAL
+
+
+@dataclass
+class Job:
+    """
+    One Target travelling through the pipeline stages.
+    Stage results (artifact id, temp path, analysis dict) are filled in as it moves.
+    """
+    target: Target
+    priority: int = PRIORITY_NORMAL
+    submitted_at: float = field(default_factory=time.time)
+    enqueued_at: float = 0.0
+    seq: int = field(default_factory=lambda: next(_seq))
+    artifact_id: Optional[int] = None
+    path: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    resident: bool = False # Holds a TEMP_CACHE slot (see PipelineManager._admit)
+    disk_bytes: int = 0
+
+    @property
+    def url(self):
+        return self.target.url
+
+    @property
+    def kind(self):
+        return self.target.kind
+
+    @property
+    def source(self):
+        return self.target.dataset or "UNKNOWN"
+
+    @property
+    def size(self):
+        size = (self.target.metadata or {}).get("size_bytes")
+        return size if size is not None else float("inf")
+
+
+class JobScheduler:
+    """
+    Bounded priority queue with the queue.Queue interface (put/get/qsize/task_done).
+
+    Ordering, evaluated at get() time:
+      1. Priority class, promoted one class per SCHED_AGING_SECONDS waited (no starvation)
+      2. Per-source stride counter, so one busy source cannot monopolise a class
+      3. Smallest file first, then submission order
+    Stage queues are small (QUEUE_SIZE), so a linear scan beats keeping a heap
+    consistent while aging keys change under it.
+    """
+
+    def __init__(self, maxsize=0, aging_seconds=None):
+        self.maxsize = maxsize
+        self.aging_seconds = aging_seconds or config.SCHED_AGING_SECONDS
+        self._items = []
+        self._pass = {}    # source -> jobs served (stride scheduling)
+        self._pending = {} # source -> jobs waiting
+        self._unfinished = 0
+        self._mutex = threading.Lock()
+        self._not_empty = threading.Condition(self._mutex)
+        self._not_full = threading.Condition(self._mutex)
+        self._all_done = threading.Condition(self._mutex)
+
+    def put(self, job, block=True, timeout=None):
+        with self._not_full:
+            if self.maxsize > 0:
+                if not block:
+                    if len(self._items) >= self.maxsize: raise queue.Full
+                elif timeout is None:
+                    while len(self._items) >= self.maxsize:
+                        self._not_full.wait()
+                else:
+                    deadline = time.monotonic() + timeout
+                    while len(self._items) >= self.maxsize:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0: raise queue.Full
+                        self._not_full.wait(remaining)
+
+            src = job.source
+            if not self._pending.get(src):
+                # A source returning from idle joins at the current front, not with a backlog of credit
+                active = [self._pass[s] for s, n in self._pending.items() if n and s in self._pass]
+                self._pass[src] = max(self._pass.get(src, 0), min(active) if active else 0)
+            self._pending[src] = self._pending.get(src, 0) + 1
+
+            job.enqueued_at = time.time()
+            self._items.append(job)
+            self._unfinished += 1
+            self._not_empty.notify()
+
+    def get(self, block=True, timeout=None):
+        with self._not_empty:
+            if not block:
+                if not self._items: raise queue.Empty
+            elif timeout is None:
+                while not self._items:
+                    self._not_empty.wait()
+            else:
+                deadline = time.monotonic() + timeout
+                while not self._items:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0: raise queue.Empty
+                    self._not_empty.wait(remaining)
+
+            now = time.time()
+            idx = min(range(len(self._items)), key=lambda i: self._rank(self._items[i], now))
+            job = self._items.pop(idx)
+
+            src = job.source
+            self._pass[src] = self._pass.get(src, 0) + 1
+            self._pending[src] -= 1
+            self._not_full.notify()
+            return job
+
+    def _rank(self, job, now):
+        aged = job.priority - int((now - job.enqueued_at) / self.aging_seconds)
+        return (max(aged, 0), self._pass.get(job.source, 0), job.size, job.seq)
+
+    def task_done(self):
+        with self._all_done:
+            self._unfinished -= 1
+            if self._unfinished <= 0:
+                self._unfinished = 0
+                self._all_done.notify_all()
+
+    def join(self):
+        with self._all_done:
+            while self._unfinished:
+                self._all_done.wait()
+
+    def qsize(self):
+        with self._mutex:
+            return len(self._items)
+
+    def empty(self):
+        return self.qsize() == 0
+
+    def full(self):
+        with self._mutex:
+            return 0 < self.maxsize <= len(self._items)
@@ -0,0 +1,197 @@
+import re
+import math
+import sqlite3
+import logging
+import datetime
+import threading
+import config
+
+# VLASS subtile directories are named after their centre: J{hhmmss}{+-}{ddmmss}
+SUBTILE_RE = re.compile(r"J(\d{2})(\d{2})(\d{2})([+-])(\d{2})(\d{2})(\d{2})")
+VLASS_URL_RE = re.compile(r"/(VLASS\d+\.\d+)/(T\d+t\d+)/(J\d{6}[+-]\d{6})/")
+
+
+def ang2pix_ring(nside, ra_deg, dec_deg):
+    """
+    HEALPix RING-scheme pixel index for an (RA, Dec) in degrees.
+    Same result as healpy.ang2pix(nside, ra, dec, lonlat=True), without the dependency.
+    """
+    z = math.sin(math.radians(dec_deg))
+    za = abs(z)
+    tt = (ra_deg % 360.0) / 90.0 # in [0, 4)
+
+    if za <= 2.0 / 3.0:
+        # Equatorial belt
+        t1 = nside * (0.5 + tt)
+        t2 = nside * z * 0.75
+        jp = int(t1 - t2)
+        jm = int(t1 + t2)
+        ir = nside + 1 + jp - jm
+        kshift = 1 - (ir & 1)
+        ip = ((jp + jm - nside + kshift + 1) // 2) % (4 * nside)
+        return 2 * nside * (nside - 1) + (ir - 1) * 4 * nside + ip
+
+    # Polar caps
+    tp = tt - int(tt)
+    tmp = nside * math.sqrt(3.0 * (1.0 - za))
+    jp = int(tp * tmp)
+    jm = int((1.0 - tp) * tmp)
+    ir = jp + jm + 1
+    ip = int(tt * ir) % (4 * ir)
+    if z > 0:
+        return 2 * ir * (ir - 1) + ip
+    return 12 * nside * nside - 2 * ir * (ir + 1) + ip
+
+
+def parse_subtile(name):
+    """'J000412+000631' -> (ra_deg, dec_deg), or None if the name does not match."""
+    m = SUBTILE_RE.search(name or "")
+    if not m:
+        return None
+    hh, mm, ss, sign, dd, dm, ds = m.groups()
+    ra = (int(hh) + int(mm) / 60.0 + int(ss) / 3600.0) * 15.0
+    dec = int(dd) + int(dm) / 60.0 + int(ds) / 3600.0
+    return ra, -dec if sign == "-" else dec
+
+
+class SkyCoverage:
+    """
+    Harvested-sky bitmap per (survey, epoch), one bit per HEALPix pixel.
+    Held in memory for O(1) lookups and persisted as a single BLOB row,
+    with the covered-pixel count kept alongside so summaries never scan events.
+    """
+
+    def __init__(self, survey="VLASS", nside=None, db_path=None):
+        self.survey = survey
+        self.nside = nside or config.COVERAGE_NSIDE
+        self.npix = 12 * self.nside * self.nside
+        self.db_path = db_path or config.DB_PATH
+        self._lock = threading.Lock()
+        self._maps = {} # epoch -> [bytearray, n_covered]
+
+    def _load(self, epoch):
+        """Returns the cached [bitmap, count] for an epoch, reading it from the DB once."""
+        entry = self._maps.get(epoch)
+        if entry is not None:
+            return entry
+        bitmap, count = bytearray((self.npix + 7) // 8), 0
+        conn = sqlite3.connect(self.db_path)
+        try:
+            row = conn.execute(
+                "SELECT bitmap, n_covered FROM sky_coverage WHERE survey=? AND epoch=? AND nside=?",
+                (self.survey, epoch, self.nside)
+            ).fetchone()
+            if row:
+                bitmap, count = bytearray(row[0]), row[1]
+        except sqlite3.OperationalError as e:
+            logging.warning(f"Coverage table unavailable: {e}")
+        finally:
+            conn.close()
+        entry = self._maps[epoch] = [bitmap, count]
+        return entry
+
+    def refresh(self):
+        """Drops cached bitmaps so the next lookup sees writes from other processes."""
+        with self._lock:
+            self._maps.clear()
+
+    def pixel(self, ra, dec):
+        return ang2pix_ring(self.nside, ra, dec)
+
+    def is_covered(self, epoch, ra, dec):
+        pix = self.pixel(ra, dec)
+        with self._lock:
+            bitmap = self._load(epoch)[0]
+            return bool(bitmap[pix >> 3] & (1 << (pix & 7)))
+
+    def mark(self, epoch, ra, dec, tile=None):
+        """Flags the pixel containing (ra, dec) as harvested. Returns True if it was new."""
+        pix = self.pixel(ra, dec)
+        now = datetime.datetime.now().isoformat()
+        with self._lock:
+            entry = self._load(epoch)
+            bitmap = entry[0]
+            if bitmap[pix >> 3] & (1 << (pix & 7)):
+                return False
+            bitmap[pix >> 3] |= 1 << (pix & 7)
+            entry[1] += 1
+
+            conn = sqlite3.connect(self.db_path)
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO sky_coverage (survey, epoch, nside, bitmap, n_covered, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (self.survey, epoch, self.nside, bytes(bitmap), entry[1], now)
+                )
+                if tile:
+                    conn.execute(
+                        "INSERT OR IGNORE INTO survey_tiles (survey, epoch, tile, n_seen, n_harvested) VALUES (?, ?, ?, 0, 0)",
+                        (self.survey, epoch, tile)
+                    )
+                    conn.execute(
+                        "UPDATE survey_tiles SET n_harvested = n_harvested + 1, last_harvested_at = ? WHERE survey=? AND epoch=? AND tile=?",
+                        (now, self.survey, epoch, tile)
+                    )
+                conn.commit()
+            except Exception as e:
+                logging.error(f"Coverage persist error: {e}")
+            finally:
+                conn.close()
+            return True
+
+    def mark_url(self, url):
+        """Marks coverage from a VLASS quicklook URL (epoch/tile/subtile path). False if not parseable."""
+        m = VLASS_URL_RE.search(url or "")
+        if not m:
+            return False
+        epoch, tile, subtile = m.groups()
+        ra, dec = parse_subtile(subtile)
+        return self.mark(epoch, ra, dec, tile=tile)
+
+    def tile_order(self, epoch, tiles):
+        """Sorts tile names so the least harvested (and never seen) come first."""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute(
+                "SELECT tile, n_harvested, n_seen FROM survey_tiles WHERE survey=? AND epoch=?",
+                (self.survey, epoch)
+            ).fetchall()
+        except sqlite3.OperationalError:
+            rows = []
+        finally:
+            conn.close()
+        progress = {t: (h / s if s else 0.0) for t, h, s in rows}
+        return sorted(tiles, key=lambda t: (progress.get(t, 0.0), t))
+
+    def record_tile_listing(self, epoch, tile, n_subtiles):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("""
+                INSERT INTO survey_tiles (survey, epoch, tile, n_seen, n_harvested, last_listed_at)
+                VALUES (?, ?, ?, ?, 0, ?)
+                ON CONFLICT(survey, epoch, tile) DO UPDATE SET n_seen=excluded.n_seen, last_listed_at=excluded.last_listed_at
+            """, (self.survey, epoch, tile, n_subtiles, datetime.datetime.now().isoformat()))
+            conn.commit()
+        except Exception as e:
+            logging.error(f"Tile listing persist error: {e}")
+        finally:
+            conn.close()
+
+    def summary(self):
+        """
+        One row per epoch: covered pixels and sky fraction.
+        Reads the stored counters only (no bitmap decode, no event scan).
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute(
+                "SELECT epoch, n_covered, updated_at FROM sky_coverage WHERE survey=? AND nside=? ORDER BY epoch",
+                (self.survey, self.nside)
+            ).fetchall()
+        except sqlite3.OperationalError:
+            rows = []
+        finally:
+            conn.close()
+        return [
+            {"epoch": e, "pixels": n, "sky_fraction": n / self.npix, "updated_at": ts}
+            for e, n, ts in rows
+        ]
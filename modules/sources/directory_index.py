@@ -0,0 +1,197 @@
+import re
+import codecs
+import logging
+import datetime
+from collections import deque, namedtuple
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit, unquote
+import requests
+import config
+from .base import DataSource, Target
+
+# One parsed row of an "Index of" page.
+ListingEntry = namedtuple("ListingEntry", ["url", "name", "is_dir", "size_bytes", "mtime"])
+
+# Apache: 2020-01-31 12:00 | nginx: 31-Jan-2020 12:00 (seconds optional on both)
+_DATE_RE = re.compile(r"(\d{4}-\d{2}-\d{2} \d{2}:\d{2}(?::\d{2})?|\d{2}-[A-Za-z]{3}-\d{4} \d{2}:\d{2}(?::\d{2})?)")
+_DATE_FORMATS = ("%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S", "%d-%b-%Y %H:%M", "%d-%b-%Y %H:%M:%S")
+_SIZE_RE = re.compile(r"^(\d+(?:\.\d+)?)([KMGTP]?)B?$", re.IGNORECASE)
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3, "T": 1024 ** 4, "P": 1024 ** 5}
+
+
+class _IndexParser(HTMLParser):
+    """
+    Incremental parser for Apache/nginx autoindex pages.
+    Fed chunk by chunk; completed (href, trailing_text) pairs pile up in
+    `entries` and are drained by the caller, so memory stays O(one row).
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.entries = deque()
+        self._href = None
+        self._in_anchor = False
+        self._in_row = False
+        self._tail = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            self._flush()
+            self._href = dict(attrs).get("href")
+            self._in_anchor = True
+        elif tag == "tr":
+            self._flush()
+            self._in_row = True
+
+    def handle_endtag(self, tag):
+        if tag == "a":
+            self._in_anchor = False
+        elif tag == "tr":
+            self._flush()
+            self._in_row = False
+        elif tag in ("pre", "table", "body"):
+            self._flush()
+
+    def handle_data(self, data):
+        if self._href is None or self._in_anchor:
+            return
+        # <pre> listings: metadata ends at the line break. Table listings: at </tr>.
+        if not self._in_row and "\n" in data:
+            self._tail.append(data.split("\n", 1)[0])
+            self._flush()
+        else:
+            self._tail.append(data)
+
+    def _flush(self):
+        if self._href is not None:
+            self.entries.append((self._href, " ".join(self._tail)))
+        self._href = None
+        self._tail = []
+
+
+def _parse_meta(text):
+    """Returns (size_bytes, mtime_iso) from the text that follows a link. Either may be None."""
+    mtime = None
+    m = _DATE_RE.search(text)
+    if m:
+        for fmt in _DATE_FORMATS:
+            try:
+                mtime = datetime.datetime.strptime(m.group(1), fmt).isoformat()
+                break
+            except ValueError:
+                continue
+        text = text[m.end():]
+
+    size = None
+    tokens = text.split()
+    if tokens:
+        s = _SIZE_RE.match(tokens[-1])
+        if s:
+            size = int(float(s.group(1)) * _SIZE_UNITS[s.group(2).upper()])
+    return size, mtime
+
+
+def iter_listing(url, session=None, timeout=30):
+    """
+    Streams one directory listing and yields ListingEntry rows as they are parsed.
+    Sort links, parent links and anything outside `url` are skipped.
+    """
+    if not url.endswith("/"):
+        url += "/"
+    http = session or requests
+    parser = _IndexParser()
+
+    with http.get(url, stream=True, timeout=timeout, headers={'User-Agent': config.USER_AGENTS[0]}) as r:
+        r.raise_for_status()
+        decoder = codecs.getincrementaldecoder(r.encoding or "utf-8")(errors="replace")
+        for chunk in r.iter_content(chunk_size=config.DIR_INDEX_CHUNK_SIZE):
+            parser.feed(decoder.decode(chunk))
+            while parser.entries:
+                entry = _to_entry(url, *parser.entries.popleft())
+                if entry: yield entry
+
+        parser.feed(decoder.decode(b"", final=True))
+        parser.close()
+        parser._flush()
+        while parser.entries:
+            entry = _to_entry(url, *parser.entries.popleft())
+            if entry: yield entry
+
+
+def _to_entry(base_url, href, tail):
+    if not href or href.startswith(("?", "#", "mailto:", "javascript:")):
+        return None
+    full = urljoin(base_url, href)
+    # Parent dir, absolute links back up the tree, other hosts
+    if not full.startswith(base_url) or full == base_url:
+        return None
+    is_dir = full.endswith("/")
+    name = unquote(urlsplit(full).path.rstrip("/").rsplit("/", 1)[-1])
+    size, mtime = _parse_meta(tail)
+    return ListingEntry(full, name, is_dir, None if is_dir else size, mtime)
+
+
+class DirectoryIndex(DataSource):
+    """
+    Crawls plain HTTP "Index of" listings (config.RADIO_SOURCES) recursively.
+    discover() is a generator: listings are parsed while they stream in and
+    Targets are yielded one by one, so 100k-entry pages never sit in memory.
+    """
+
+    def __init__(self, roots=None, max_depth=None, extensions=None, session=None):
+        self.roots = list(roots if roots is not None else config.RADIO_SOURCES)
+        self.max_depth = config.DIR_INDEX_MAX_DEPTH if max_depth is None else max_depth
+        self.extensions = tuple(e.lower() for e in (extensions or config.DIR_INDEX_EXTENSIONS))
+        self.session = session or requests.Session()
+
+    @property
+    def name(self):
+        return "DIRECTORY_INDEX"
+
+    @property
+    def kind(self):
+        return "RADIO"
+
+    def discover(self):
+        for root in self.roots:
+            try:
+                yield from self._crawl(root)
+            except requests.RequestException as e:
+                logging.error(f"Directory index crawl failed {root}: {e}")
+
+    def _crawl(self, root):
+        if not root.endswith("/"):
+            root += "/"
+        stack = [(root, 0)]
+        seen = {root}
+
+        while stack:
+            url, depth = stack.pop()
+            try:
+                for entry in iter_listing(url, self.session):
+                    if entry.is_dir:
+                        if depth < self.max_depth and entry.url not in seen:
+                            seen.add(entry.url)
+                            stack.append((entry.url, depth + 1))
+                    elif entry.name.lower().endswith(self.extensions):
+                        yield self._to_target(entry, url, depth)
+            except requests.RequestException as e:
+                # A dead subdirectory should not abort the rest of the tree
+                if url == root: raise
+                logging.warning(f"Skipping listing {url}: {e}")
+
+    def _to_target(self, entry, listing_url, depth):
+        kind = "IMAGE" if entry.name.lower().endswith(".fits") else "RADIO"
+        dataset = urlsplit(listing_url).path.rstrip("/").rsplit("/", 1)[-1] or urlsplit(listing_url).netloc
+        return Target(
+            url=entry.url,
+            kind=kind,
+            object_name=entry.name.rsplit(".", 1)[0],
+            dataset=dataset,
+            metadata={
+                "size_bytes": entry.size_bytes,
+                "mtime": entry.mtime,
+                "listing": listing_url,
+                "depth": depth
+            }
+        )
@@ -0,0 +1,86 @@
+import re
+import logging
+import requests
+import config
+from .base import DataSource, Target
+from .directory_index import iter_listing
+from modules.sky_coverage import SkyCoverage, parse_subtile
+
+TILE_RE = re.compile(r"^T\d+t\d+$")
+
+
+class VLASSTileGrid(DataSource):
+    """
+    Systematic VLASS Quick Look enumerator: epoch -> tile -> subtile -> image.
+    Tiles are visited least-harvested first and subtiles whose HEALPix pixel
+    is already covered for that epoch are skipped, so fresh sky comes first.
+    """
+
+    def __init__(self, root=None, epochs=None, coverage=None, session=None):
+        self.root = (root or config.VLASS_QL_ROOT).rstrip("/") + "/"
+        self.epochs = list(epochs or config.VLASS_EPOCHS)
+        self.coverage = coverage or SkyCoverage("VLASS")
+        self.session = session or requests.Session()
+
+    @property
+    def name(self):
+        return "VLASS_TILE_GRID"
+
+    @property
+    def kind(self):
+        return "IMAGE"
+
+    def discover(self):
+        # Other processes (the pipeline) mark coverage; start every cycle from the DB state
+        self.coverage.refresh()
+        for epoch in self.epochs:
+            try:
+                yield from self._walk_epoch(epoch)
+            except requests.RequestException as e:
+                logging.error(f"VLASS epoch listing failed {epoch}: {e}")
+
+    def _walk_epoch(self, epoch):
+        epoch_url = f"{self.root}{epoch}/"
+        tiles = [e.name for e in iter_listing(epoch_url, self.session) if e.is_dir and TILE_RE.match(e.name)]
+
+        for tile in self.coverage.tile_order(epoch, tiles):
+            tile_url = f"{epoch_url}{tile}/"
+            try:
+                subtiles = [e for e in iter_listing(tile_url, self.session) if e.is_dir]
+            except requests.RequestException as e:
+                logging.warning(f"Skipping tile {epoch}/{tile}: {e}")
+                continue
+            self.coverage.record_tile_listing(epoch, tile, len(subtiles))
+
+            for sub in subtiles:
+                center = parse_subtile(sub.name)
+                if not center or self.coverage.is_covered(epoch, *center):
+                    continue
+                target = self._image_target(epoch, tile, sub, center)
+                if target:
+                    yield target
+
+    def _image_target(self, epoch, tile, sub, center):
+        """Lists the subtile directory and picks the primary Stokes I image."""
+        try:
+            for entry in iter_listing(sub.url, self.session):
+                if not entry.is_dir and entry.name.endswith(config.VLASS_IMAGE_SUFFIX):
+                    return Target(
+                        url=entry.url,
+                        kind="IMAGE",
+                        object_name=sub.name,
+                        dataset=epoch,
+                        metadata={
+                            "telescope": "VLA",
+                            "epoch": epoch,
+                            "tile": tile,
+                            "ra": center[0],
+                            "dec": center[1],
+                            "healpix": self.coverage.pixel(*center),
+                            "size_bytes": entry.size_bytes,
+                            "mtime": entry.mtime
+                        }
+                    )
+        except requests.RequestException as e:
+            logging.warning(f"Skipping subtile {sub.url}: {e}")
+        return None
@@ -0,0 +1,131 @@
+"""
+In-memory telemetry statistics without DB queries.
+
+- RingBuffer: fixed-size numpy array of the last N samples (exact window percentiles).
+- DDSketch: streaming quantiles over the whole session in bounded memory, with
+  relative-error guarantee `accuracy` (a p99 of 100 Mbps is within +-1 Mbps at 1%).
+  Values <= min_value land in a zero bucket, so idle seconds (0 Mbps, empty
+  queues) are counted without a log() of zero.
+- MetricSeries: one of each per metric, as kept by TelemetryMonitor.
+"""
+import math
+import threading
+import numpy as np
+
+
+class RingBuffer:
+    def __init__(self, size):
+        self._data = np.zeros(size, dtype=np.float64)
+        self._next = 0
+        self.count = 0
+
+    def append(self, value):
+        self._data[self._next] = value
+        self._next = (self._next + 1) % len(self._data)
+        self.count = min(self.count + 1, len(self._data))
+
+    def values(self):
+        """Filled part, oldest first (a copy)."""
+        if self.count < len(self._data):
+            return self._data[:self.count].copy()
+        return np.concatenate((self._data[self._next:], self._data[:self._next]))
+
+    def last(self):
+        return float(self._data[self._next - 1]) if self.count else None
+
+    def percentiles(self, qs):
+        if not self.count: return [None] * len(qs)
+        return [float(v) for v in np.percentile(self._data[:self.count], [q * 100 for q in qs])]
+
+
+class DDSketch:
+    def __init__(self, accuracy=0.01, max_bins=2048, min_value=1e-9):
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.max_bins = max_bins
+        self.min_value = min_value
+        self.bins = {} # index -> count; bin i covers (gamma^(i-1), gamma^i]
+        self.zero = 0
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        value = float(value)
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value <= self.min_value:
+            self.zero += 1
+            return
+        i = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[i] = self.bins.get(i, 0) + 1
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def _collapse(self):
+        # Fold the lowest bins together: keeps the high quantiles (the ones we alert on) exact
+        keys = sorted(self.bins)
+        extra = keys[:len(keys) - self.max_bins + 1]
+        target = extra[-1]
+        self.bins[target] = sum(self.bins.pop(k) for k in extra[:-1]) + self.bins[target]
+
+    def merge(self, other):
+        for i, c in other.bins.items():
+            self.bins[i] = self.bins.get(i, 0) + c
+        self.zero += other.zero
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        while len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def quantiles(self, qs):
+        if not self.count: return [None] * len(qs)
+        keys = sorted(self.bins)
+        out = []
+        for q in qs:
+            rank = q * (self.count - 1)
+            if rank < self.zero:
+                out.append(max(self.min, 0.0))
+                continue
+            seen = self.zero
+            value = self.max
+            for i in keys:
+                seen += self.bins[i]
+                if seen > rank:
+                    value = 2 * self.gamma ** i / (self.gamma + 1) # Bin midpoint (relative error bound)
+                    break
+            out.append(min(max(value, self.min), self.max))
+        return out
+
+
+class MetricSeries:
+    """Last-N ring buffer (window stats) + session DDSketch for one metric."""
+
+    QUANTILES = (0.50, 0.95, 0.99)
+
+    def __init__(self, window, accuracy):
+        self.ring = RingBuffer(window)
+        self.sketch = DDSketch(accuracy)
+        self._lock = threading.Lock()
+
+    def add(self, value):
+        with self._lock:
+            self.ring.append(value)
+            self.sketch.add(value)
+
+    def summary(self):
+        with self._lock:
+            w = self.ring.percentiles(self.QUANTILES)
+            s = self.sketch.quantiles(self.QUANTILES)
+            last = self.ring.last()
+            n = self.ring.count
+            mean = float(self.ring.values().mean()) if n else None
+            peak = self.sketch.max if self.sketch.count else None
+        r = lambda v: None if v is None else round(v, 3)
+        return {
+            "last": r(last), "window_n": n, "mean": r(mean),
+            "p50": r(w[0]), "p95": r(w[1]), "p99": r(w[2]),
+            "session": {"p50": r(s[0]), "p95": r(s[1]), "p99": r(s[2]), "max": r(peak)},
+        }
@@ -0,0 +1,134 @@
+import sqlite3
+import logging
+import pandas as pd
+import config
+
+RFI_LABELS = ('RFI', 'INTERFERENCIA_TERRESTRE', 'NOISE')
+
+# table -> (key columns, rebuild SELECT producing key + value columns)
+# Must match the trigger logic in migrations/009_summary_tables.sql.
+REBUILD_SQL = {
+    "summary_events": (("type", "label", "hour"), """
+        SELECT type, COALESCE(label, 'UNKNOWN') AS label, substr(timestamp, 1, 13) AS hour,
+               COUNT(*) AS n, COALESCE(SUM(score), 0) AS score_sum
+        FROM events_all GROUP BY 1, 2, 3"""),
+    "summary_score_hist": (("type", "bucket"), """
+        SELECT type, CAST(score AS INTEGER) AS bucket, COUNT(*) AS n
+        FROM events_all WHERE score IS NOT NULL GROUP BY 1, 2"""),
+    "summary_rfi_freq": (("freq_bin",), f"""
+        SELECT CAST(round(fch1) AS INTEGER) AS freq_bin, COUNT(*) AS n FROM events_radio
+        WHERE fch1 IS NOT NULL AND label IN {RFI_LABELS} GROUP BY 1"""),
+    "summary_sources": (("source",), """
+        SELECT a.source_host AS source, COUNT(*) AS artifacts, COALESCE(SUM(a.size_bytes), 0) AS bytes,
+               SUM(a.status IS 'FAILED') AS failed, COALESCE(SUM(e.n), 0) AS events
+        FROM artifacts a LEFT JOIN (SELECT artifact_id, COUNT(*) AS n FROM events_all GROUP BY artifact_id) e
+             ON e.artifact_id = a.id
+        GROUP BY 1"""),
+}
+
+
+class DashboardSummary:
+    """
+    Reads the trigger-maintained summary tables (migration 009). Every reader is
+    a scan of a small aggregate table, independent of the number of events.
+    """
+
+    @staticmethod
+    def _query(sql, params=()):
+        conn = sqlite3.connect(config.DB_PATH)
+        try:
+            return pd.read_sql_query(sql, conn, params=params)
+        except Exception as e:
+            logging.warning(f"Summary read failed (schema not migrated yet?): {e}")
+            return pd.DataFrame()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def label_counts():
+        """type, label, n, mean_score over all time."""
+        return DashboardSummary._query("""
+            SELECT type, label, SUM(n) AS n, SUM(score_sum) / NULLIF(SUM(n), 0) AS mean_score
+            FROM summary_events GROUP BY type, label HAVING SUM(n) > 0 ORDER BY n DESC""")
+
+    @staticmethod
+    def hourly(hours=48):
+        """type, hour, n for the most recent `hours` hours that have events."""
+        return DashboardSummary._query("""
+            SELECT type, hour, SUM(n) AS n FROM summary_events
+            WHERE hour >= (SELECT MIN(hour) FROM (SELECT DISTINCT hour FROM summary_events ORDER BY hour DESC LIMIT ?))
+            GROUP BY type, hour HAVING SUM(n) > 0 ORDER BY hour""", (hours,))
+
+    @staticmethod
+    def score_histogram(event_type=None):
+        if event_type:
+            return DashboardSummary._query(
+                "SELECT bucket, n FROM summary_score_hist WHERE type = ? AND n > 0 ORDER BY bucket", (event_type,))
+        return DashboardSummary._query(
+            "SELECT bucket, SUM(n) AS n FROM summary_score_hist GROUP BY bucket HAVING SUM(n) > 0 ORDER BY bucket")
+
+    @staticmethod
+    def rfi_heatmap():
+        """freq_bin (MHz), count."""
+        return DashboardSummary._query(
+            "SELECT freq_bin, n AS count FROM summary_rfi_freq WHERE n > 0 ORDER BY freq_bin")
+
+    @staticmethod
+    def sources():
+        return DashboardSummary._query(
+            "SELECT source, artifacts, bytes, failed, events FROM summary_sources WHERE artifacts > 0 ORDER BY artifacts DESC")
+
+    @staticmethod
+    def totals():
+        """{'RADIO': n, 'IMAGE': n, ...} plus 'artifacts' and 'failed'."""
+        out = {}
+        df = DashboardSummary._query("SELECT type, SUM(n) AS n FROM summary_events GROUP BY type")
+        for _, r in df.iterrows():
+            out[r['type']] = int(r['n'])
+        df = DashboardSummary._query("SELECT SUM(artifacts) AS artifacts, SUM(failed) AS failed FROM summary_sources")
+        if not df.empty:
+            out['artifacts'] = int(df['artifacts'].iloc[0] or 0)
+            out['failed'] = int(df['failed'].iloc[0] or 0)
+        return out
+
+    # --- Consistency ---
+
+    @staticmethod
+    def check(db_path=None):
+        """
+        Recomputes every summary from the raw tables and compares.
+        Returns {table: [(key, stored, expected), ...]} for rows that differ.
+        """
+        conn = sqlite3.connect(db_path or config.DB_PATH)
+        diffs = {}
+        try:
+            for table, (keys, sql) in REBUILD_SQL.items():
+                expected = pd.read_sql_query(sql, conn)
+                stored = pd.read_sql_query(f"SELECT * FROM {table}", conn)
+                values = [c for c in expected.columns if c not in keys]
+                # Rows decremented to zero are equivalent to absent ones
+                stored = stored[(stored[values] != 0).any(axis=1)]
+                merged = stored.merge(expected, on=list(keys), how='outer', suffixes=('_stored', '_expected')).fillna(0)
+                bad = []
+                for _, r in merged.iterrows():
+                    s = tuple(r[f"{c}_stored"] for c in values)
+                    e = tuple(r[f"{c}_expected"] for c in values)
+                    if any(abs(a - b) > 1e-6 for a, b in zip(s, e)):
+                        bad.append((tuple(r[k] for k in keys), s, e))
+                if bad:
+                    diffs[table] = bad
+        finally:
+            conn.close()
+        return diffs
+
+    @staticmethod
+    def rebuild(db_path=None):
+        """Replaces every summary table with a fresh aggregate, in one transaction."""
+        conn = sqlite3.connect(db_path or config.DB_PATH)
+        try:
+            with conn:
+                for table, (keys, sql) in REBUILD_SQL.items():
+                    conn.execute(f"DELETE FROM {table}")
+                    conn.execute(f"INSERT INTO {table} SELECT * FROM ({sql})")
+        finally:
+            conn.close()
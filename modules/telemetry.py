@@ -5,6 +5,14 @@ import sqlite3
 import logging
 import datetime
 import config
+from modules.obs import Observability
+from modules import tracing
+from modules import metrics
+from modules import telemetry_rollup
+from modules.stream_stats import MetricSeries
+
+# In-memory series: throughput, queue depth (queued + active) and mean active workers per tick
+STREAM_METRICS = ("mbps_down", "mbps_up", "q_download", "q_analyze", "q_persist", "active_download", "active_analyze")
 
 class TelemetryMonitor:
     def __init__(self, pipeline_manager=None, db_path=None):
@@ -18,7 +26,17 @@ class TelemetryMonitor:
         self.last_time = time.time()
         
         self.peak_mbps_session = 0.0
-        self.metrics_history = [] # Ring buffer for p95 calc (last 60s)
+        self.latest = {} # Last sample, read by the pool autoscaler
+        # Ring buffer + quantile sketch per metric: percentiles without touching the DB
+        self.series = {m: MetricSeries(config.TELEMETRY_RING_SIZE, config.TELEMETRY_SKETCH_ACCURACY)
+                       for m in STREAM_METRICS}
+        self._busy_seen = {} # pool name -> busy_seconds() at the previous tick
+
+        # Raw rows awaiting the next batch insert, and the open 1m/1h rollup buckets
+        self._rows = []
+        self._rollups = []
+        self._rollup = telemetry_rollup.RollupBuffer()
+        self._last_flush = time.time()
         
     def start(self):
         if self.running: return
@@ -31,6 +49,8 @@ class TelemetryMonitor:
         self.running = False
         if self.thread:
             self.thread.join(timeout=2)
+        self._rollups.extend(self._rollup.drain())
+        self._flush()
             
     def _monitor_loop(self):
         # Init DB table if needed (handled by migrations usually, but just in case)
@@ -72,37 +92,87 @@ class TelemetryMonitor:
         ok_total, fail_total = 0, 0
         
         if self.pipeline:
-            q_dl = self.pipeline.q_download.qsize()
-            q_an = self.pipeline.q_analyze.qsize()
-            q_pe = self.pipeline.q_persist.qsize()
-            # Approximation of active workers (TODO: precise tracking require worker hooks)
-            # For now we assume if queue is moving, workers are active? 
-            # Better: PipelineManager should expose 'active_count'
-            pass
+            # Jobs held by each stage: waiting in its queue + in a worker's hands
+            pending = self.pipeline.pending()
+            disk = self.pipeline.disk.snapshot()
+            q_dl = pending["download"]["queued"] + pending["download"]["active"]
+            q_an = pending["analyze"]["queued"] + pending["analyze"]["active"]
+            q_pe = pending["persist"]["queued"] + pending["persist"]["active"]
+            act_dl = self._mean_active(self.pipeline.pool_download, pending["download"]["active"], dt)
+            act_an = self._mean_active(self.pipeline.pool_analyze, pending["analyze"]["active"], dt)
+            Observability.update_status({"queues": pending, "disk": disk, "stages": tracing.stats.summary()})
+
+            for stage in ("download", "analyze", "persist"):
+                for state in ("queued", "active"):
+                    metrics.QUEUE_DEPTH.labels(stage, state).set(pending[stage][state])
+            for pool in (self.pipeline.pool_download, self.pipeline.pool_analyze):
+                metrics.POOL_WORKERS.labels(pool.name, "size").set(pool.size)
+                metrics.POOL_WORKERS.labels(pool.name, "busy").set(pool.busy)
+            metrics.TEMP_CACHE_BYTES.labels("on_disk").set(disk["on_disk_bytes"])
+            metrics.TEMP_CACHE_BYTES.labels("reserved").set(disk["reserved_bytes"])
 
         # Update State
         self.last_net = current_net
         self.last_time = now
+        self.latest = {"ts": now, "mbps_down": mbps_down, "mbps_up": mbps_up, "plan_pct": plan_pct}
+
+        for name, value in (("mbps_down", mbps_down), ("mbps_up", mbps_up), ("q_download", q_dl),
+                            ("q_analyze", q_an), ("q_persist", q_pe),
+                            ("active_download", act_dl), ("active_analyze", act_an)):
+            self.series[name].add(value)
+        Observability.update_status({"telemetry": self.percentiles()})
         
-        # Write to DB
-        self._write_db(mbps_down, mbps_up, plan_pct, q_dl, q_an, q_pe)
+        # Buffer for the DB (batch insert every TELEMETRY_FLUSH_SEC)
+        self._buffer(now, mbps_down, mbps_up, plan_pct, q_dl, q_an, q_pe, act_dl, act_an)
+
+        # Prometheus textfile for the API's /metrics
+        metrics.NET_MBPS.labels("down").set(mbps_down)
+        metrics.NET_MBPS.labels("up").set(mbps_up)
+        metrics.REGISTRY.write_textfile()
         
-    def _write_db(self, down, up, plan, q_dl, q_an, q_pe):
-        ts = datetime.datetime.now().isoformat()
+    def _mean_active(self, pool, fallback, dt):
+        """Mean busy workers since the last tick, from the pool's busy-time integral (catches sub-second jobs)."""
+        if not hasattr(pool, "busy_seconds"): return fallback
+        area = pool.busy_seconds()
+        prev = self._busy_seen.get(pool.name)
+        self._busy_seen[pool.name] = area
+        return fallback if prev is None else (area - prev) / dt
+
+    def percentiles(self):
+        """{metric: last/mean/p50/p95/p99 over the ring window + session p50/p95/p99/max}."""
+        return {"ts": self.last_time, **{m: s.summary() for m, s in self.series.items()}}
+
+    def _buffer(self, now, down, up, plan, q_dl, q_an, q_pe, act_dl, act_an):
+        ts = datetime.datetime.fromtimestamp(now).isoformat()
+        self._rows.append((ts, down, up, self.peak_mbps_session, plan, act_dl, act_an, q_dl, q_an, q_pe))
+        sample = {"mbps_down": down, "mbps_up": up, "plan_pct": plan,
+                  "q_download": q_dl, "q_analyze": q_an, "q_persist": q_pe}
+        self._rollups.extend(self._rollup.add(now, sample))
+        if now - self._last_flush >= config.TELEMETRY_FLUSH_SEC or self._rollups:
+            self._flush()
+
+    def _flush(self):
+        """One connection/transaction for the buffered raw rows, closed rollup buckets and retention."""
+        rows, rollups = self._rows, self._rollups
+        self._last_flush = time.time()
+        if not rows and not rollups: return
+        conn = sqlite3.connect(self.db_path)
         try:
-            conn = sqlite3.connect(self.db_path)
-            c = conn.cursor()
-            c.execute("""
-                INSERT INTO telemetry (
-                    timestamp, mbps_down, mbps_up, mbps_peak_session, plan_usage_pct,
-                    q_download_size, q_analyze_size, q_persist_size
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (ts, down, up, self.peak_mbps_session, plan, q_dl, q_an, q_pe))
-            
-            # Retention Policy: Delete older than 1 hour to keep DB light?
-            # Or just keep it. SQLite can handle it.
-            
-            conn.commit()
+            with conn:
+                conn.executemany("""
+                    INSERT OR REPLACE INTO telemetry (
+                        timestamp, mbps_down, mbps_up, mbps_peak_session, plan_usage_pct,
+                        active_downloads, active_analysis, q_download_size, q_analyze_size, q_persist_size
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+                for table, values in rollups:
+                    conn.execute(telemetry_rollup.insert_sql(table), values)
+                if rollups:
+                    telemetry_rollup.apply_retention(conn) # Once per closed minute
+            self._rows, self._rollups = [], []
+        except Exception as e:
+            # DB locked: keep the batch for the next flush, but never grow without bound
+            logging.warning(f"Telemetry flush deferred: {e}")
+            self._rows, self._rollups = rows[-3600:], rollups[-120:]
+        finally:
             conn.close()
-        except Exception:
-            pass # Don't crash monitoring on DB lock
@@ -0,0 +1,110 @@
+"""
+Telemetry downsampling shared by the monitor (writer), the dashboard and the API.
+
+Resolutions: '1s' is the raw `telemetry` table; '1m' and '1h' are rollups
+(telemetry_1m / telemetry_1h) holding min/avg/max/p95 of each metric per
+bucket. The monitor keeps the open buckets' samples in memory and writes a
+rollup row when a bucket closes, so percentiles are exact, not averaged
+averages. Each resolution has its own retention (TELEMETRY_RETENTION_HOURS).
+
+Readers call pick_resolution(window) so a chart never pulls more than
+TELEMETRY_MAX_POINTS rows. Stdlib + config only (the API imports it).
+"""
+import datetime
+import config
+
+ROLLUP_METRICS = ("mbps_down", "mbps_up", "plan_pct", "q_download", "q_analyze", "q_persist")
+
+# name -> (table, time column, bucket seconds, key format)
+RESOLUTIONS = {
+    "1s": ("telemetry", "timestamp", 1, None),
+    "1m": ("telemetry_1m", "bucket", 60, "%Y-%m-%dT%H:%M"),
+    "1h": ("telemetry_1h", "bucket", 3600, "%Y-%m-%dT%H"),
+}
+
+
+def pick_resolution(window_sec):
+    """Finest resolution that covers window_sec in at most TELEMETRY_MAX_POINTS rows."""
+    for name, (_, _, step, _) in RESOLUTIONS.items():
+        if window_sec / step <= config.TELEMETRY_MAX_POINTS:
+            return name
+    return "1h"
+
+
+def time_key(ts, resolution):
+    """Sortable key for an epoch time at a resolution (raw rows use isoformat)."""
+    dt = datetime.datetime.fromtimestamp(ts)
+    fmt = RESOLUTIONS[resolution][3]
+    return dt.isoformat() if fmt is None else dt.strftime(fmt)
+
+
+def history_query(resolution):
+    """
+    SQL (one param: start key) giving uniform columns at any resolution:
+    timestamp, n, <metric> (avg), <metric>_min, <metric>_max, <metric>_p95.
+    """
+    table, col, _, _ = RESOLUTIONS[resolution]
+    if resolution == "1s":
+        raw = {"mbps_down": "mbps_down", "mbps_up": "mbps_up", "plan_pct": "plan_usage_pct",
+               "q_download": "q_download_size", "q_analyze": "q_analyze_size", "q_persist": "q_persist_size"}
+        cols = ", ".join(f"{raw[m]} AS {m}, {raw[m]} AS {m}_min, {raw[m]} AS {m}_max, {raw[m]} AS {m}_p95"
+                         for m in ROLLUP_METRICS)
+        return f"SELECT timestamp, 1 AS n, {cols} FROM telemetry WHERE timestamp >= ? ORDER BY timestamp"
+    cols = ", ".join(f"{m}_avg AS {m}, {m}_min, {m}_max, {m}_p95" for m in ROLLUP_METRICS)
+    return f"SELECT {col} AS timestamp, n, {cols} FROM {table} WHERE {col} >= ? ORDER BY {col}"
+
+
+def summarize(values):
+    """(min, avg, max, p95) of a non-empty list."""
+    s = sorted(values)
+    n = len(s)
+    return s[0], sum(s) / n, s[-1], s[min(n - 1, int(0.95 * n))]
+
+
+class RollupBuffer:
+    """Samples of the currently open 1m and 1h buckets."""
+
+    def __init__(self):
+        self._open = {res: (None, []) for res in RESOLUTIONS if res != "1s"}
+
+    def add(self, ts, sample):
+        """
+        sample: {metric: value} for ROLLUP_METRICS. Returns the rows of buckets
+        closed by this sample: [(table, values tuple)] ready for insert_sql().
+        """
+        closed = []
+        for res, (key, samples) in self._open.items():
+            k = time_key(ts, res)
+            if key is not None and k != key and samples:
+                closed.append(self._row(res, key, samples))
+                samples = []
+            samples.append(sample)
+            self._open[res] = (k, samples)
+        return closed
+
+    def drain(self):
+        """Rows for the still-open buckets (shutdown); a restart in the same bucket replaces them."""
+        rows = [self._row(res, key, samples) for res, (key, samples) in self._open.items() if samples]
+        self._open = {res: (None, []) for res in self._open}
+        return rows
+
+    @staticmethod
+    def _row(res, key, samples):
+        values = [key, len(samples)]
+        for m in ROLLUP_METRICS:
+            values.extend(summarize([s[m] for s in samples]))
+        return RESOLUTIONS[res][0], tuple(values)
+
+
+def insert_sql(table):
+    cols = ["bucket", "n"] + [f"{m}_{agg}" for m in ROLLUP_METRICS for agg in ("min", "avg", "max", "p95")]
+    return f"INSERT OR REPLACE INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})"
+
+
+def apply_retention(conn, now=None):
+    """Deletes rows older than each resolution's TELEMETRY_RETENTION_HOURS (indexed range deletes)."""
+    now = now or datetime.datetime.now().timestamp()
+    for res, (table, col, _, _) in RESOLUTIONS.items():
+        hours = config.TELEMETRY_RETENTION_HOURS.get(res)
+        if hours:
+            conn.execute(f"DELETE FROM {table} WHERE {col} < ?", (time_key(now - hours * 3600, res),))
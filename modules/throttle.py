@@ -0,0 +1,156 @@
+import os
+import math
+import time
+import logging
+import threading
+import psutil
+import config
+from modules.obs import Observability
+from modules import metrics
+
+
+class TokenBucket:
+    """Shared byte-rate limiter; consume() blocks the caller until its bytes fit. rate None = unlimited."""
+
+    def __init__(self, rate=None, burst_sec=1.0):
+        self.rate = rate
+        self.burst_sec = burst_sec
+        self.tokens = 0.0
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate):
+        with self._lock:
+            self.rate = rate
+            self.tokens = min(self.tokens, (rate or 0) * self.burst_sec)
+
+    def consume(self, n, cancel=None):
+        with self._lock:
+            if self.rate is None: return
+            now = time.monotonic()
+            self.tokens = min(self.rate * self.burst_sec, self.tokens + (now - self._last) * self.rate)
+            self._last = now
+            self.tokens -= n
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        # Debt is already booked, so concurrent callers queue up behind this one
+        while wait > 0:
+            if cancel is not None and cancel.is_set(): return
+            time.sleep(min(wait, 0.5))
+            wait -= 0.5
+
+
+# Download chunks from every harvester draw from this one bucket
+BANDWIDTH = TokenBucket()
+
+
+class Throttle:
+    """
+    Proportional background-load controller (replaces pausing on CPU/RAM).
+
+    level in [THROTTLE_MIN_LEVEL, 1] is nudged each update by THROTTLE_GAIN x the
+    headroom against the budgets (PAUSE_CPU_PCT / PAUSE_RAM_PCT, in points):
+    level rises while the host is under budget and falls while it is over, so
+    host load settles at the budget instead of oscillating pause/resume.
+    apply() maps it onto the pipeline:
+      - analyze concurrency: pool ceiling = level x MAX_ANALYZE_WORKERS
+      - download bandwidth: level x PLAN_MBPS (unlimited at level 1)
+      - process priority: nice up to THROTTLE_NICE_MAX (priority class on Windows)
+        and CPU affinity restricted to level x the original CPU set.
+        On POSIX an unprivileged process can raise its nice but never lower it again,
+        so nice is only part of the control when it can be undone (root or RLIMIT_NICE).
+    """
+
+    STEP = 0.05 # Levels are applied in these increments (avoids resizing on noise)
+
+    def __init__(self):
+        self.level = 1.0
+        self.applied = None
+        self.reason = "SYSTEM_OK"
+        self.state = {}
+        self._proc = psutil.Process()
+        self._nice_base = self._get_nice()
+        self._renice = self._can_renice()
+        self._nice_stuck = False # A renice towards the base value was refused
+        try:
+            self._cpus = self._proc.cpu_affinity() if hasattr(self._proc, "cpu_affinity") else None
+        except (psutil.AccessDenied, OSError):
+            self._cpus = None
+
+    def update(self, snap):
+        """Feeds one ResourceSampler snapshot; returns the new level."""
+        cpu_room = config.PAUSE_CPU_PCT - snap["cpu"]
+        ram_room = config.PAUSE_RAM_PCT - snap["ram"]
+        room = min(cpu_room, ram_room)
+        self.level = min(1.0, max(config.THROTTLE_MIN_LEVEL, self.level + config.THROTTLE_GAIN * room))
+        if self.level >= 1.0:
+            self.reason = "SYSTEM_OK"
+        else:
+            self.reason = f"CPU_HIGH: {snap['cpu']}%" if cpu_room <= ram_room else f"RAM_HIGH: {snap['ram']}%"
+        metrics.THROTTLE_LEVEL.set(self.level)
+        return self.level
+
+    def apply(self, pipeline):
+        """Pushes the current level to the pipeline and process (no-op unless it moved a STEP)."""
+        level = round(self.level / self.STEP) * self.STEP
+        if self.applied is not None and abs(level - self.applied) < 1e-9:
+            return
+        self.applied = level
+
+        an_cap = max(1, round(level * pipeline.pool_analyze.max_size))
+        pipeline.pool_analyze.cap(an_cap)
+        mbps = None if level >= 1.0 or not config.PLAN_MBPS else level * config.PLAN_MBPS
+        BANDWIDTH.set_rate(None if mbps is None else mbps * 1_000_000 / 8)
+        nice = self._set_priority(level)
+        cpus = self._set_affinity(level)
+
+        self.state = {"level": round(level, 2), "reason": self.reason, "analyze_cap": an_cap,
+                      "mbps_cap": mbps, "nice": nice, "nice_control": self._renice,
+                      "nice_stuck": self._nice_stuck, "cpus": cpus}
+        logging.info(f"🎚️ Throttle {level:.2f}: AN<={an_cap}, {mbps or 'unlimited'} Mbps, nice={nice}, cpus={cpus}")
+        Observability.log_event("THROTTLE", **self.state)
+
+    def _get_nice(self):
+        try:
+            return self._proc.nice()
+        except (psutil.AccessDenied, OSError):
+            return None
+
+    def _can_renice(self):
+        """True if the process may later lower its nice back to the current value."""
+        if os.name == "nt":
+            return True # Priority classes can be raised and lowered freely
+        if self._nice_base is None:
+            return False
+        try:
+            import resource
+            if os.geteuid() == 0:
+                return True
+            soft, _ = resource.getrlimit(resource.RLIMIT_NICE) # Lowest allowed nice = 20 - soft
+            return soft == resource.RLIM_INFINITY or 20 - soft <= self._nice_base
+        except (ImportError, AttributeError, ValueError, OSError):
+            return False
+
+    def _set_priority(self, level):
+        if not self._renice:
+            return self._get_nice() # Never renice what we could not undo
+        try:
+            if os.name == "nt":
+                classes = (psutil.NORMAL_PRIORITY_CLASS, psutil.BELOW_NORMAL_PRIORITY_CLASS, psutil.IDLE_PRIORITY_CLASS)
+                value = classes[min(2, int((1 - level) * 3))]
+            else:
+                value = self._nice_base + round((1 - level) * config.THROTTLE_NICE_MAX)
+            self._proc.nice(value)
+            self._nice_stuck = False
+        except (psutil.AccessDenied, OSError):
+            self._nice_stuck = True
+            logging.warning("🎚️ Throttle could not renice the daemon: priority stays where it is")
+        return self._get_nice()
+
+    def _set_affinity(self, level):
+        if not self._cpus: return None
+        k = max(1, math.ceil(level * len(self._cpus)))
+        try:
+            self._proc.cpu_affinity(self._cpus[:k])
+        except (psutil.AccessDenied, OSError, ValueError):
+            return None
+        return k
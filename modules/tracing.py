@@ -0,0 +1,99 @@
+import time
+import threading
+import collections
+from contextlib import contextmanager
+import config
+from modules.obs import Observability
+from modules import metrics
+
+# Current span chain per thread, so harvester sub-steps inherit the artifact id
+_ctx = threading.local()
+
+
+def _stack():
+    stack = getattr(_ctx, "stack", None)
+    if stack is None:
+        stack = _ctx.stack = []
+    return stack
+
+
+class StageStats:
+    """
+    Rolling per-stage latency samples (last TRACE_WINDOW_SECONDS, at most
+    TRACE_WINDOW_SIZE per stage). Percentiles are computed on demand by sorting,
+    which is cheap at these sizes and keeps record() O(1).
+    """
+
+    def __init__(self, window_seconds=None, max_samples=None):
+        self.window = window_seconds or config.TRACE_WINDOW_SECONDS
+        self.max_samples = max_samples or config.TRACE_WINDOW_SIZE
+        self._samples = {} # stage -> deque[(ts, seconds)]
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        with self._lock:
+            dq = self._samples.get(stage)
+            if dq is None:
+                dq = self._samples[stage] = collections.deque(maxlen=self.max_samples)
+            dq.append((time.time(), seconds))
+
+    def summary(self):
+        """{stage: {count, mean_ms, p50_ms, p95_ms, p99_ms}} over the rolling window."""
+        cutoff = time.time() - self.window
+        out = {}
+        with self._lock:
+            for stage, dq in self._samples.items():
+                while dq and dq[0][0] < cutoff:
+                    dq.popleft()
+                values = sorted(s for _, s in dq)
+                if not values: continue
+                n = len(values)
+                pct = lambda q: round(values[min(n - 1, int(q * n))] * 1000, 1)
+                out[stage] = {"count": n, "mean_ms": round(sum(values) / n * 1000, 1),
+                              "p50_ms": pct(0.50), "p95_ms": pct(0.95), "p99_ms": pct(0.99)}
+        return out
+
+
+stats = StageStats()
+
+
+def current_artifact():
+    stack = _stack()
+    return stack[-1][1] if stack else None
+
+
+def record(stage, seconds, artifact_id=None, **attrs):
+    """Records a duration measured elsewhere (e.g. queue wait) as a span."""
+    stats.record(stage, seconds)
+    metrics.STAGE_SECONDS.labels(stage).observe(seconds)
+    if config.TRACE_LOG_SPANS:
+        Observability.log_event("SPAN", stage=stage, artifact_id=artifact_id or current_artifact(),
+                                duration_ms=round(seconds * 1000, 2), **attrs)
+
+
+@contextmanager
+def span(stage, artifact_id=None, **attrs):
+    """
+    Times the enclosed block as `stage`. Nested spans (harvester sub-steps) inherit
+    the artifact id and record their parent stage.
+        with tracing.span("download", artifact_id=art_id): ...
+    """
+    stack = _stack()
+    parent = stack[-1][0] if stack else None
+    artifact_id = artifact_id or (stack[-1][1] if stack else None)
+    stack.append((stage, artifact_id))
+    ok = True
+    t0 = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        ok = False
+        raise
+    finally:
+        dt = time.perf_counter() - t0
+        stack.pop()
+        stats.record(stage, dt)
+        metrics.STAGE_SECONDS.labels(stage).observe(dt)
+        if config.TRACE_LOG_SPANS:
+            Observability.log_event("SPAN", stage=stage, artifact_id=artifact_id, parent=parent,
+                                    duration_ms=round(dt * 1000, 2), ok=ok, **attrs)
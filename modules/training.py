@@ -0,0 +1,236 @@
+"""
+Triage model training from labelled events.
+
+FeatureSnapshot keeps the training set on disk as append-only npz parts
+(X float32, label codes, ids) under FEATURE_SNAPSHOT_DIR, with a manifest holding
+the last event id extracted per table, the label vocabulary and the feature
+schema. Only rescore.SCORED_TABLES are snapshotted (images have no features yet).
+update() only reads events newer than that id, so retraining on millions of
+rows costs a keyset scan of the new ones plus an npz load.
+Parts are merged once there are more than FEATURE_SNAPSHOT_MAX_PARTS.
+A changed FEATURE_SCHEMA or table list (or --full) rebuilds the snapshot from scratch.
+Labels edited on already-snapshotted events are only picked up by a rebuild.
+
+ModelTrainer fits a RandomForest with n_jobs, evaluates it on a random
+TRAIN_HOLDOUT of rows, stores it as models/triage_<version>.pkl
+and records it in model_runs (bootstrap() does the same for the placeholder model). activate() points MODEL_PATH at a version;
+running TriageEngines pick it up through maybe_reload() (no restart).
+"""
+import os
+import json
+import time
+import shutil
+import sqlite3
+import logging
+import datetime
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+import config
+from modules.obs import Observability
+from modules.triage import MODEL_PATH, FEATURE_SCHEMA, column_matrix, model_version, bootstrap_classifier
+from modules.rescore import RESCORE_TABLES, SCORED_TABLES
+
+MODEL_DIR = os.path.dirname(MODEL_PATH)
+SCHEMA_ID = [name for name, _, _ in FEATURE_SCHEMA]
+
+
+class FeatureSnapshot:
+    def __init__(self, directory=None, db_path=None):
+        self.dir = directory or config.FEATURE_SNAPSHOT_DIR
+        self.db_path = db_path or config.DB_PATH
+        self.manifest_path = os.path.join(self.dir, "manifest.json")
+        self.manifest = self._read_manifest()
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, 'r') as f:
+                m = json.load(f)
+            if m.get("schema") == SCHEMA_ID and m.get("tables") == SCORED_TABLES:
+                return m
+            logging.info("🧮 Feature schema or tables changed: rebuilding the training snapshot")
+        except (OSError, ValueError):
+            pass
+        return {"schema": SCHEMA_ID, "tables": SCORED_TABLES, "last_id": {}, "labels": [], "parts": []}
+
+    def _write_manifest(self):
+        tmp = self.manifest_path + ".tmp"
+        with open(tmp, 'w') as f:
+            json.dump(self.manifest, f)
+        os.replace(tmp, self.manifest_path)
+
+    def reset(self):
+        for part in self.manifest["parts"]:
+            try:
+                os.remove(os.path.join(self.dir, part))
+            except OSError:
+                pass
+        self.manifest = {"schema": SCHEMA_ID, "tables": SCORED_TABLES, "last_id": {}, "labels": [], "parts": []}
+
+    def update(self, chunk_rows=None):
+        """Appends labelled events newer than the snapshot; returns the number of new rows."""
+        if not self.manifest["parts"] and os.path.isdir(self.dir):
+            # Orphan parts from an old schema are no longer referenced
+            for name in os.listdir(self.dir):
+                if name.startswith("part_"):
+                    os.remove(os.path.join(self.dir, name))
+        os.makedirs(self.dir, exist_ok=True)
+        chunk_rows = chunk_rows or config.RESCORE_CHUNK_ROWS
+        codes = {label: i for i, label in enumerate(self.manifest["labels"])}
+        conn = sqlite3.connect(self.db_path)
+        added = 0
+        try:
+            for table in SCORED_TABLES: # Feature-less tables (images) would teach their labels at X=0
+                cols = RESCORE_TABLES[table]
+                last_id = self.manifest["last_id"].get(table, 0)
+                select = ", ".join(["id", "label"] + list(cols.values()))
+                sql = f"SELECT {select} FROM {table} WHERE id > ? AND label IS NOT NULL ORDER BY id LIMIT ?"
+                Xs, ys, ids = [], [], []
+                while True:
+                    rows = conn.execute(sql, (last_id, chunk_rows)).fetchall()
+                    if not rows: break
+                    labels = [r[1] for r in rows]
+                    arr = np.array([(r[0],) + r[2:] for r in rows], dtype=float)
+                    Xs.append(column_matrix({name: arr[:, i + 1] for i, name in enumerate(cols)}, len(rows)).astype(np.float32))
+                    ys.append(np.array([codes.setdefault(l, len(codes)) for l in labels], dtype=np.int32))
+                    ids.append(arr[:, 0].astype(np.int64))
+                    last_id = int(ids[-1][-1])
+                if not ids: continue
+                part = f"part_{table}_{int(ids[0][0])}_{last_id}.npz"
+                np.savez(os.path.join(self.dir, part), X=np.concatenate(Xs), y=np.concatenate(ys), ids=np.concatenate(ids))
+                n = sum(len(i) for i in ids)
+                added += n
+                self.manifest["parts"].append(part)
+                self.manifest["last_id"][table] = last_id
+                self.manifest["labels"] = sorted(codes, key=codes.get)
+                self._write_manifest() # After each part: a crash never loses or duplicates rows
+        finally:
+            conn.close()
+        if len(self.manifest["parts"]) > config.FEATURE_SNAPSHOT_MAX_PARTS:
+            self._compact()
+        return added
+
+    def load(self):
+        """(X, y label codes, labels vocabulary), rows ordered by table then id."""
+        Xs, ys = [], []
+        for part in self.manifest["parts"]:
+            with np.load(os.path.join(self.dir, part)) as z:
+                Xs.append(z["X"])
+                ys.append(z["y"])
+        if not Xs:
+            return np.empty((0, len(FEATURE_SCHEMA)), np.float32), np.empty(0, np.int32), self.manifest["labels"]
+        return np.concatenate(Xs), np.concatenate(ys), self.manifest["labels"]
+
+    def _compact(self):
+        parts = self.manifest["parts"]
+        data = {k: [] for k in ("X", "y", "ids")}
+        for part in parts:
+            with np.load(os.path.join(self.dir, part)) as z:
+                for k in data:
+                    data[k].append(z[k])
+        name = f"part_merged_{int(time.time())}.npz"
+        np.savez(os.path.join(self.dir, name), **{k: np.concatenate(v) for k, v in data.items()})
+        self.manifest["parts"] = [name]
+        self._write_manifest()
+        for part in parts:
+            os.remove(os.path.join(self.dir, part))
+
+
+class ModelTrainer:
+    def __init__(self, db_path=None, snapshot=None, n_jobs=None, trees=None):
+        self.db_path = db_path or config.DB_PATH
+        self.snapshot = snapshot or FeatureSnapshot(db_path=self.db_path)
+        self.n_jobs = n_jobs or config.TRAIN_N_JOBS
+        self.trees = trees or config.TRAIN_TREES
+
+    def train(self, full=False, activate=True):
+        """Refreshes the snapshot, fits, registers in model_runs; returns the run's metrics dict."""
+        t0 = time.time()
+        if full:
+            self.snapshot.reset()
+        added = self.snapshot.update()
+        X, y, labels = self.snapshot.load()
+        t_load = time.time() - t0
+        if len(np.unique(y)) < 2:
+            raise ValueError(f"Need at least two labels to train (have {len(X)} rows, labels {labels})")
+
+        rng = np.random.default_rng(0)
+        if len(X) > config.TRAIN_MAX_ROWS:
+            keep = rng.choice(len(X), config.TRAIN_MAX_ROWS, replace=False)
+            X, y = X[keep], y[keep]
+        # Random holdout: the snapshot is grouped by table, so a tail split would hold out one table
+        order = rng.permutation(len(X))
+        n_hold = int(len(X) * config.TRAIN_HOLDOUT)
+        X_tr, y_tr, X_ho, y_ho = X[order[n_hold:]], y[order[n_hold:]], X[order[:n_hold]], y[order[:n_hold]]
+
+        t1 = time.time()
+        clf = RandomForestClassifier(n_estimators=self.trees, n_jobs=self.n_jobs, random_state=0)
+        clf.fit(X_tr, np.asarray(labels, dtype=object)[y_tr])
+        t_fit = time.time() - t1
+        clf.n_jobs = 1 # Triage predicts small batches inside worker threads: no per-call pool
+        holdout_acc = float((clf.predict(X_ho) == np.asarray(labels, dtype=object)[y_ho]).mean()) if n_hold else None
+
+        run = {"rows": int(len(X_tr)), "holdout_rows": n_hold, "holdout_accuracy": holdout_acc,
+               "new_rows": added, "classes": [str(c) for c in clf.classes_], "features": SCHEMA_ID,
+               "trees": self.trees, "n_jobs": self.n_jobs, "load_s": round(t_load, 2), "fit_s": round(t_fit, 2),
+               "snapshot_last_id": dict(self.snapshot.manifest["last_id"])}
+        version = self._store(clf, run)
+        Observability.log_event("MODEL_TRAINED", version=version, **{k: run[k] for k in ("rows", "holdout_accuracy", "fit_s")})
+        logging.info(f"🧠 Trained model {version}: {run['rows']} rows, holdout acc {holdout_acc}, fit {t_fit:.1f}s")
+        if activate:
+            self.activate(version)
+        return {"version": version, **run}
+
+    def bootstrap(self, activate=True):
+        """
+        Registers the placeholder model (triage.bootstrap_classifier) as a version, for when
+        there are too few labels to train(). Returns its version.
+        """
+        clf = bootstrap_classifier()
+        version = self._store(clf, {"bootstrap": True, "rows": 0, "holdout_accuracy": None,
+                                    "classes": [str(c) for c in clf.classes_], "features": SCHEMA_ID})
+        logging.info(f"🧠 Registered bootstrap model {version}")
+        if activate:
+            self.activate(version)
+        return version
+
+    def _store(self, clf, run):
+        """models/triage_<version>.pkl + a model_runs row (inactive); returns the version."""
+        os.makedirs(MODEL_DIR, exist_ok=True)
+        tmp = os.path.join(MODEL_DIR, f"triage_{int(time.time())}.tmp")
+        joblib.dump(clf, tmp)
+        version = model_version(tmp)
+        os.replace(tmp, os.path.join(MODEL_DIR, f"triage_{version}.pkl"))
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                conn.execute("""INSERT OR REPLACE INTO model_runs (version, trained_at, algorithm, metrics_json, is_active)
+                                VALUES (?, ?, ?, ?, 0)""",
+                             (version, datetime.datetime.now().isoformat(), type(clf).__name__, json.dumps(run)))
+        finally:
+            conn.close()
+        return version
+
+    def activate(self, version):
+        """Makes `version` the live model: model_runs.is_active + atomic replace of MODEL_PATH."""
+        src = os.path.join(MODEL_DIR, f"triage_{version}.pkl")
+        if not os.path.exists(src):
+            raise FileNotFoundError(f"No model file for version {version}")
+        tmp = MODEL_PATH + ".tmp"
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, MODEL_PATH) # Engines see a new mtime and reload (TriageEngine.maybe_reload)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                conn.execute("UPDATE model_runs SET is_active = (version = ?)", (version,))
+        finally:
+            conn.close()
+        Observability.log_event("MODEL_ACTIVATED", version=version)
+
+    def versions(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute("SELECT version, trained_at, algorithm, is_active, metrics_json FROM model_runs "
+                                "ORDER BY trained_at DESC").fetchall()
+        finally:
+            conn.close()
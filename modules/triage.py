@@ -1,14 +1,89 @@
 import os
+import time
+import hashlib
 import joblib
 import logging
+import threading
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.linear_model import LogisticRegression
 import config
+from modules import metrics
+from modules.obs import Observability
 
 MODEL_PATH = os.path.join(config.OMNISKY_ROOT, "models", "triage.pkl")
 
+# Model inputs, in column order: (name, result keys tried in order, vectorized transform).
+# Training and inference both build X with feature_matrix() so the columns always agree.
+FEATURE_SCHEMA = (
+    ("snr", ("snr", "sigma"), None),
+    ("drift", ("drift",), np.abs),
+)
+FEATURE_INDEX = {name: i for i, (name, _, _) in enumerate(FEATURE_SCHEMA)}
+
+
+def _first(record, keys):
+    for k in keys:
+        v = record.get(k)
+        if v: return v
+    return 0
+
+
+def feature_matrix(records):
+    """
+    Columnar (n, len(FEATURE_SCHEMA)) float matrix from feature dicts, plus a mask of
+    rows whose features were all numeric (the others are triaged as ERROR).
+    """
+    X = np.empty((len(records), len(FEATURE_SCHEMA)))
+    for j, (_, keys, transform) in enumerate(FEATURE_SCHEMA):
+        col = np.array([_first(r, keys) for r in records], dtype=object)
+        try:
+            X[:, j] = col.astype(float)
+        except (TypeError, ValueError):
+            X[:, j] = [_to_float(v) for v in col]
+        if transform is not None:
+            X[:, j] = transform(X[:, j])
+    return X, ~np.isnan(X).any(axis=1)
+
+
+def column_matrix(columns, n):
+    """
+    Same matrix from columns already fetched as arrays ({feature name: values}, e.g.
+    straight from SQL). NULL/NaN and features the source lacks count as 0, like a
+    missing key in feature_matrix().
+    """
+    X = np.zeros((n, len(FEATURE_SCHEMA)))
+    for j, (name, _, transform) in enumerate(FEATURE_SCHEMA):
+        if name in columns:
+            col = np.nan_to_num(np.asarray(columns[name], dtype=float))
+            X[:, j] = col if transform is None else transform(col)
+    return X
+
+
+def model_version(model_path):
+    """Content hash of a model file: its id in model_runs (training, re-scoring, hot-swap)."""
+    h = hashlib.sha256()
+    with open(model_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()[:12]
+
+
+def _to_float(v):
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return np.nan
+
+def bootstrap_classifier():
+    """Tiny classifier fitted on fake rows: a valid model before any events are labelled."""
+    X, _ = feature_matrix([{"snr": 10, "drift": 0.0}, {"snr": 5, "drift": 1.0},
+                           {"snr": 2, "drift": 0.5}, {"snr": 50, "drift": 0.0}])
+    y = ["NOISE", "CANDIDATE", "NOISE", "CANDIDATE"]
+    return RandomForestClassifier(n_estimators=10).fit(X, y)
+
+
 class TriageEngine:
     """
     Local Machine Learning Engine for Event Classification.
@@ -18,27 +93,51 @@ class TriageEngine:
     def __init__(self):
         self.model = None
         self.is_ready = False
+        self.version = None
+        self._mtime = None
+        self._checked = 0.0
         self._load_model()
         
     def _load_model(self):
         if os.path.exists(MODEL_PATH):
             try:
-                self.model = joblib.load(MODEL_PATH)
+                mtime = os.path.getmtime(MODEL_PATH)
+                model = joblib.load(MODEL_PATH)
+                # One reference swap: a batch in flight keeps the model it started with
+                self.model, self.version, self._mtime = model, model_version(MODEL_PATH), mtime
                 self.is_ready = True
-                logging.info("🧠 ML Triage Model Loaded")
+                logging.info(f"🧠 ML Triage Model Loaded ({self.version})")
             except Exception as e:
                 logging.warning(f"Failed to load ML model: {e}")
         else:
             logging.info("🧠 No ML model found. Triage running in Heuristic Mode.")
+
+    def maybe_reload(self):
+        """
+        Hot-swap: reloads MODEL_PATH when it changed on disk (training activates a
+        model by replacing that file). Checks at most every TRIAGE_RELOAD_CHECK_SEC.
+        Returns True if a new model was loaded.
+        """
+        now = time.monotonic()
+        if now - self._checked < config.TRIAGE_RELOAD_CHECK_SEC:
+            return False
+        self._checked = now
+        try:
+            mtime = os.path.getmtime(MODEL_PATH)
+        except OSError:
+            return False
+        if mtime == self._mtime:
+            return False
+        old = self.version
+        self._load_model()
+        if self.version != old:
+            Observability.log_event("MODEL_SWAP", old=old, new=self.version)
+            return True
+        return False
             
     def train_dummy(self):
         """Trains a initial dummy model to enable the feature."""
-        # Fake data just to have a valid .pkl structure
-        X = [[10, 0.0], [5, 1.0], [2, 0.5], [50, 0.0]] # SNR, Drift
-        y = ["NOISE", "CANDIDATE", "NOISE", "CANDIDATE"]
-        
-        clf = RandomForestClassifier(n_estimators=10)
-        clf.fit(X, y)
+        clf = bootstrap_classifier()
         
         if not os.path.exists(os.path.dirname(MODEL_PATH)):
             os.makedirs(os.path.dirname(MODEL_PATH))
@@ -52,50 +151,115 @@ class TriageEngine:
         """
         Returns {score: 0-100, label: str, confidence: float, method: 'ML'|'HEURISTIC'}
         """
-        # 1. Feature Extraction / Cleaning
-        try:
-            snr = float(features.get('snr', 0) or features.get('sigma', 0))
-            drift = abs(float(features.get('drift', 0)))
-            
-            # ML Prediction
-            if self.is_ready and self.model:
+        return self.analyze_batch([features])[0]
+
+    def analyze_batch(self, records):
+        """
+        Triage of many events at once: one feature matrix, one predict_proba.
+        records: list of feature dicts. Returns one analyze()-style dict per record.
+        """
+        X, ok = feature_matrix(records)
+        n = len(records)
+        score = np.zeros(n)
+        conf = np.zeros(n)
+        label = np.full(n, "ERROR", dtype=object)
+        method = "HEURISTIC"
+
+        if ok.any():
+            Xv = X[ok]
+            done = False
+            model = self.model
+            if self.is_ready and model:
                 try:
-                    # Input vector must match training. This is a simplification.
-                    # In real pro app, we use a named feature vector or DictVectorizer.
-                    # For minimal implementation we assume [snr, drift]
-                    vector = [[snr, drift]]
-                    pred_label = self.model.predict(vector)[0]
-                    pred_prob = np.max(self.model.predict_proba(vector))
-                    
-                    return {
-                        "score": pred_prob * 100,
-                        "label": pred_label,
-                        "confidence": pred_prob,
-                        "method": "ML_RF"
-                    }
-                except:
-                    pass # Fallback to Heuristic
-            
-            # Heuristic Fallback
-            score = 0
-            label = "NOISE"
-            
-            if snr > 10:
-                score += 50
-            if snr > 50:
-                score += 30
-            if 0.1 < drift < 2.0: # Moderate drift is good for ET
-                score += 20
-                
-            if score > 60: label = "CANDIDATE"
-            
-            return {
-                "score": score,
-                "label": label,
-                "confidence": 1.0, # Artificial confidence
-                "method": "HEURISTIC"
-            }
-            
-        except Exception as e:
-            logging.error(f"Triage Error: {e}")
-            return {"score": 0, "label": "ERROR", "confidence": 0, "method": "FAIL"}
+                    proba = model.predict_proba(Xv)
+                    best = proba.argmax(axis=1)
+                    p = proba[np.arange(len(best)), best]
+                    score[ok], conf[ok], label[ok] = p * 100, p, model.classes_[best]
+                    method, done = "ML_RF", True
+                except Exception as e:
+                    logging.warning(f"ML triage failed, using heuristic: {e}")
+            if not done:
+                snr, drift = Xv[:, FEATURE_INDEX["snr"]], Xv[:, FEATURE_INDEX["drift"]]
+                h = 50.0 * (snr > 10) + 30.0 * (snr > 50) + 20.0 * ((drift > 0.1) & (drift < 2.0)) # Moderate drift is good for ET
+                score[ok], conf[ok] = h, 1.0 # Artificial confidence
+                label[ok] = np.where(h > 60, "CANDIDATE", "NOISE")
+
+        return [{"score": float(score[i]), "label": label[i], "confidence": float(conf[i]),
+                 "method": method if ok[i] else "FAIL"} for i in range(n)]
+
+
+class TriageBatcher:
+    """
+    Batch triage stage behind persist: events are queued as they are written and
+    triaged together once TRIAGE_BATCH_SIZE are pending or the oldest has waited
+    TRIAGE_BATCH_MAX_WAIT_SEC; ml_score/ml_label go back in one bulk UPDATE.
+    """
+
+    def __init__(self, engine, db, batch_size=None, max_wait=None):
+        self.engine = engine
+        self.db = db
+        self.batch_size = batch_size or config.TRIAGE_BATCH_SIZE
+        self.max_wait = max_wait or config.TRIAGE_BATCH_MAX_WAIT_SEC
+        self.running = False
+        self.thread = None
+        self._pending = [] # (event_type, event_id, feature dict)
+        self._oldest = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+
+    def start(self):
+        if self.running: return
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, name="triage-batch", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stops the timer thread and triages whatever is still pending."""
+        self.running = False
+        self._wake.set()
+        if self.thread:
+            self.thread.join(timeout=5)
+        self.flush()
+
+    def add(self, event_type, event_id, features):
+        """Queues an event for triage; events carrying none of the schema features (IMAGE) are skipped."""
+        keys = {k for _, names, _ in FEATURE_SCHEMA for k in names}
+        if all(features.get(k) is None for k in keys):
+            return
+        with self._lock:
+            self._pending.append((event_type, event_id, {k: features.get(k) for k in keys}))
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def _loop(self):
+        while self.running:
+            self._wake.wait(timeout=self.max_wait / 4)
+            self._wake.clear()
+            with self._lock:
+                due = self._pending and (len(self._pending) >= self.batch_size
+                                         or time.monotonic() - self._oldest >= self.max_wait)
+            if due:
+                self.flush()
+
+    def flush(self):
+        """Triages up to batch_size pending events per round until none are left; returns the count."""
+        total = 0
+        while True:
+            with self._lock:
+                batch, self._pending = self._pending[:self.batch_size], self._pending[self.batch_size:]
+                self._oldest = time.monotonic() if self._pending else None
+            if not batch:
+                return total
+            try:
+                self.engine.maybe_reload()
+                results = self.engine.analyze_batch([f for _, _, f in batch])
+                rows = [(t, eid, r["score"], r["label"]) for (t, eid, _), r in zip(batch, results) if r["method"] != "FAIL"]
+                self.db.update_event_triage(rows)
+                metrics.JOBS.labels("triage", "ok").inc(len(rows))
+            except Exception as e:
+                metrics.JOBS.labels("triage", "error").inc(len(batch))
+                logging.error(f"Triage batch of {len(batch)} failed: {e}")
+            total += len(batch)
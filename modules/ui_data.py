@@ -1,12 +1,15 @@
 import sqlite3
 import pandas as pd
+import numpy as np
 import os
 import config
 import logging
+from modules.evidence_paths import PathResolver
 
 # --- CONSTANTS ---
 DB_PATH = config.DB_PATH
 OMNISKY_ROOT = config.OMNISKY_ROOT
+_resolver = PathResolver([os.getcwd(), OMNISKY_ROOT]) # Project root (CWD), then data dir
 
 class UIDataLoader:
     """
@@ -47,144 +50,119 @@ class UIDataLoader:
         return 'TEST' # Fallback
 
     @staticmethod
-    def fetch_all_events(limit=1000):
-        conn = UIDataLoader.get_connection()
-        
-        # --- 1. Radio Events (New) ---
-        q_radio = """
-            SELECT 
-                r.id as event_id,
-                r.timestamp, 
-                a.filename as object_name, 
-                r.label as classification, 
-                r.snr as data_value, -- Renamed for generic usage
-                'SNR' as value_unit,
-                r.fch1 as frequency,
-                r.path_audio_raw, 
-                r.path_audio_clean,
+    def classify_origins(df):
+        """Vectorized classify_origin over a whole frame (same rules, no per-row Python)."""
+        if df.empty:
+            return pd.Series([], index=df.index, dtype=object)
+        col = lambda name: df[name].astype(str) if name in df else pd.Series('', index=df.index)
+        typ = col('type').str.upper()
+        source = col('source_url').str.lower()
+        obj_name = col('object_name').str.lower()
+
+        flagged = typ.isin(['LEGACY', 'TEST']) | (col('classification').str.upper() == 'TEST')
+        mock = source.isin(['n/a', 'none', '']) & obj_name.str.contains('artifact|test|mock', regex=True)
+        real = ~flagged & ~mock & df['type'].isin(['RADIO', 'IMAGE'])
+        return pd.Series(np.where(real, 'REAL', 'TEST'), index=df.index)
+
+    # One SELECT per source; each branch walks its newest rows by index and stops at
+    # :limit, so the outer ORDER BY/LIMIT only sorts 3 x limit rows.
+    _Q_EVENTS = """
+        SELECT * FROM (
+            SELECT
+                r.id as event_id, r.timestamp, a.filename as object_name, r.label as classification,
+                r.snr as data_value, 'SNR' as value_unit, r.fch1 as frequency,
+                r.path_audio_raw, r.path_audio_clean,
                 r.path_waterfall as path_visual_main, -- PNG
                 r.path_npz as path_data_aux, -- NPZ
-                'RADIO' as type,
-                a.source_url,
-                a.file_hash,
-                a.size_bytes,
-                a.id as artifact_id
-            FROM events_radio r
+                'RADIO' as type, a.source_url, a.file_hash, a.size_bytes, a.id as artifact_id,
+                NULL as ra, NULL as dec
+            FROM (SELECT event_id FROM events_all WHERE type = 'RADIO' AND event_id > :radio_after
+                  ORDER BY timestamp DESC LIMIT :limit) e
+            JOIN events_radio r ON r.id = e.event_id
             JOIN artifacts a ON r.artifact_id = a.id
-        """
-        
-        # --- 2. Image Events (New) ---
-        q_image = """
-            SELECT 
-                i.id as event_id,
-                i.timestamp, 
-                a.filename as object_name, 
-                i.label as classification, 
-                i.score as data_value, -- Sigma/Score
-                'SIGMA' as value_unit,
-                0 as frequency,
-                NULL as path_audio_raw, 
-                NULL as path_audio_clean,
-                i.path_annotated as path_visual_main,
-                i.path_cutout as path_data_aux,
-                'IMAGE' as type,
-                a.source_url,
-                a.file_hash,
-                a.size_bytes,
-                a.id as artifact_id,
-                i.ra,
-                i.dec
-            FROM events_image i
+        UNION ALL
+            SELECT
+                i.id, i.timestamp, a.filename, i.label,
+                i.score, 'SIGMA', 0,
+                NULL, NULL,
+                i.path_annotated, i.path_cutout,
+                'IMAGE', a.source_url, a.file_hash, a.size_bytes, a.id,
+                i.ra, i.dec
+            FROM (SELECT event_id FROM events_all WHERE type = 'IMAGE' AND event_id > :image_after
+                  ORDER BY timestamp DESC LIMIT :limit) e
+            JOIN events_image i ON i.id = e.event_id
             JOIN artifacts a ON i.artifact_id = a.id
-        """
-        
-        # --- 3. Legacy (Hallazgos) ---
-        # Robust check if table exists
-        has_legacy = False
-        try:
-            pd.read_sql_query("SELECT 1 FROM hallazgos LIMIT 1", conn)
-            has_legacy = True
-        except:
-            pass
+        UNION ALL
+            SELECT
+                id, timestamp, nombre_objeto, clasificacion,
+                snr, 'SNR', frecuencia,
+                ruta_audio, NULL,
+                NULL, NULL,
+                'LEGACY', 'N/A', NULL, 0, NULL,
+                NULL, NULL
+            FROM (SELECT * FROM hallazgos WHERE id > :legacy_after
+                  ORDER BY id DESC LIMIT :limit) -- rowid order == insert order; no sort needed
+        )
+        ORDER BY timestamp DESC
+        LIMIT :limit
+    """
 
-        dfs = []
-        
-        try:
-            dfs.append(pd.read_sql_query(q_radio, conn))
-        except Exception: pass # Maybe table doesn't exist yet
-        
+    @staticmethod
+    def fetch_all_events(limit=1000, after_ids=None):
+        """
+        Newest `limit` events across radio, image and legacy rows, merged and ordered in SQL.
+        after_ids: {'RADIO': id, 'IMAGE': id, 'LEGACY': id} -> only rows newer than those (incremental).
+        """
+        after_ids = after_ids or {}
+        params = {
+            'limit': limit,
+            'radio_after': after_ids.get('RADIO', 0),
+            'image_after': after_ids.get('IMAGE', 0),
+            'legacy_after': after_ids.get('LEGACY', 0),
+        }
+        conn = UIDataLoader.get_connection()
         try:
-            dfs.append(pd.read_sql_query(q_image, conn))
-        except Exception: pass
-        
-        if has_legacy:
-            q_legacy = """
-            SELECT
-                id as event_id,
-                timestamp,
-                nombre_objeto as object_name,
-                clasificacion as classification,
-                snr as data_value,
-                'SNR' as value_unit,
-                frecuencia as frequency,
-                ruta_audio as path_audio_raw,
-                NULL as path_audio_clean,
-                NULL as path_visual_main,
-                NULL as path_data_aux,
-                'LEGACY' as type,
-                'N/A' as source_url,
-                NULL as file_hash,
-                0 as size_bytes,
-                NULL as artifact_id
-            FROM hallazgos
-            """
-            try:
-                dfs.append(pd.read_sql_query(q_legacy, conn))
-            except Exception: pass
+            df = pd.read_sql_query(UIDataLoader._Q_EVENTS, conn, params=params)
+        except Exception as e:
+            logging.warning(f"UI event query failed (schema not migrated yet?): {e}")
+            df = pd.DataFrame()
+        finally:
+            conn.close()
 
-        conn.close()
-        
-        if not dfs:
+        if df.empty:
             return pd.DataFrame(columns=['event_id', 'timestamp', 'object_name', 'classification', 'data_origin', 'type'])
 
-        # Merge
-        df = pd.concat(dfs, ignore_index=True)
-        
         # Normalize
         df['timestamp'] = pd.to_datetime(df['timestamp'], errors='coerce')
         df['data_value'] = pd.to_numeric(df['data_value'], errors='coerce').fillna(0)
         df['classification'] = df['classification'].fillna('UNKNOWN')
-        
+
         # Apply Origin Logic
-        df['data_origin'] = df.apply(UIDataLoader.classify_origin, axis=1)
-        
-        # Sort
-        df.sort_values(by='timestamp', ascending=False, inplace=True)
-        
-        # Limit
-        return df.head(limit)
+        df['data_origin'] = UIDataLoader.classify_origins(df)
+        return df
+
+    @staticmethod
+    def refresh_events(df, limit=1000):
+        """
+        Incremental refresh: fetches only rows with ids above the newest already in `df`
+        (ids only grow per table) and merges them in. Edits to already-loaded rows are
+        picked up on the next full load (Refresh button / cache clear).
+        """
+        if df is None or df.empty or 'type' not in df:
+            return UIDataLoader.fetch_all_events(limit)
+        last = df.groupby('type')['event_id'].max()
+        after_ids = {t: int(last[t]) for t in ('RADIO', 'IMAGE', 'LEGACY') if t in last}
+        new = UIDataLoader.fetch_all_events(limit, after_ids)
+        if new.empty:
+            return df
+        merged = pd.concat([new, df], ignore_index=True)
+        merged.sort_values(by='timestamp', ascending=False, inplace=True, kind='stable')
+        return merged.head(limit).reset_index(drop=True)
 
     @staticmethod
     def resolve_path(path_str):
         """
         Resolves a path to (absolute_path, exists_bool, details_str).
-        Handles relative, absolute, and legacy paths.
+        Handles relative, absolute, and legacy paths; hits are cached per stored path.
         """
-        if not path_str or str(path_str).lower() in ['none', 'nan', '', 'null']:
-            return None, False, "Path is Empty/None"
-
-        # 1. Absolute
-        if os.path.exists(path_str):
-            return os.path.abspath(path_str), True, "OK (Absolute)"
-
-        # 2. Relative to Project Root (CWD)
-        abs_cwd = os.path.abspath(path_str)
-        if os.path.exists(abs_cwd):
-            return abs_cwd, True, "OK (Relative CWD)"
-
-        # 3. Relative to OMNISKY_ROOT (Data Dir)
-        abs_data = os.path.join(OMNISKY_ROOT, path_str)
-        if os.path.exists(abs_data):
-            return os.path.abspath(abs_data), True, f"OK ({OMNISKY_ROOT})"
-            
-        return abs_cwd, False, "File Not Found"
+        return _resolver.resolve(path_str)
@@ -0,0 +1,108 @@
+import time
+import queue
+import logging
+import threading
+
+
+class ElasticPool:
+    """
+    Resizable pool of worker threads that pull jobs straight from a stage queue.
+    Unlike ThreadPoolExecutor there is no hidden internal queue: a job leaves the
+    scheduler only when a worker is free, and resize() takes effect between jobs.
+    """
+
+    def __init__(self, name, source_queue, handler, size, min_size=1, max_size=None):
+        self.name = name
+        self.queue = source_queue
+        self.handler = handler
+        self.min_size = min_size
+        self.max_size = max_size or size
+        self.size = max(min_size, min(size, self.max_size))
+        self.wanted = self.size # Last size asked for via resize(); cap() may hold size below it
+        self.ceiling = self.max_size
+        self.busy = 0
+        self.completed = 0
+        self._busy_area = 0.0 # Integral of busy over time (worker-seconds), see busy_seconds()
+        self._busy_at = time.perf_counter()
+        self.latency_ewma = None # seconds per job
+        self.running = False
+        self.paused = False # Workers finish their current job but take no new ones
+        self._live = 0
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def start(self):
+        self.running = True
+        self.resize(self.size)
+
+    def stop(self):
+        self.running = False
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def busy_seconds(self):
+        """Worker-seconds spent in jobs since start; its delta over dt is the mean active workers."""
+        with self._lock:
+            return self._busy_area + self.busy * (time.perf_counter() - self._busy_at)
+
+    def _mark_busy(self, delta):
+        # Caller holds _lock
+        now = time.perf_counter()
+        self._busy_area += self.busy * (now - self._busy_at)
+        self._busy_at = now
+        self.busy += delta
+
+    def cap(self, n):
+        """Temporary ceiling below max_size (throttling); raising it restores the last wanted size."""
+        self.ceiling = max(self.min_size, min(n, self.max_size))
+        return self.resize(self.wanted)
+
+    def resize(self, n):
+        """Clamps to [min_size, max_size] and the cap; spawns workers now, surplus ones retire after their current job."""
+        self.wanted = max(self.min_size, min(n, self.max_size))
+        n = max(self.min_size, min(self.wanted, self.ceiling))
+        with self._lock:
+            self.size = n
+            if not self.running:
+                return n
+            while self._live < n:
+                self._live += 1
+                self._seq += 1
+                threading.Thread(target=self._worker, name=f"{self.name}-{self._seq}", daemon=True).start()
+        return n
+
+    def _worker(self):
+        while self.running:
+            with self._lock:
+                if self._live > self.size:
+                    self._live -= 1
+                    return
+            if self.paused:
+                time.sleep(0.2)
+                continue
+            try:
+                job = self.queue.get(timeout=1)
+            except queue.Empty:
+                continue
+
+            with self._lock:
+                self._mark_busy(1)
+            t0 = time.perf_counter()
+            try:
+                self.handler(job)
+            except Exception as e:
+                logging.error(f"{self.name} worker error: {e}")
+            finally:
+                dt = time.perf_counter() - t0
+                with self._lock:
+                    self._mark_busy(-1)
+                    self.completed += 1
+                    self.latency_ewma = dt if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * dt
+                self.queue.task_done()
+
+        with self._lock:
+            self._live -= 1
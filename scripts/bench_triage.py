@@ -0,0 +1,100 @@
+"""
+Triage throughput: events/sec for batch sizes 1..4096, inference alone and with
+the bulk ml_score/ml_label write-back, against the old per-event path
+(predict + predict_proba + one UPDATE per event).
+
+    python scripts/bench_triage.py [--trees 50]
+"""
+import os
+import sys
+import time
+import sqlite3
+import argparse
+import tempfile
+import datetime
+import numpy as np
+
+# Ensure modules in path
+sys.path.append(os.getcwd())
+import config
+
+# Throwaway DB so the benchmark never touches the real vault
+_tmp = tempfile.mkdtemp(prefix="omnisky_bench_")
+config.DB_PATH = os.path.join(_tmp, "bench.db")
+
+from sklearn.ensemble import RandomForestClassifier
+from modules.database_manager import DatabaseManager
+from modules.triage import TriageEngine, feature_matrix
+
+BATCH_SIZES = (1, 4, 16, 64, 256, 1024, 4096)
+N_EVENTS = 8192
+MIN_EVENTS = 256 # Small batch sizes run over fewer events (same per-event cost, shorter wall time)
+
+
+def make_events(db, n, rng):
+    records = [{"snr": float(s), "drift": float(d)}
+               for s, d in zip(rng.lognormal(2.5, 1.0, n), rng.normal(0, 1.0, n))]
+    now = datetime.datetime.now().isoformat()
+    conn = db.get_connection()
+    with conn:
+        conn.executemany("INSERT INTO events_radio (artifact_id, timestamp, snr, drift_rate, score, label) VALUES (0, ?, ?, ?, 0, 'NOISE')",
+                         [(now, r["snr"], r["drift"]) for r in records])
+    ids = [row[0] for row in conn.execute("SELECT id FROM events_radio ORDER BY id")]
+    conn.close()
+    return records, ids
+
+
+def legacy(engine, db, records, ids):
+    """Old TriageEngine.analyze + a write per event."""
+    model = engine.model
+    t0 = time.perf_counter()
+    for r, eid in zip(records, ids):
+        vector = [[float(r.get('snr', 0) or r.get('sigma', 0)), abs(float(r.get('drift', 0)))]]
+        label = model.predict(vector)[0]
+        prob = np.max(model.predict_proba(vector))
+        conn = sqlite3.connect(db.db_path)
+        conn.execute("UPDATE events_radio SET ml_score = ?, ml_label = ? WHERE id = ?", (prob * 100, label, eid))
+        conn.commit()
+        conn.close()
+    return len(records) / (time.perf_counter() - t0)
+
+
+def batched(engine, db, records, ids, bs, write):
+    t0 = time.perf_counter()
+    for i in range(0, len(records), bs):
+        results = engine.analyze_batch(records[i:i + bs])
+        if write:
+            db.update_event_triage([("RADIO", eid, r["score"], r["label"]) for eid, r in zip(ids[i:i + bs], results)])
+    return len(records) / (time.perf_counter() - t0)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Batch triage benchmark")
+    ap.add_argument("--trees", type=int, default=50, help="RandomForest size (inference cost per call)")
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    db = DatabaseManager(config.DB_PATH)
+    records, ids = make_events(db, N_EVENTS, rng)
+
+    # Same model for every run, trained through the feature schema
+    X, _ = feature_matrix(records)
+    y = np.where((X[:, 0] > 15) & (X[:, 1] > 0.1), "CANDIDATE", "NOISE")
+    engine = TriageEngine()
+    engine.model = RandomForestClassifier(n_estimators=args.trees, random_state=0).fit(X, y)
+    engine.is_ready = True
+
+    n = MIN_EVENTS
+    base = legacy(engine, db, records[:n], ids[:n])
+    print(f"Triage benchmark: RandomForest({args.trees} trees), {N_EVENTS} events")
+    print(f"{'batch':>6} {'events':>7} {'infer ev/s':>12} {'+write ev/s':>12} {'vs legacy':>10}")
+    print(f"{'legacy':>6} {n:>7} {'':>12} {base:>12.0f} {1.0:>9.1f}x")
+    for bs in BATCH_SIZES:
+        n = min(N_EVENTS, max(MIN_EVENTS, bs * 4))
+        infer = batched(engine, db, records[:n], ids[:n], bs, write=False)
+        full = batched(engine, db, records[:n], ids[:n], bs, write=True)
+        print(f"{bs:>6} {n:>7} {infer:>12.0f} {full:>12.0f} {full / base:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
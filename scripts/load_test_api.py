@@ -0,0 +1,79 @@
+"""
+Load test for the Command Center API: N concurrent keep-alive clients hammer
+one or more endpoints for a fixed time and report req/s and tail latency.
+
+    python scripts/load_test_api.py --url http://127.0.0.1:8000 --concurrency 32 --seconds 15 \
+        --path "/events?limit=50" --path "/events?type=RADIO&min_score=5"
+
+Stdlib only (http.client per thread), so it measures the server, not the client library.
+"""
+import sys
+import time
+import argparse
+import threading
+import http.client
+from urllib.parse import urlsplit
+
+
+def worker(host, port, paths, stop_at, latencies, errors, idx):
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    i = idx
+    while time.perf_counter() < stop_at:
+        path = paths[i % len(paths)]
+        i += 1
+        t0 = time.perf_counter()
+        try:
+            conn.request("GET", path)
+            resp = conn.getresponse()
+            resp.read()
+            if resp.status >= 400:
+                errors.append(resp.status)
+                continue
+        except Exception as e:
+            errors.append(type(e).__name__)
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - t0)
+    conn.close()
+
+
+def percentile(values, q):
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--url", default="http://127.0.0.1:8000")
+    ap.add_argument("--path", action="append", help="Endpoint to hit (repeatable, round-robin)")
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--seconds", type=float, default=10)
+    args = ap.parse_args()
+
+    u = urlsplit(args.url)
+    paths = args.path or ["/events?limit=50"]
+    latencies, errors = [], [] # list.append is atomic under the GIL
+    stop_at = time.perf_counter() + args.seconds
+    threads = [threading.Thread(target=worker, args=(u.hostname, u.port or 80, paths, stop_at, latencies, errors, i))
+               for i in range(args.concurrency)]
+    t0 = time.perf_counter()
+    for t in threads: t.start()
+    for t in threads: t.join()
+    elapsed = time.perf_counter() - t0
+
+    lat = sorted(latencies)
+    print(f"Endpoints:   {', '.join(paths)}")
+    print(f"Clients:     {args.concurrency}  Duration: {elapsed:.1f}s")
+    print(f"Requests:    {len(lat)} ok, {len(errors)} failed")
+    print(f"Throughput:  {len(lat) / elapsed:.1f} req/s")
+    if lat:
+        ms = lambda s: f"{s * 1000:.1f}ms"
+        print(f"Latency:     p50 {ms(percentile(lat, .50))}  p95 {ms(percentile(lat, .95))}  "
+              f"p99 {ms(percentile(lat, .99))}  max {ms(lat[-1])}")
+    if errors:
+        print(f"Errors:      {sorted(set(map(str, errors)))}")
+    return 1 if errors and not lat else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""
+Consistency check / rebuild for the dashboard summary tables (migration 009).
+
+    python scripts/rebuild_summaries.py --check   # report drift, exit 1 if any
+    python scripts/rebuild_summaries.py           # recompute from raw events
+"""
+import os
+import sys
+import argparse
+
+sys.path.append(os.getcwd())
+import config
+from modules.database_manager import DatabaseManager
+from modules.summaries import DashboardSummary
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Check or rebuild dashboard summary tables")
+    ap.add_argument("--check", action="store_true", help="Only compare stored vs recomputed aggregates")
+    ap.add_argument("--db", default=config.DB_PATH)
+    args = ap.parse_args()
+
+    DatabaseManager(args.db) # Applies pending migrations (creates the tables/triggers)
+    diffs = DashboardSummary.check(args.db)
+    for table, rows in diffs.items():
+        print(f"❌ {table}: {len(rows)} row(s) differ")
+        for key, stored, expected in rows[:10]:
+            print(f"   {key}: stored={stored} expected={expected}")
+    if not diffs:
+        print("✅ Summary tables consistent with raw events.")
+
+    if args.check:
+        return 1 if diffs else 0
+    DashboardSummary.rebuild(args.db)
+    print("🔄 Summary tables rebuilt.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
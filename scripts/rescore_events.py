@@ -0,0 +1,45 @@
+"""
+Re-scores the whole event history (ml_score/ml_label) with a triage model.
+Resumable: re-running with the same model continues after the last committed chunk.
+
+    python scripts/rescore_events.py                       # active model file (models/triage.pkl)
+    python scripts/rescore_events.py --model new.pkl --workers 8
+    python scripts/rescore_events.py --restart             # ignore saved progress for this model
+"""
+import os
+import sys
+import argparse
+
+sys.path.append(os.getcwd())
+import config
+from modules.database_manager import DatabaseManager
+from modules.triage import MODEL_PATH
+from modules.rescore import Rescorer, SCORED_TABLES
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Offline bulk re-scoring of events with a triage model")
+    ap.add_argument("--model", default=MODEL_PATH)
+    ap.add_argument("--version", help="model_runs version (default: hash of the model file)")
+    ap.add_argument("--db", default=config.DB_PATH)
+    ap.add_argument("--tables", nargs="+", choices=SCORED_TABLES)
+    ap.add_argument("--chunk", type=int, default=config.RESCORE_CHUNK_ROWS)
+    ap.add_argument("--workers", type=int, help="prediction processes (default: RESCORE_WORKERS or CPU count)")
+    ap.add_argument("--restart", action="store_true", help="start over instead of resuming")
+    args = ap.parse_args()
+
+    if not os.path.exists(args.model):
+        print(f"❌ Model not found: {args.model}")
+        return 1
+    DatabaseManager(args.db) # Applies pending migrations (rescore_progress, ml-only sync triggers)
+    job = Rescorer(args.model, args.db, version=args.version, chunk_rows=args.chunk, workers=args.workers)
+    print(f"♻️ Re-scoring with model {job.version} ({job.workers} worker(s), {job.chunk_rows} rows/chunk)")
+    summary = job.run(tables=args.tables, restart=args.restart)
+    for table, n in summary["tables"].items():
+        print(f"   {table}: {n} events")
+    print(f"✅ Done in {summary['seconds']}s ({summary['events_per_sec']} ev/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""
+Trains a triage model from labelled events (incremental feature snapshot) and activates it.
+Running daemons hot-swap to the new model within TRIAGE_RELOAD_CHECK_SEC.
+
+    python scripts/train_model.py                  # snapshot new events, fit, activate
+    python scripts/train_model.py --full           # rebuild the snapshot from the DB first
+    python scripts/train_model.py --no-activate    # register only
+    python scripts/train_model.py --activate VERSION   # roll back / forward to a stored version
+    python scripts/train_model.py --list
+"""
+import os
+import sys
+import json
+import argparse
+
+sys.path.append(os.getcwd())
+import config
+from modules.database_manager import DatabaseManager
+from modules.training import ModelTrainer
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Train / version / activate the triage model")
+    ap.add_argument("--db", default=config.DB_PATH)
+    ap.add_argument("--full", action="store_true", help="rebuild the feature snapshot from scratch")
+    ap.add_argument("--no-activate", action="store_true")
+    ap.add_argument("--activate", metavar="VERSION", help="only activate an existing version")
+    ap.add_argument("--list", action="store_true", help="list model_runs")
+    ap.add_argument("--trees", type=int, default=config.TRAIN_TREES)
+    ap.add_argument("--n-jobs", type=int, default=config.TRAIN_N_JOBS)
+    args = ap.parse_args()
+
+    DatabaseManager(args.db)
+    trainer = ModelTrainer(args.db, n_jobs=args.n_jobs, trees=args.trees)
+    if args.list:
+        for version, trained_at, algo, active, metrics in trainer.versions():
+            m = json.loads(metrics or "{}")
+            print(f"{'*' if active else ' '} {version}  {trained_at}  {algo}  rows={m.get('rows')} acc={m.get('holdout_accuracy')}")
+        return 0
+    if args.activate:
+        trainer.activate(args.activate)
+        print(f"✅ Activated {args.activate}")
+        return 0
+
+    try:
+        run = trainer.train(full=args.full, activate=not args.no_activate)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"🧠 Model {run['version']}: {run['rows']} rows ({run['new_rows']} new), "
+          f"holdout accuracy {run['holdout_accuracy']}, load {run['load_s']}s, fit {run['fit_s']}s")
+    print("✅ Activated" if not args.no_activate else "ℹ️ Registered (not active)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
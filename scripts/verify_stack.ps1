@@ -41,7 +41,7 @@ if ($res.desired_state -eq "RUNNING") {
 Write-Host "`n[4/4] Testing /events..." -ForegroundColor Yellow
 try {
     $evts = Invoke-RestMethod -Uri "$ApiBase/events?limit=5" -Method Get
-    Write-Host "  [OK] Retrieved $($evts.Count) events" -ForegroundColor Green
+    Write-Host "  [OK] Retrieved $($evts.items.Count) events (next_cursor: $($evts.next_cursor))" -ForegroundColor Green
 } catch {
     Write-Host "  [WARN] Events endpoint error" -ForegroundColor Yellow
 }
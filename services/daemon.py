@@ -1,8 +1,10 @@
 import sys
 import os
+import json
 import time
 import logging
 import signal
+import collections
 
 # Add root to path
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
@@ -12,13 +14,15 @@ from modules.discovery import DiscoveryAgent
 from modules.pipeline import PipelineManager
 from modules.daemon_control import DaemonControl
 from modules.database_manager import DatabaseManager
+from modules.heavy_harvester import HeavyHarvester
+from modules.image_harvester import ImageHarvester
 
 # Setup Logging to file for Daemon
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - DAEMON - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler(os.path.join(config.OMNISKY_DATA, "OBS", "daemon.log")),
+        logging.FileHandler(os.path.join(config.OMNISKY_ROOT, "OBS", "daemon.log")),
         logging.StreamHandler()
     ]
 )
@@ -28,18 +32,29 @@ class OmniSkyDaemon:
         self.running = True
         self.control = DaemonControl()
         self.db = DatabaseManager() # Ensure schema
-        self.pipeline = PipelineManager()
+        self.pipeline = PipelineManager(HeavyHarvester(), ImageHarvester())
         self.discovery = DiscoveryAgent()
+        self.backlog = collections.deque() # Discovered targets not yet accepted by the download queue
         
         signal.signal(signal.SIGINT, self.shutdown)
         signal.signal(signal.SIGTERM, self.shutdown)
 
     def shutdown(self, signum, frame):
+        # Only flag here; the drain runs on the main thread once the loop exits
         logging.info("🛑 Daemon stopping...")
         self.running = False
 
+    def _feed(self):
+        """Queues backlog targets until the download queue pushes back (retried next tick) or a stop is requested."""
+        while self.backlog and self.running:
+            if not self.pipeline.submit_task(self.backlog[0]):
+                logging.info(f"⏳ Download queue full: {len(self.backlog)} targets wait for the next tick")
+                return
+            self.backlog.popleft()
+
     def run(self):
         logging.info("🚀 OmniSky Daemon Started (Background Mode)")
+        self.pipeline.start()
         
         while self.running:
             try:
@@ -49,7 +64,8 @@ class OmniSkyDaemon:
                 )
                 
                 # 2. Check External Control (API control.json)
-                control_file = os.path.join(config.OMNISKY_DATA, "OBS", "control.json")
+                control_file = os.path.join(config.OMNISKY_ROOT, "OBS", "control.json")
+                finish_current = config.FINISH_CURRENT_JOB_ON_PAUSE
                 if os.path.exists(control_file):
                     try:
                         with open(control_file, 'r') as f:
@@ -57,25 +73,30 @@ class OmniSkyDaemon:
                         if ext_ctrl.get("desired_state") == "PAUSED":
                             is_paused = True
                             reason = f"API: {ext_ctrl.get('reason', 'USER')}"
+                            finish_current = ext_ctrl.get("finish_current_job", finish_current)
                     except: pass
                 
                 if is_paused:
-                    # Optional: Shutdown pipeline workers to save perfectly 0 CPU?
-                    # For now we just don't feed it new work.
+                    # Workers stop taking jobs; in-flight ones finish or are cancelled per finish_current
+                    if not self.pipeline.paused:
+                        logging.info(f"⏸️ Pipeline paused ({reason}, finish_current={finish_current})")
+                        self.pipeline.pause(finish_current=finish_current)
                     time.sleep(config.CHECK_INTERVAL_SECONDS)
                     continue
+                if self.pipeline.paused:
+                    self.pipeline.resume()
+                self.control.throttle.apply(self.pipeline)
 
                 # 2. Do Work
                 # a) Pipeline maintenance (process queues) is async in threads.
                 #    We keep the main loop alive to feed Discovery.
                 
                 # Check if we need more targets
-                # Only discover if queue is low
-                if self.pipeline.q_download.qsize() < 10:
-                    new_targets = self.discovery.find_new_targets()
-                    for t in new_targets:
-                        self.pipeline.submit_task(t)
-                        
+                # Only discover if queue is low and the last batch is fully queued
+                if not self.backlog and self.pipeline.q_download.qsize() < 10:
+                    self.backlog.extend(self.discovery.find_new_targets())
+                self._feed()
+
                 # b) Check queues
                 if not self.pipeline.has_work() and self.pipeline.q_download.empty():
                      # Idle sleep
@@ -88,6 +109,9 @@ class OmniSkyDaemon:
                 logging.error(f"Daemon Loop Error: {e}")
                 time.sleep(5)
 
+        self.pipeline.shutdown()
+        self.control.update_state("STOPPED")
+
 if __name__ == "__main__":
     daemon = OmniSkyDaemon()
     daemon.run()
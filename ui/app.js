@@ -11,29 +11,29 @@ document.querySelectorAll('.nav-btn').forEach(btn => {
     });
 });
 
-// --- Status Polling ---
+// --- Status ---
+function renderStatus(data) {
+    // Update Badge
+    const badge = document.getElementById('daemon-badge');
+    badge.textContent = data.daemon_state || 'UNKNOWN';
+    badge.className = 'badge ' + (data.daemon_state || 'idle').toLowerCase();
+    
+    // Update HUD
+    document.getElementById('hud-status').textContent = data.daemon_state;
+    document.getElementById('hud-cpu').textContent = (data.metrics?.cpu || '--') + '%';
+    document.getElementById('hud-ram').textContent = (data.metrics?.ram || '--') + '%';
+}
+
 async function fetchStatus() {
     try {
         const res = await fetch(`${API_BASE}/status`);
-        const data = await res.json();
-        
-        // Update Badge
-        const badge = document.getElementById('daemon-badge');
-        badge.textContent = data.daemon_state || 'UNKNOWN';
-        badge.className = 'badge ' + (data.daemon_state || 'idle').toLowerCase();
-        
-        // Update HUD
-        document.getElementById('hud-status').textContent = data.daemon_state;
-        document.getElementById('hud-cpu').textContent = (data.metrics?.cpu || '--') + '%';
-        document.getElementById('hud-ram').textContent = (data.metrics?.ram || '--') + '%';
-        
+        renderStatus(await res.json());
     } catch (e) {
         document.getElementById('daemon-badge').textContent = 'OFFLINE';
         document.getElementById('daemon-badge').className = 'badge idle';
     }
 }
 
-setInterval(fetchStatus, 3000);
 fetchStatus();
 
 // --- Control Buttons ---
@@ -48,24 +48,59 @@ document.getElementById('btn-resume').addEventListener('click', async () => {
 });
 
 // --- Live Logs ---
+const MAX_LOG_LINES = 50;
+let logLines = [];
+
+function renderLogs() {
+    const container = document.getElementById('log-container');
+    container.innerHTML = logLines.map(l => `<div>[${l.ts || '??'}] ${l.event || JSON.stringify(l)}</div>`).join('');
+    container.scrollTop = container.scrollHeight;
+}
+
 async function fetchLogs() {
     try {
-        const res = await fetch(`${API_BASE}/logs/tail?lines=50`);
-        const logs = await res.json();
-        
-        const container = document.getElementById('log-container');
-        container.innerHTML = logs.map(l => `<div>[${l.ts || '??'}] ${l.event || JSON.stringify(l)}</div>`).join('');
-        container.scrollTop = container.scrollHeight;
+        const res = await fetch(`${API_BASE}/logs/tail?lines=${MAX_LOG_LINES}`);
+        logLines = await res.json();
+        renderLogs();
     } catch (e) {}
 }
-setInterval(fetchLogs, 5000);
 fetchLogs();
 
+// --- Live Stream (SSE) ---
+// Server pushes status changes and new events; polling only while the stream is down.
+let pollTimers = [];
+function startPolling() {
+    if (pollTimers.length) return;
+    pollTimers = [setInterval(fetchStatus, 3000), setInterval(fetchLogs, 5000)];
+}
+function stopPolling() {
+    pollTimers.forEach(clearInterval);
+    pollTimers = [];
+}
+
+if (window.EventSource) {
+    const stream = new EventSource(`${API_BASE}/stream`);
+    stream.onopen = () => { stopPolling(); fetchLogs(); };
+    stream.onerror = () => startPolling(); // EventSource reconnects by itself
+    stream.addEventListener('status', e => {
+        const data = JSON.parse(e.data);
+        if (data.source === 'daemon') renderStatus(data);
+    });
+    stream.addEventListener('event', e => {
+        logLines.push(JSON.parse(e.data));
+        if (logLines.length > MAX_LOG_LINES) logLines = logLines.slice(-MAX_LOG_LINES);
+        renderLogs();
+    });
+    stream.addEventListener('dropped', () => fetchLogs()); // We fell behind: resync from the tail
+} else {
+    startPolling();
+}
+
 // --- Explorer ---
 async function fetchEvents() {
     try {
         const res = await fetch(`${API_BASE}/events?limit=100`);
-        const events = await res.json();
+        const { items: events } = await res.json();
         
         const tbody = document.querySelector('#events-table tbody');
         tbody.innerHTML = events.map(e => `
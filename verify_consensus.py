@@ -0,0 +1,187 @@
+import os
+import sys
+import random
+import sqlite3
+import tempfile
+
+sys.path.append(os.getcwd())
+import config
+
+# Throwaway DB so detector_runs rows never land in the real vault
+_tmp = tempfile.mkdtemp(prefix="omnisky_verify_")
+config.DB_PATH = os.path.join(_tmp, "verify.db")
+
+import numpy as np
+from modules.database_manager import DatabaseManager
+from modules.detectors.base import Detector
+from modules.detectors.consensus import ConsensusEngine
+from modules.detectors.heuristic import HeuristicDetector
+
+N_EVENTS = 5_000
+
+
+# --- Reference: the per-event code run_batch replaced ---
+
+def legacy_heuristic(event_data):
+    score = 0
+    snr = float(event_data.get('snr', 0) or event_data.get('sigma', 0))
+    drift = abs(float(event_data.get('drift', 0)))
+    if snr > 10: score += 50
+    if snr > 50: score += 30
+    if 0.1 < drift < 2.0: score += 20
+    return {"score": score, "label": "CANDIDATE" if score > 60 else "NOISE"}
+
+
+def legacy_run_all(detectors, event_data):
+    """Old ConsensusEngine.run_all: (label, score, disputed, tied labels)."""
+    results = []
+    for d in detectors:
+        try:
+            res = legacy_heuristic(event_data) if isinstance(d, HeuristicDetector) else d.detect(event_data)
+            results.append((res['score'], res['label']))
+        except Exception:
+            pass
+    if not results:
+        return "UNKNOWN", 0, False, {"UNKNOWN"}
+    labels = [l for _, l in results]
+    top = max(labels.count(l) for l in labels)
+    # max(set(labels), key=labels.count) picks any of the tied labels
+    return max(set(labels), key=labels.count), sum(s for s, _ in results) / len(results), len(set(labels)) > 1, \
+        {l for l in labels if labels.count(l) == top}
+
+
+# --- Extra detectors: per-row only (base detect_batch fallback) and always failing ---
+
+class BrightDetector(Detector):
+    name = "BRIGHT"
+
+    def detect(self, event_data):
+        snr = float(event_data.get('snr', 0) or event_data.get('sigma', 0))
+        return {"score": 70.0 if snr > 30 else 10.0, "label": "CANDIDATE" if snr > 30 else "NOISE", "metadata": {}}
+
+
+class DriftDetector(Detector):
+    name = "DRIFT"
+
+    def detect(self, event_data):
+        drift = abs(float(event_data.get('drift', 0)))
+        return {"score": 40.0 if drift > 2 else 5.0, "label": "RFI" if drift > 2 else "NOISE", "metadata": {}}
+
+
+class BrokenDetector(Detector):
+    name = "BROKEN"
+
+    def detect(self, event_data):
+        raise RuntimeError("verify: detector failure")
+
+
+def random_events(rng, n):
+    """Mix of full, sigma-only, drift-less and zero-SNR events."""
+    out = []
+    for _ in range(n):
+        e = {"snr": rng.choice([0, rng.uniform(0, 100)]), "drift": rng.uniform(-4, 4)}
+        kind = rng.random()
+        if kind < 0.2:
+            e["sigma"] = rng.uniform(0, 100)
+            del e["snr"]
+        elif kind < 0.3:
+            del e["drift"]
+        elif kind < 0.4:
+            e["sigma"] = rng.uniform(0, 100) # Used because snr may be 0
+        out.append(e)
+    return out
+
+
+def engine(*extra):
+    e = ConsensusEngine()
+    e.detectors = [HeuristicDetector(), *extra]
+    return e
+
+
+def check_detectors():
+    """Vectorized detect_batch (list, DataFrame, ndarray) equals the old scalar detect()."""
+    events = random_events(random.Random(1), N_EVENTS)
+    ref = [legacy_heuristic(e) for e in events]
+    h = HeuristicDetector()
+    s, l = h.detect_batch(events)
+    batch_ok = np.allclose(s, [r["score"] for r in ref]) and list(l) == [r["label"] for r in ref]
+    single_ok = all(h.detect(e)["score"] == r["score"] and h.detect(e)["label"] == r["label"]
+                    for e, r in zip(events[:500], ref))
+    arr = np.array([[e.get("snr", 0) or e.get("sigma", 0), e.get("drift", 0)] for e in events])
+    s2, l2 = h.detect_batch(arr)
+    array_ok = np.allclose(s2, s) and list(l2) == list(l)
+    b = BrightDetector()
+    s3, l3 = b.detect_batch(events)
+    fallback_ok = [(float(x), y) for x, y in zip(s3, l3)] == [(b.detect(e)["score"], b.detect(e)["label"]) for e in events]
+    print(f"   {N_EVENTS} events | batch {batch_ok} | detect() {single_ok} | ndarray {array_ok} | row fallback {fallback_ok}")
+    return batch_ok and single_ok and array_ok and fallback_ok
+
+
+def check_consensus():
+    """run_batch over many detectors equals the old per-event run_all: label, mean score, disputed."""
+    events = random_events(random.Random(2), N_EVENTS)
+    ok = True
+    for extra in ((), (BrightDetector(),), (BrightDetector(), DriftDetector()), (BrightDetector(), DriftDetector(), BrokenDetector())):
+        e = engine(*extra)
+        out = e.run_batch(events)
+        ref = [legacy_run_all(e.detectors, ev) for ev in events]
+        labels = all(l in tied for l, (_, _, _, tied) in zip(out["label"], ref))
+        scores = np.allclose(out["score"].to_numpy(), [r[1] for r in ref])
+        disputed = list(out["disputed"]) == [r[2] for r in ref]
+        single = all(e.run_all(ev)["label"] in r[3] and abs(e.run_all(ev)["score"] - r[1]) < 1e-9
+                     for ev, r in zip(events[:200], ref))
+        ok = ok and labels and scores and disputed and single
+        print(f"   {[d.name for d in e.detectors]}: label {labels} | score {scores} | disputed {disputed} "
+              f"({int(out['disputed'].sum())}) | run_all {single}")
+    return ok
+
+
+def check_runs():
+    """detector_runs: one row per event and working detector, all under the batch's run_id."""
+    DatabaseManager(config.DB_PATH)
+    rng = random.Random(3)
+    conn = sqlite3.connect(config.DB_PATH)
+    with conn:
+        conn.executemany("INSERT INTO events_radio (artifact_id, timestamp, snr, drift_rate) VALUES (1, '2026-01-01T00:00:00', ?, ?)",
+                         ((rng.uniform(0, 100), rng.uniform(-4, 4)) for _ in range(N_EVENTS)))
+    conn.close()
+    e = engine(BrightDetector(), BrokenDetector())
+    events = random_events(rng, 300)
+    e.run_batch(events, event_ids=list(range(1, 301)), run_id="verify-batch")
+    history = e.run_history(chunk_rows=1_000)
+    single = e.run_all(events[0], event_id=1)
+
+    conn = sqlite3.connect(config.DB_PATH)
+    per_run = dict(conn.execute("SELECT run_id, COUNT(*) FROM detector_runs GROUP BY run_id").fetchall())
+    hist_rows = conn.execute("SELECT r.snr, r.drift_rate, d.score, d.label FROM detector_runs d JOIN events_radio r "
+                             "ON r.id = d.event_id WHERE d.run_id = ? AND d.detector_name = 'HEURISTIC'",
+                             (history["run_id"],)).fetchall()
+    names = {n for (n,) in conn.execute("SELECT DISTINCT detector_name FROM detector_runs")}
+    conn.close()
+    hist_ok = len(hist_rows) == N_EVENTS and all(
+        legacy_heuristic({"snr": snr, "drift": drift}) == {"score": s, "label": l} for snr, drift, s, l in hist_rows)
+    print(f"   rows per run_id: batch {per_run.get('verify-batch')} | history {per_run.get(history['run_id'])} "
+          f"({history['events']} events, {history['seconds']}s) | run_all: {len(per_run) - 2} new run | "
+          f"detectors {sorted(names)} | history scores match {hist_ok}")
+    return per_run.get("verify-batch") == 600 and per_run.get(history["run_id"]) == 2 * N_EVENTS \
+        and len(per_run) == 3 and names == {"HEURISTIC", "BRIGHT"} and hist_ok and single["label"] != "UNKNOWN"
+
+
+def verify():
+    print(">> Testing Detector Consensus...")
+    checks = [("Batch detectors match the scalar code", check_detectors),
+              ("run_batch matches the old per-event run_all", check_consensus),
+              ("detector_runs grouped by run_id", check_runs)]
+    results = []
+    for i, (title, check) in enumerate(checks, 1):
+        print(f"\n[{i}/{len(checks)}] {title}...")
+        results.append(check())
+        print("   [OK]" if results[-1] else "   [FAIL]")
+
+    ok = all(results)
+    print("\n>> CONSENSUS " + ("OPERATIONAL" if ok else "FAILED"))
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if verify() else 1)
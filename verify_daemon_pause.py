@@ -13,7 +13,7 @@ def verify_daemon():
     print(">> Testing Daemon Control Logic...")
     
     # 1. Force a "Heavy Process" into the config list for testing
-    print("[1/3] Injecting test process 'python.exe' as HEAVY...")
+    print("[1/4] Injecting test process 'python.exe' as HEAVY...")
     original_heavy = config.HEAVY_PROCESS_NAMES
     config.HEAVY_PROCESS_NAMES = ["python.exe", "pythonw.exe"] # Self-match
     
@@ -26,7 +26,7 @@ def verify_daemon():
         print(f"   [FAIL] Did not detect heavy process. Reason: {reason}")
         
     # 2. Reset and check Idle
-    print("\n[2/3] Checking IDLE state (Restoring config)...")
+    print("\n[2/4] Checking IDLE state (Restoring config)...")
     config.HEAVY_PROCESS_NAMES = ["NonExistentGame.exe"]
     should_pause, reason = dc.check_should_pause()
     
@@ -36,7 +36,7 @@ def verify_daemon():
         print(f"   [WARN] System busy ({reason}). Could not verify IDLE.")
         
     # 3. Write State
-    print("\n[3/3] Writing State File...")
+    print("\n[3/4] Writing State File...")
     dc.update_state("RUNNING")
     if os.path.exists(dc.state_file):
         with open(dc.state_file, 'r') as f:
@@ -45,6 +45,16 @@ def verify_daemon():
     else:
         print("   [FAIL] State file not found.")
 
+    # 4. Daemon-loop overhead (psutil work happens in the background sampler)
+    print("\n[4/4] Measuring update_state() overhead...")
+    t0 = time.perf_counter()
+    for _ in range(50):
+        dc.update_state("RUNNING")
+    per_call = (time.perf_counter() - t0) / 50 * 1000
+    snap = dc.sampler.snapshot()
+    print(f"   [OK] update_state: {per_call:.2f} ms/call; background sample: {snap['sample_ms']:.2f} ms "
+          f"({snap['n_processes']} procs, {snap['new_pids']} new)")
+
     print("\n>> DAEMON TEST COMPLETE")
 
 if __name__ == "__main__":
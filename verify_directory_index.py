@@ -0,0 +1,108 @@
+import threading
+import time
+import tracemalloc
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from modules.sources.directory_index import DirectoryIndex, iter_listing
+
+N_BIG = 100_000
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves fake Apache/nginx listings, generated on the fly."""
+
+    def log_message(self, *args):
+        pass
+
+    def _send_rows(self, rows):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.end_headers()
+        buf = []
+        for row in rows:
+            buf.append(row)
+            if len(buf) >= 1000:
+                self.wfile.write("".join(buf).encode())
+                buf = []
+        self.wfile.write("".join(buf).encode())
+
+    def do_GET(self):
+        if self.path == "/data/":
+            # Apache <pre> style with sort links, parent link and a subdir
+            def rows():
+                yield "<html><head><title>Index of /data</title></head><body><h1>Index of /data</h1><pre>"
+                yield '<a href="?C=N;O=D">Name</a>  <a href="?C=M;O=A">Last modified</a>  <a href="?C=S;O=A">Size</a>\n<hr>'
+                yield '<a href="/">Parent Directory</a>                             -\n'
+                yield '<a href="sub/">sub/</a>                    2020-01-31 12:00    -\n'
+                for i in range(N_BIG):
+                    yield f'<a href="blc_{i:06d}.h5">blc_{i:06d}.h5</a>   2020-01-31 12:{i % 60:02d}  1.{i % 10}G\n'
+                yield '<a href="readme.txt">readme.txt</a>   2020-01-31 12:00  1.2K\n'
+                yield "</pre><hr></body></html>"
+            self._send_rows(rows())
+        elif self.path == "/data/sub/":
+            # nginx style plus a deeper level
+            self._send_rows(iter([
+                "<html><body><h1>Index of /data/sub/</h1><hr><pre>",
+                '<a href="../">../</a>\n',
+                '<a href="deeper/">deeper/</a>                      01-Feb-2021 08:15                   -\n',
+                '<a href="voyager.fil">voyager.fil</a>                01-Feb-2021 08:15            123456789\n',
+                '<a href="field.fits">field.fits</a>                 01-Feb-2021 08:16                 4096\n',
+                "</pre><hr></body></html>"
+            ]))
+        elif self.path == "/data/sub/deeper/":
+            # Apache fancy table style
+            self._send_rows(iter([
+                "<html><body><table><tr><th>Name</th><th>Last modified</th><th>Size</th></tr>\n",
+                '<tr><td><a href="/data/sub/">Parent Directory</a></td><td>&nbsp;</td><td align="right">  - </td></tr>\n',
+                '<tr><td><a href="deep.h5">deep.h5</a></td>\n<td align="right">2022-03-04 05:06  </td>\n<td align="right">512M</td></tr>\n',
+                "</table></body></html>"
+            ]))
+        else:
+            self.send_error(404)
+
+def verify():
+    print(">> Testing Directory Index Crawler...")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}/data/"
+
+    try:
+        # 1. Depth 0: only the big listing
+        print(f"\n[1/3] Streaming {N_BIG} entries with bounded memory...")
+        src = DirectoryIndex(roots=[base], max_depth=0)
+        tracemalloc.start()
+        t0 = time.time()
+        count, first = 0, None
+        for t in src.discover():
+            count += 1
+            first = first or t
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"   Targets: {count} in {time.time() - t0:.2f}s, peak {peak / 1024 / 1024:.2f} MB")
+        print(f"   First: {first.url} {first.metadata}")
+        ok_big = count == N_BIG and first.metadata["size_bytes"] == int(1.0 * 1024 ** 3) and peak < 8 * 1024 * 1024
+        print("   [OK]" if ok_big else "   [FAIL]")
+
+        # 2. Recursion, formats and extension filter
+        print("\n[2/3] Recursive crawl (nginx + Apache table formats)...")
+        src = DirectoryIndex(roots=[base + "sub/"], max_depth=2)
+        found = {t.object_name: t for t in src.discover()}
+        for name, t in found.items():
+            print(f"   {t.kind:5} {t.url} {t.metadata['size_bytes']} {t.metadata['mtime']}")
+        ok_rec = (set(found) == {"voyager", "field", "deep"}
+                  and found["field"].kind == "IMAGE"
+                  and found["voyager"].metadata["size_bytes"] == 123456789
+                  and found["deep"].metadata["mtime"] == "2022-03-04T05:06:00")
+        print("   [OK]" if ok_rec else "   [FAIL]")
+
+        # 3. Depth limit
+        print("\n[3/3] Depth limit...")
+        shallow = {t.object_name for t in DirectoryIndex(roots=[base + "sub/"], max_depth=0).discover()}
+        dirs = [e.name for e in iter_listing(base + "sub/") if e.is_dir]
+        ok_depth = shallow == {"voyager", "field"} and dirs == ["deeper"]
+        print("   [OK]" if ok_depth else f"   [FAIL] {shallow} {dirs}")
+
+        print("\n>> DIRECTORY INDEX " + ("OPERATIONAL" if ok_big and ok_rec and ok_depth else "FAILED"))
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    verify()
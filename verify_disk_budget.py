@@ -0,0 +1,116 @@
+import os
+import sys
+import time
+import tempfile
+import threading
+
+sys.path.append(os.getcwd())
+import config
+
+# Throwaway DB and data dir: the checks fill and sweep their own TEMP_CACHE only
+_tmp = tempfile.mkdtemp(prefix="omnisky_verify_")
+config.DB_PATH = os.path.join(_tmp, "verify.db")
+config.OMNISKY_ROOT = os.path.join(_tmp, "OMNISKY_DATA")
+config.DIR_TEMP = os.path.join(config.OMNISKY_ROOT, "TEMP_CACHE")
+config.MAX_RESIDENT_ARTIFACTS = 2
+
+from modules.disk_budget import DiskBudget, MB
+from modules.pipeline import PipelineManager
+from modules.scheduler import Job
+from modules.sources.base import Target
+
+
+def budget(name, **kw):
+    """10 MB budget, high 90% (9 MB), low 50% (5 MB), no free-space floor."""
+    return DiskBudget(root=os.path.join(_tmp, name), budget_mb=10, high_pct=90, low_pct=50,
+                      min_free_mb=kw.pop("min_free_mb", 0), **kw)
+
+
+def write(root, name, nbytes):
+    path = os.path.join(root, name)
+    with open(path, 'wb') as f:
+        f.write(b"\0" * nbytes)
+    return path
+
+
+def check_admission():
+    d = budget("admission")
+    first = d.reserve("a", 4 * MB) and d.reserve("b", 4 * MB)
+    over = d.reserve("c", 2 * MB) # 10 MB would cross the 9 MB high mark
+    d.release("a")
+    after = d.reserve("c", 2 * MB)
+    print(f"   4+4 MB: {first} | +2 MB: {over} | after release: {after} | reserved {d.reserved() / MB:.0f} MB")
+    lone = budget("lone").reserve("big", 50 * MB) # Nothing in flight: an oversized file still runs
+    floor = budget("floor", min_free_mb=10 ** 9).reserve("x", 1)
+    return first and not over and after and lone and not floor and not d.paused
+
+
+def check_watermarks():
+    d = budget("watermarks")
+    d.reserve("a", 4 * MB)
+    d.reserve("b", 4 * MB)
+    d.settle("b", int(5.5 * MB)) # Real size came in bigger: 9.5 MB used
+    paused = not d.reserve("c", 1) and d.paused
+    d.settle("b", 2 * MB) # 6 MB: under high but above low, stays paused (hysteresis)
+    held = not d.reserve("c", 1) and d.paused
+    d.release("b") # 4 MB: under low, resumes
+    resumed = d.reserve("c", 1) and not d.paused
+    print(f"   paused at 9.5 MB: {paused} | held at 6 MB: {held} | resumed at 4 MB: {resumed}")
+    return paused and held and resumed
+
+
+def check_on_disk():
+    """Files nobody reserved (left for forensics) still count against the budget."""
+    d = budget("on_disk")
+    write(d.root, "forensics.h5", int(9.5 * MB))
+    blocked = not d.reserve("a", 1) and d.paused
+    files, freed = d.sweep_orphans(keep=[write(d.root, "recovered.h5", 1024)])
+    left = sorted(os.listdir(d.root))
+    print(f"   blocked by on-disk bytes: {blocked} | swept {files} file(s), {freed / MB:.1f} MB | left {left}")
+    return blocked and files == 1 and left == ["recovered.h5"]
+
+
+def check_pipeline_slots():
+    """MAX_RESIDENT_ARTIFACTS slots: a third download waits (counted) until one is released."""
+    p = PipelineManager(None, None)
+    jobs = [Job(Target(f"http://verify/{i}.h5", "RADIO", str(i), "VERIFY", {"size_bytes": MB})) for i in range(3)]
+    admitted = p._admit(jobs[0]) and p._admit(jobs[1])
+    result = {}
+    t = threading.Thread(target=lambda: result.setdefault("third", p._admit(jobs[2])))
+    t.start()
+    time.sleep(1.5)
+    waiting = p.pending()
+    p._release(jobs[0])
+    t.join(timeout=5)
+    done = p.pending()
+    for j in jobs[1:]:
+        p._release(j)
+    p._release(jobs[1]) # Idempotent
+    final = p.pending()
+    print(f"   while full: files={waiting['temp_cache']['files']} waiting={waiting['download']['admission_wait']} | "
+          f"after release: third={result.get('third')} files={done['temp_cache']['files']} | "
+          f"end: files={final['temp_cache']['files']} bytes={final['temp_cache']['bytes']}")
+    return (admitted and waiting["temp_cache"]["files"] == 2 and waiting["download"]["admission_wait"] == 1
+            and result.get("third") and done["temp_cache"]["files"] == 2 and done["download"]["admission_wait"] == 0
+            and final["temp_cache"] == {"files": 0, "bytes": 0})
+
+
+def verify():
+    print(">> Testing TEMP_CACHE Disk Budget...")
+    checks = [("Admission against the high watermark", check_admission),
+              ("Watermark pause/resume hysteresis", check_watermarks),
+              ("On-disk bytes and orphan sweep", check_on_disk),
+              ("Pipeline resident slots and admission wait", check_pipeline_slots)]
+    results = []
+    for i, (title, check) in enumerate(checks, 1):
+        print(f"\n[{i}/{len(checks)}] {title}...")
+        results.append(check())
+        print("   [OK]" if results[-1] else "   [FAIL]")
+
+    ok = all(results)
+    print("\n>> DISK BUDGET " + ("OPERATIONAL" if ok else "FAILED"))
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if verify() else 1)
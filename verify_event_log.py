@@ -0,0 +1,130 @@
+import os
+import sys
+import json
+import tempfile
+import datetime
+
+sys.path.append(os.getcwd())
+from modules import event_log
+
+N_EVENTS = 50_000
+_tmp = tempfile.mkdtemp(prefix="omnisky_verify_")
+T0 = datetime.datetime(2026, 1, 1)
+
+
+def make_log(path, n, indexed_until=None):
+    """Writes n events the way Observability does (IndexWriter.note per line); the last lines stay unindexed."""
+    w = event_log.IndexWriter(path)
+    events, off = [], 0
+    with open(path, 'wb') as f:
+        for i in range(n):
+            e = {"ts": (T0 + datetime.timedelta(seconds=i)).isoformat(), "event": "JOB" if i % 4 else "DISK",
+                 "artifact_id": i // 10, "pad": "x" * 60}
+            raw = (json.dumps(e) + "\n").encode()
+            f.write(raw)
+            if indexed_until is None or i < indexed_until:
+                w.note(off, len(raw), e["ts"], e["artifact_id"])
+            off += len(raw)
+            events.append(e)
+    return events
+
+
+def brute(events, start=None, end=None, artifact_id=None, event=None):
+    return [e for e in events if (not start or e["ts"] >= start) and (not end or e["ts"] <= end)
+            and (artifact_id is None or e["artifact_id"] == artifact_id) and (not event or e["event"] == event)]
+
+
+class ReadCounter:
+    """Counts log bytes query() actually reads."""
+
+    def __init__(self):
+        self.bytes = 0
+        self._lines = event_log._lines
+
+    def __enter__(self):
+        def counting(f, nbytes):
+            for raw in self._lines(f, nbytes):
+                self.bytes += len(raw)
+                yield raw
+        event_log._lines = counting
+        return self
+
+    def __exit__(self, *exc):
+        event_log._lines = self._lines
+
+
+def ts(i):
+    return (T0 + datetime.timedelta(seconds=i)).isoformat()
+
+
+QUERIES = [
+    {"start": ts(20_000), "end": ts(20_500)},
+    {"artifact_id": 3_333},
+    {"start": ts(10_000), "end": ts(30_000), "event": "DISK"},
+    {"start": ts(N_EVENTS - 100)}, # Reaches into the unindexed tail
+]
+
+
+def check_indexed():
+    path = os.path.join(_tmp, "indexed.jsonl")
+    events = make_log(path, N_EVENTS, indexed_until=N_EVENTS - 50)
+    size = os.path.getsize(path)
+    ok = True
+    for q in QUERIES:
+        with ReadCounter() as rc:
+            got = event_log.query(path, limit=10 ** 6, **q)
+        match = got == brute(events, **q)
+        ok = ok and match
+        print(f"   {q}: {len(got)} events, read {rc.bytes / size:.1%} of the log {'' if match else '[MISMATCH]'}")
+    with ReadCounter() as rc:
+        event_log.query(path, artifact_id=3_333, limit=10 ** 6)
+    return ok and rc.bytes < size / 10 # One 256 KB block plus the unindexed tail
+
+
+def check_no_writes():
+    """Missing or stale sidecar: readers scan without creating or touching the .idx file."""
+    missing = os.path.join(_tmp, "missing.jsonl")
+    events = make_log(missing, 20_000)
+    os.remove(event_log.index_path(missing))
+    ok_missing = all(event_log.query(missing, limit=10 ** 6, **q) == brute(events, **q) for q in QUERIES[:3])
+    created = os.path.exists(event_log.index_path(missing))
+
+    stale = os.path.join(_tmp, "stale.jsonl")
+    events = make_log(stale, 20_000)
+    with open(stale, 'r+b') as f:
+        f.truncate(os.path.getsize(stale) // 2) # Rotated/truncated under an old sidecar
+    events = [json.loads(l) for l in open(stale, 'rb') if l.endswith(b"\n")]
+    idx = event_log.index_path(stale)
+    before = (os.path.getmtime(idx), os.path.getsize(idx))
+    ok_stale = all(event_log.query(stale, limit=10 ** 6, **q) == brute(events, **q) for q in QUERIES[:3])
+    touched = (os.path.getmtime(idx), os.path.getsize(idx)) != before
+    print(f"   missing: results ok {ok_missing}, sidecar created {created} | stale: results ok {ok_stale}, sidecar touched {touched}")
+    return ok_missing and not created and ok_stale and not touched
+
+
+def check_tail():
+    path = os.path.join(_tmp, "indexed.jsonl")
+    events = [json.loads(l) for l in open(path, 'rb')]
+    got = event_log.tail(path, 25)
+    print(f"   last 25: {got[0]['ts']} .. {got[-1]['ts']}")
+    return got == events[-25:] and event_log.tail(path, 0) == []
+
+
+def verify():
+    print(">> Testing Event Log Index...")
+    checks = [("Range queries through the sidecar index", check_indexed),
+              ("Readers never write the sidecar", check_no_writes),
+              ("Tail without a full scan", check_tail)]
+    results = []
+    for i, (title, check) in enumerate(checks, 1):
+        print(f"\n[{i}/{len(checks)}] {title}...")
+        results.append(check())
+        print("   [OK]" if results[-1] else "   [FAIL]")
+
+    ok = all(results)
+    print("\n>> EVENT LOG " + ("OPERATIONAL" if ok else "FAILED"))
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if verify() else 1)
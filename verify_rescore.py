@@ -0,0 +1,131 @@
+import os
+import sys
+import time
+import random
+import sqlite3
+import tempfile
+import multiprocessing
+
+sys.path.append(os.getcwd())
+import config
+
+# Throwaway DB and data dir: the RESCORE_* events go to a temporary event log
+_tmp = tempfile.mkdtemp(prefix="omnisky_verify_")
+config.DB_PATH = os.path.join(_tmp, "verify.db")
+config.OMNISKY_ROOT = os.path.join(_tmp, "OMNISKY_DATA")
+config.RESCORE_PROGRESS_SEC = 3600
+
+import joblib
+import numpy as np
+from modules.database_manager import DatabaseManager
+from modules.rescore import Rescorer, RESCORE_TABLES
+from modules.triage import bootstrap_classifier, column_matrix
+
+N_RADIO = 200_000
+N_IMAGE = 2_000
+CHUNK = 1_000
+MODEL = os.path.join(_tmp, "model.pkl")
+
+
+def populate():
+    DatabaseManager(config.DB_PATH)
+    rng = random.Random(3)
+    conn = sqlite3.connect(config.DB_PATH)
+    with conn:
+        conn.execute("INSERT INTO artifacts (source_url, filename, status) VALUES ('http://verify/r.h5', 'r.h5', 'CLEANED')")
+        conn.executemany("INSERT INTO events_radio (artifact_id, timestamp, snr, drift_rate, score, label) VALUES (1, ?, ?, ?, ?, 'CANDIDATE')",
+                         ((f"2026-01-01T{i % 24:02d}:00:00", rng.choice([None, rng.uniform(1, 80)]),
+                           rng.choice([None, rng.uniform(-3, 3)]), rng.uniform(0, 100)) for i in range(N_RADIO)))
+        conn.executemany("INSERT INTO events_image (artifact_id, timestamp, score, label) VALUES (1, '2026-01-01T00:00:00', 80, 'VISUAL_SOURCE')",
+                         ([] for _ in range(N_IMAGE)))
+    conn.close()
+    joblib.dump(bootstrap_classifier(), MODEL)
+
+
+def progress():
+    conn = sqlite3.connect(config.DB_PATH)
+    try:
+        return conn.execute("SELECT last_id, n_done, n_total, finished_at FROM rescore_progress WHERE table_name = 'events_radio'").fetchone()
+    finally:
+        conn.close()
+
+
+def _rescore(model_path, db_path):
+    """Child process: the job that gets killed."""
+    Rescorer(model_path, db_path, chunk_rows=CHUNK, workers=1).run()
+
+
+def check_kill():
+    """SIGKILL mid-run: every committed chunk is complete, nothing past last_id is written."""
+    populate()
+    proc = multiprocessing.Process(target=_rescore, args=(MODEL, config.DB_PATH))
+    proc.start()
+    row = None
+    while proc.is_alive():
+        row = progress()
+        if row and row[1] >= N_RADIO // 4:
+            break
+        time.sleep(0.01)
+    proc.kill()
+    proc.join()
+    row = progress()
+    conn = sqlite3.connect(config.DB_PATH)
+    below = conn.execute("SELECT COUNT(*), COUNT(ml_score) FROM events_radio WHERE id <= ?", (row[0],)).fetchone()
+    above = conn.execute("SELECT COUNT(ml_score) FROM events_radio WHERE id > ?", (row[0],)).fetchone()[0]
+    conn.close()
+    print(f"   killed at last_id {row[0]}, n_done {row[1]}/{row[2]} | scored up to last_id: {below[1]}/{below[0]} | "
+          f"scored past it: {above}")
+    return 0 < row[1] < N_RADIO and row[3] is None and below[0] == below[1] == row[1] and above == 0
+
+
+def check_resume():
+    """Re-running the same model continues at last_id and ends with every radio event scored once."""
+    before = progress()
+    summary = Rescorer(MODEL, config.DB_PATH, chunk_rows=CHUNK, workers=2).run()
+    after = progress()
+    again = Rescorer(MODEL, config.DB_PATH, chunk_rows=CHUNK, workers=1).run()
+    print(f"   resumed from {before[1]}: re-scored {summary['tables']} | progress {after[1]}/{after[2]}, "
+          f"finished {after[3] is not None} | re-run: {again['tables']}")
+    return summary["tables"] == {"events_radio": N_RADIO - before[1]} and after[1] == after[2] == N_RADIO \
+        and after[3] is not None and again["tables"] == {"events_radio": 0}
+
+
+def check_results():
+    """Scores equal one predict_proba over the whole table; IMAGE keeps NULL; events_all is in sync."""
+    conn = sqlite3.connect(config.DB_PATH)
+    cols = RESCORE_TABLES["events_radio"]
+    rows = np.array(conn.execute(f"SELECT {', '.join(cols.values())}, ml_score FROM events_radio ORDER BY id").fetchall(), dtype=object)
+    labels = [r[0] for r in conn.execute("SELECT ml_label FROM events_radio ORDER BY id")]
+    model = joblib.load(MODEL)
+    proba = model.predict_proba(column_matrix({name: rows[:, i].astype(float) for i, name in enumerate(cols)}, len(rows)))
+    best = proba.argmax(axis=1)
+    scores_ok = np.allclose(rows[:, -1].astype(float), proba[np.arange(len(best)), best] * 100, atol=1e-3)
+    labels_ok = labels == model.classes_[best].tolist()
+    image = conn.execute("SELECT COUNT(ml_score), COUNT(ml_label) FROM events_image").fetchone()
+    unsynced = conn.execute("""SELECT COUNT(*) FROM events_all a JOIN events_radio r ON a.type = 'RADIO' AND a.event_id = r.id
+                               WHERE a.ml_score IS NOT r.ml_score OR a.ml_label IS NOT r.ml_label""").fetchone()[0]
+    image_progress = conn.execute("SELECT COUNT(*) FROM rescore_progress WHERE table_name = 'events_image'").fetchone()[0]
+    conn.close()
+    print(f"   scores match: {scores_ok} | labels match: {labels_ok} | image ml_* set: {image} | "
+          f"events_all out of sync: {unsynced} | image progress rows: {image_progress}")
+    return scores_ok and labels_ok and image == (0, 0) and unsynced == 0 and image_progress == 0
+
+
+def verify():
+    print(">> Testing Resumable Re-scoring...")
+    checks = [("Killed mid-run leaves whole chunks only", check_kill),
+              ("Resume from rescore_progress", check_resume),
+              ("Scores, IMAGE rows and events_all", check_results)]
+    results = []
+    for i, (title, check) in enumerate(checks, 1):
+        print(f"\n[{i}/{len(checks)}] {title}...")
+        results.append(check())
+        print("   [OK]" if results[-1] else "   [FAIL]")
+
+    ok = all(results)
+    print("\n>> RESCORE " + ("OPERATIONAL" if ok else "FAILED"))
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if verify() else 1)
@@ -26,7 +26,7 @@ def verify_run():
     heavy = HeavyHarvester()
     image = ImageHarvester()
     pipeline = PipelineManager(heavy, image)
-    pipeline.start()
+    pipeline.start(recover=False, sweep=False) # The daemon may own the checkpoint and TEMP_CACHE right now
     
     # 3. Inject Test Jobs
     print("[3] Inyectando Trabajos de Prueba...")
@@ -0,0 +1,139 @@
+import os
+import sys
+import time
+import queue
+import tempfile
+
+sys.path.append(os.getcwd())
+import config
+
+# Throwaway DB so the check never touches the real vault
+_tmp = tempfile.mkdtemp(prefix="omnisky_verify_")
+config.DB_PATH = os.path.join(_tmp, "verify.db")
+
+from modules.database_manager import DatabaseManager
+from modules.discovery import DiscoveryAgent
+from modules.scheduler import Job, JobScheduler, resolve_priority
+from modules.sources.base import Target
+
+# Real VLASS quick-look names, as modules/sources/vlass_tiles.py yields them
+VLASS = "https://archive-new.nrao.edu/vlass/quicklook/{epoch}/T01t01/{name}/{epoch}.ql.T01t01.{name}.10.2048.v1.I.iter1.image.pbcor.tt0.subim.fits"
+
+
+class FixtureSource:
+    name = "FIXTURE"
+    kind = "IMAGE"
+
+    def __init__(self, targets):
+        self.targets = targets
+
+    def discover(self):
+        return self.targets
+
+
+def image_target(epoch, name):
+    return Target(VLASS.format(epoch=epoch, name=name), "IMAGE", name, epoch, {})
+
+
+def job(name, source="SRC", priority="NORMAL", size=1000):
+    return Job(Target(f"http://verify/{source}/{name}.h5", "RADIO", name, source, {"size_bytes": size}),
+               priority=resolve_priority(priority))
+
+
+def drain(q):
+    out = []
+    while not q.empty():
+        out.append(q.get().target.object_name)
+    return out
+
+
+def check_priority():
+    """Classes first; inside a class the smaller file, then submission order."""
+    q = JobScheduler(maxsize=10)
+    for j in (job("normal_big", size=5000), job("normal_small", size=10), job("backfill", priority="BACKFILL"),
+              job("reobserve", priority="REOBSERVE")):
+        q.put(j)
+    order = drain(q)
+    print(f"   Order: {order}")
+    return order == ["reobserve", "backfill", "normal_small", "normal_big"]
+
+
+def check_aging():
+    """A NORMAL job that waited two aging intervals ranks with a fresh REOBSERVE."""
+    q = JobScheduler(maxsize=10, aging_seconds=60)
+    old = job("old_normal", size=10)
+    q.put(old)
+    old.enqueued_at = time.time() - 125
+    q.put(job("fresh_reobserve", priority="REOBSERVE", size=5000))
+    q.put(job("fresh_backfill", priority="BACKFILL", size=1))
+    order = drain(q)
+    print(f"   Order: {order}")
+    return order == ["old_normal", "fresh_reobserve", "fresh_backfill"]
+
+
+def check_fairness():
+    """A busy source cannot monopolise its class: sources alternate while both have work."""
+    q = JobScheduler(maxsize=20)
+    for i in range(8):
+        q.put(job(f"A{i}", source="BUSY"))
+    q.put(job("B0", source="QUIET"))
+    q.put(job("B1", source="QUIET"))
+    order = drain(q)
+    print(f"   Order: {order}")
+    return order[:4] == ["A0", "B0", "A1", "B1"] and order[4:] == [f"A{i}" for i in range(2, 8)]
+
+
+def check_bounded():
+    q = JobScheduler(maxsize=2)
+    q.put(job("a"))
+    q.put(job("b"))
+    try:
+        q.put(job("c"), block=False)
+        return False
+    except queue.Full:
+        pass
+    try:
+        q.put(job("c"), timeout=0.1)
+        return False
+    except queue.Full:
+        return q.qsize() == 2
+
+
+def check_reobserve():
+    """One VISUAL_SOURCE on a subtile -> only that subtile's later epochs jump the queue."""
+    db = DatabaseManager(config.DB_PATH)
+    flagged = image_target("VLASS1.2", "J000412+000631")
+    art_id = db.register_artifact(flagged.url, flagged.url.split('/')[-1])
+    db.log_image_event(art_id, {"score": 90, "label": "VISUAL_SOURCE", "notes": "verify"})
+
+    agent = DiscoveryAgent()
+    agent.plugins = [FixtureSource([image_target("VLASS2.2", "J000412+000631"),
+                                    image_target("VLASS2.2", "J001012+000631"),
+                                    image_target("VLASS2.2", "J000412-003000")])]
+    prio = {t.object_name: (t.metadata or {}).get("priority") for t in agent.find_new_targets()}
+    print(f"   Keys: {DiscoveryAgent._object_key(flagged.url)} | priorities: {prio}")
+    return prio == {"J000412+000631": "REOBSERVE", "J001012+000631": None, "J000412-003000": None} \
+        and DiscoveryAgent._object_key("http://x/voyager_f1032.h5") == "voyager_f1032"
+
+
+def verify():
+    print(">> Testing Job Scheduler...")
+    results = []
+
+    checks = [("Priority classes, then size", check_priority),
+              ("Aging promotes long-waiting jobs", check_aging),
+              ("Per-source fairness inside a class", check_fairness),
+              ("Bounded put (backpressure)", check_bounded),
+              ("Re-observation priority from real VLASS filenames", check_reobserve)]
+    for i, (title, check) in enumerate(checks, 1):
+        print(f"\n[{i}/{len(checks)}] {title}...")
+        results.append(check())
+        print("   [OK]" if results[-1] else "   [FAIL]")
+
+    ok = all(results)
+    print("\n>> SCHEDULER " + ("OPERATIONAL" if ok else "FAILED"))
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if verify() else 1)
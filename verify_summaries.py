@@ -0,0 +1,113 @@
+import os
+import sys
+import random
+import sqlite3
+import tempfile
+import subprocess
+
+sys.path.append(os.getcwd())
+import config
+
+# Throwaway DB so the check never touches the real vault
+_tmp = tempfile.mkdtemp(prefix="omnisky_verify_")
+config.DB_PATH = os.path.join(_tmp, "verify.db")
+
+from modules.database_manager import DatabaseManager
+from modules.summaries import DashboardSummary, RFI_LABELS
+
+LABELS = list(RFI_LABELS) + ["CANDIDATE", "VISUAL_SOURCE", None]
+HOSTS = ["https://archive.org/bl", "http://seti.berkeley.edu/gbt", "https://archive-new.nrao.edu/vlass", ""]
+
+
+def rebuild_cli(*args):
+    """scripts/rebuild_summaries.py against the throwaway DB; returns its exit code."""
+    cmd = [sys.executable, os.path.join("scripts", "rebuild_summaries.py"), "--db", config.DB_PATH, *args]
+    return subprocess.run(cmd, capture_output=True, text=True).returncode
+
+
+def populate(db, rng, n_artifacts=40, n_events=600):
+    arts = [db.register_artifact(f"{rng.choice(HOSTS)}/file_{i}.h5", f"file_{i}.h5") for i in range(n_artifacts)]
+    radio, image = [], []
+    for _ in range(n_events):
+        art = rng.choice(arts)
+        score = rng.choice([None, round(rng.uniform(0, 100), 2)])
+        if rng.random() < 0.7:
+            radio.append(db.log_radio_event(art, {"fch1": rng.choice([None, rng.uniform(1000, 1100)]),
+                                                  "snr": rng.uniform(5, 50), "score": score,
+                                                  "label": rng.choice(LABELS)}))
+        else:
+            image.append(db.log_image_event(art, {"score": score, "label": rng.choice(LABELS)}))
+    return arts, radio, image
+
+
+def mutate(db, rng, arts, radio, image):
+    """Every write path the triggers must follow: relabels, rescoring, re-timing, deletes, artifact churn."""
+    for art in rng.sample(arts, 15):
+        db.update_artifact_status(art, rng.choice(["DONE", "FAILED", "DOWNLOADED"]), size=rng.randint(1, 10 ** 7))
+    db.update_event_triage([("RADIO", i, rng.random(), "RFI") for i in rng.sample(radio, 50)]
+                           + [("IMAGE", i, rng.random(), "NOISE") for i in rng.sample(image, 20)])
+    conn = sqlite3.connect(config.DB_PATH)
+    with conn:
+        for i in rng.sample(radio, 80):
+            conn.execute("UPDATE events_radio SET label = ?, fch1 = ? WHERE id = ?",
+                         (rng.choice(LABELS), rng.choice([None, rng.uniform(1000, 1100)]), i))
+        for i in rng.sample(image, 40):
+            conn.execute("UPDATE events_image SET score = ?, label = ? WHERE id = ?",
+                         (round(rng.uniform(0, 100), 2), rng.choice(LABELS), i))
+        for i in rng.sample(radio, 60):
+            conn.execute("UPDATE events_radio SET timestamp = ? WHERE id = ?",
+                         (f"2026-01-0{rng.randint(1, 9)}T{rng.randint(0, 23):02d}:00:00", i))
+        for i in rng.sample(radio, 30):
+            conn.execute("DELETE FROM events_radio WHERE id = ?", (i,))
+        for i in rng.sample(image, 15):
+            conn.execute("DELETE FROM events_image WHERE id = ?", (i,))
+        for art in rng.sample(arts, 3):
+            conn.execute("UPDATE artifacts SET source_url = ? WHERE id = ?", (f"https://moved.example/{art}.h5", art))
+    conn.close()
+
+
+def check_triggers():
+    db = DatabaseManager(config.DB_PATH)
+    rng = random.Random(42)
+    mutate(db, rng, *populate(db, rng))
+    diffs = DashboardSummary.check(config.DB_PATH)
+    totals = DashboardSummary.totals()
+    code = rebuild_cli("--check")
+    print(f"   totals {totals} | drift: {sum(len(r) for r in diffs.values())} row(s) | --check exit {code}")
+    return diffs == {} and code == 0
+
+
+def check_drift():
+    """A hand-edited summary row is reported by --check and repaired by a rebuild."""
+    conn = sqlite3.connect(config.DB_PATH)
+    with conn:
+        conn.execute("UPDATE summary_events SET n = n + 5 WHERE (type, label, hour) IN "
+                     "(SELECT type, label, hour FROM summary_events WHERE n > 0 LIMIT 1)")
+        conn.execute("DELETE FROM summary_rfi_freq WHERE freq_bin IN (SELECT freq_bin FROM summary_rfi_freq WHERE n > 0 LIMIT 1)")
+    conn.close()
+    drifted = sorted(DashboardSummary.check(config.DB_PATH))
+    flagged = rebuild_cli("--check")
+    rebuilt = rebuild_cli()
+    clean = DashboardSummary.check(config.DB_PATH)
+    after = rebuild_cli("--check")
+    print(f"   drift in {drifted} | --check exit {flagged} | rebuild exit {rebuilt} | after: {clean or 'consistent'}, exit {after}")
+    return drifted == ["summary_events", "summary_rfi_freq"] and flagged == 1 and rebuilt == 0 and clean == {} and after == 0
+
+
+def verify():
+    print(">> Testing Dashboard Summary Tables...")
+    checks = [("Triggers track inserts, updates and deletes (rebuild_summaries --check)", check_triggers),
+              ("Drift is reported and rebuilt", check_drift)]
+    results = []
+    for i, (title, check) in enumerate(checks, 1):
+        print(f"\n[{i}/{len(checks)}] {title}...")
+        results.append(check())
+        print("   [OK]" if results[-1] else "   [FAIL]")
+
+    ok = all(results)
+    print("\n>> SUMMARIES " + ("OPERATIONAL" if ok else "FAILED"))
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if verify() else 1)
@@ -0,0 +1,141 @@
+import os
+import sys
+import time
+import random
+import sqlite3
+import tempfile
+
+sys.path.append(os.getcwd())
+import config
+
+# Throwaway DB and data dir: no model file, event log or metrics land in the real OMNISKY_DATA
+_tmp = tempfile.mkdtemp(prefix="omnisky_verify_")
+config.DB_PATH = os.path.join(_tmp, "verify.db")
+config.OMNISKY_ROOT = os.path.join(_tmp, "OMNISKY_DATA")
+config.METRICS_FILE = os.path.join(config.OMNISKY_ROOT, "OBS", "metrics.prom")
+
+from modules.database_manager import DatabaseManager
+from modules.triage import TriageEngine, TriageBatcher, bootstrap_classifier
+
+db = DatabaseManager(config.DB_PATH)
+ART = db.register_artifact("http://verify/triage.h5", "triage.h5")
+
+
+def engine():
+    e = TriageEngine()
+    e.model, e.is_ready = bootstrap_classifier(), True
+    return e
+
+
+def radio_events(rng, n):
+    """(event_id, pipeline result) pairs, written the way _task_persist does."""
+    out = []
+    for _ in range(n):
+        result = {"fch1": rng.uniform(1000, 1100), "snr": rng.uniform(1, 80), "drift": rng.uniform(-3, 3),
+                  "score": rng.uniform(0, 100), "label": "CANDIDATE"}
+        out.append((db.log_radio_event(ART, result), result))
+    return out
+
+
+def stored(table, ids):
+    conn = sqlite3.connect(config.DB_PATH)
+    try:
+        q = f"SELECT id, ml_score, ml_label FROM {table} WHERE id IN ({','.join('?' * len(ids))})"
+        return {r[0]: (r[1], r[2]) for r in conn.execute(q, list(ids))}
+    finally:
+        conn.close()
+
+
+def check_write_back():
+    """Every radio event gets ml_score/ml_label equal to analyze_batch; IMAGE and unreadable rows stay NULL."""
+    rng = random.Random(7)
+    eng = engine()
+    radio = radio_events(rng, 600)
+    bad = db.log_radio_event(ART, {"snr": "n/a", "drift": 0.5})
+    images = [db.log_image_event(ART, {"score": 80, "label": "VISUAL_SOURCE", "notes": "verify"}) for _ in range(50)]
+
+    b = TriageBatcher(eng, db, batch_size=128, max_wait=60)
+    for i, (eid, result) in enumerate(radio):
+        b.add("RADIO", eid, result)
+        if i % 12 == 0:
+            b.add("IMAGE", images[i // 12], {"score": 80, "label": "VISUAL_SOURCE", "notes": "verify"})
+    b.add("RADIO", bad, {"snr": "n/a", "drift": 0.5})
+    queued = len(b._pending)
+    n = b.flush()
+
+    expected = eng.analyze_batch([r for _, r in radio])
+    got = stored("events_radio", [eid for eid, _ in radio])
+    match = all(abs(got[eid][0] - e["score"]) < 1e-9 and got[eid][1] == e["label"]
+                for (eid, _), e in zip(radio, expected))
+    untouched = set(stored("events_image", images).values()) == {(None, None)} \
+        and stored("events_radio", [bad])[bad] == (None, None)
+    conn = sqlite3.connect(config.DB_PATH)
+    synced = conn.execute("""SELECT COUNT(*) FROM events_all a JOIN events_radio r ON a.type = 'RADIO' AND a.event_id = r.id
+                             WHERE a.ml_score IS NOT r.ml_score OR a.ml_label IS NOT r.ml_label""").fetchone()[0] == 0
+    conn.close()
+    print(f"   queued {queued} of {len(radio) + 1 + 50} adds | flushed {n} | scores match analyze_batch: {match} | "
+          f"IMAGE/unreadable untouched: {untouched} | events_all synced: {synced}")
+    return queued == len(radio) + 1 and n == queued and match and untouched and synced
+
+
+def wait_for(ids, timeout):
+    t0 = time.monotonic()
+    while time.monotonic() - t0 < timeout:
+        if all(v[0] is not None for v in stored("events_radio", ids).values()):
+            return time.monotonic() - t0
+        time.sleep(0.05)
+    return None
+
+
+def check_size_trigger():
+    """A full batch is written right away, long before max_wait."""
+    b = TriageBatcher(engine(), db, batch_size=50, max_wait=60)
+    b.start()
+    events = radio_events(random.Random(8), 50)
+    for eid, result in events:
+        b.add("RADIO", eid, result)
+    took = wait_for([eid for eid, _ in events], timeout=5)
+    b.stop()
+    print(f"   50/50 pending -> written after {took if took is None else round(took, 2)}s (max_wait 60s)")
+    return took is not None and took < 2
+
+
+def check_time_trigger():
+    """A partial batch waits for max_wait, then goes out; stop() flushes whatever is left."""
+    b = TriageBatcher(engine(), db, batch_size=1000, max_wait=1.0)
+    b.start()
+    events = radio_events(random.Random(9), 10)
+    for eid, result in events:
+        b.add("RADIO", eid, result)
+    early = stored("events_radio", [eid for eid, _ in events])
+    held = all(v == (None, None) for v in early.values())
+    took = wait_for([eid for eid, _ in events], timeout=5)
+
+    rest = radio_events(random.Random(10), 5)
+    for eid, result in rest:
+        b.add("RADIO", eid, result)
+    b.stop()
+    drained = all(v[0] is not None for v in stored("events_radio", [eid for eid, _ in rest]).values())
+    print(f"   10/1000 pending: held at first {held}, written after {took if took is None else round(took, 2)}s | "
+          f"stop() drained the last 5: {drained}")
+    return held and took is not None and 0.5 < took < 3 and drained
+
+
+def verify():
+    print(">> Testing Batched ML Triage...")
+    checks = [("Bulk write-back matches analyze_batch", check_write_back),
+              ("Size trigger flushes a full batch", check_size_trigger),
+              ("Time trigger and stop() drain partial batches", check_time_trigger)]
+    results = []
+    for i, (title, check) in enumerate(checks, 1):
+        print(f"\n[{i}/{len(checks)}] {title}...")
+        results.append(check())
+        print("   [OK]" if results[-1] else "   [FAIL]")
+
+    ok = all(results)
+    print("\n>> TRIAGE BATCHER " + ("OPERATIONAL" if ok else "FAILED"))
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if verify() else 1)